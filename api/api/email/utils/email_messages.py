@@ -21,6 +21,16 @@ EMAIL_OPTS = {
                    "<strong>Max Payment:</strong> {max_payment}i<br>"
     },
 
+    'email-bulk-bid-confirmation': {
+        'subject': EMAIL_SUBJECT_FORMAT + 'Bids confirmation',
+        'message': "<p><strong>{n_bids}</strong> bids were successfully "
+                   "registered.<br>"
+                   "<strong>Session Date:</strong> {session_date}<br>"
+                   "<strong>Session Number:</strong> {session_number}<br>"
+                   "Some related information about the offers: </p>"
+                   "<ul>{bids_info}</ul>"
+    },
+
     'email-bid-tangle-id-confirmation': {
         'subject': EMAIL_SUBJECT_FORMAT + 'Tangle Message ID Added to Bid',
         'message': "<p>A tangle message ID was successfully associated "
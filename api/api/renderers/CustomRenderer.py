@@ -17,6 +17,10 @@ class CustomRenderer(JSONRenderer):
         :return:
         """
         status_code = renderer_context['response'].status_code
+        if status_code == 304:
+            # Not Modified responses (conditional requests) have no body:
+            return b''
+
         response = {
             "code": status_code,
             "data": data,
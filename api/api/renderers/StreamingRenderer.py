@@ -0,0 +1,63 @@
+import itertools
+
+import structlog
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+
+
+# init logger:
+logger = structlog.get_logger("api_logger")
+
+
+class StreamingRenderer(JSONRenderer):
+    """
+    Streaming variant of `CustomRenderer`, for (large) list responses.
+
+    The `{"code": ..., "data": [` envelope is emitted first, followed by
+    the rows (rendered in chunks), so only one chunk of rows is held in
+    memory at a time.
+    """
+
+    def iter_render(self, rows, status_code=200, chunk_size=None):
+        """
+        :param rows: iterable of (JSON serializable) rows
+        :param status_code: response status code (envelope 'code')
+        :param chunk_size: number of rows rendered at once
+        :return: generator of bytes (same output as `CustomRenderer`)
+        """
+        chunk_size = chunk_size or settings.STREAMING_RESPONSE_CHUNK_SIZE
+        yield b'{"code":%d,"data":[' % status_code
+        rows = iter(rows)
+        separator = b""
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+                # Render the chunk as a JSON list and strip the brackets:
+                yield separator + self.render(chunk)[1:-1]
+                separator = b","
+        except Exception:
+            # Headers are already sent - the (truncated) body is invalid
+            # JSON, which clients detect:
+            logger.exception("Failed to stream response rows.")
+            raise
+        yield b"]}"
+
+
+def streaming_response(rows, status=200, chunk_size=None):
+    """
+    `StreamingHttpResponse` with the rows of a list response (see
+    `StreamingRenderer`).
+
+    :param rows: iterable of rows, ideally fetched with a server-side
+    cursor (e.g., `QuerySet.iterator(chunk_size=...)`)
+    """
+    renderer = StreamingRenderer()
+    return StreamingHttpResponse(
+        renderer.iter_render(rows, status_code=status, chunk_size=chunk_size),
+        status=status,
+        content_type=renderer.media_type,
+    )
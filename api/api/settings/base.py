@@ -329,3 +329,69 @@ EMAIL_TIMEOUT = int(os.environ.get("EMAIL_TIMEOUT", 30))
 
 # -- REST configs:
 REST_PORT = int(os.environ.get("REST_PORT", 8080))
+
+# -- Data ingestion configs:
+# Max. number of rows sent per INSERT ... ON CONFLICT statement:
+DATA_UPSERT_PAGE_SIZE = int(os.environ.get("DATA_UPSERT_PAGE_SIZE", 1000))
+# Batches with at least this number of rows are ingested through COPY:
+DATA_UPSERT_COPY_MIN_ROWS = int(os.environ.get("DATA_UPSERT_COPY_MIN_ROWS", 5000))
+# Number of rows parsed and inserted at once in streamed uploads:
+DATA_STREAM_CHUNK_SIZE = int(os.environ.get("DATA_STREAM_CHUNK_SIZE", 10000))
+
+# -- Pagination configs (keyset pagination):
+PAGINATION_DEFAULT_PAGE_SIZE = int(os.environ.get("PAGINATION_DEFAULT_PAGE_SIZE", 1000))
+PAGINATION_MAX_PAGE_SIZE = int(os.environ.get("PAGINATION_MAX_PAGE_SIZE", 10000))
+# Max. number of rows of responses without pagination (larger responses
+# are rejected, asking clients to paginate or stream):
+PAGINATION_MAX_UNPAGINATED_ROWS = int(os.environ.get("PAGINATION_MAX_UNPAGINATED_ROWS", 50000))
+
+# -- Delta sync configs (`since` query param):
+# Rows are only returned once their `registered_at` is older than this nr.
+# of seconds (upper bound of the ingestion transactions duration), so the
+# watermark never passes rows that are not committed yet:
+DELTA_SYNC_COMMIT_WINDOW = int(os.environ.get("DELTA_SYNC_COMMIT_WINDOW", 60))
+
+# -- Data partitioning configs (monthly partitions):
+# Nr. of future monthly partitions to keep created:
+DATA_PARTITIONS_PREMAKE_MONTHS = int(os.environ.get("DATA_PARTITIONS_PREMAKE_MONTHS", 3))
+# Nr. of past months to keep attached (0 - keep all partitions):
+DATA_PARTITIONS_RETENTION_MONTHS = int(os.environ.get("DATA_PARTITIONS_RETENTION_MONTHS", 0))
+# Schema where detached partitions are archived:
+DATA_PARTITIONS_ARCHIVE_SCHEMA = os.environ.get("DATA_PARTITIONS_ARCHIVE_SCHEMA", "archive")
+
+# -- Data units configs:
+# Canonical unit of stored raw data / forecasts values (w, kw or mw):
+DATA_CANONICAL_UNITS = os.environ.get("DATA_CANONICAL_UNITS", "kw")
+
+# -- Cache configs:
+# Use a shared backend (e.g. django.core.cache.backends.redis.RedisCache)
+# when running multiple workers / hosts:
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+# Expiry (seconds) of the cached latest market session (shared cache):
+MARKET_SESSION_CACHE_TTL = int(os.environ.get("MARKET_SESSION_CACHE_TTL", 5))
+# Expiry (seconds) of the process-local copy (read endpoints only):
+MARKET_SESSION_LOCAL_CACHE_TTL = int(os.environ.get("MARKET_SESSION_LOCAL_CACHE_TTL", 1))
+
+# -- Market bulk operations configs:
+# Max. number of items (bids, payments, ...) per bulk request:
+MARKET_BULK_MAX_SIZE = int(os.environ.get("MARKET_BULK_MAX_SIZE", 1000))
+
+# -- Data export configs (CSV / Parquet files, processed by the
+# `run_data_exports` worker):
+# Number of rows fetched (server-side cursor) and written at once:
+DATA_EXPORT_CHUNK_SIZE = int(os.environ.get("DATA_EXPORT_CHUNK_SIZE", 10000))
+# Exported files directory (private - not served by NGINX as MEDIA_ROOT,
+# files are only downloaded through the authenticated export endpoint):
+DATA_EXPORT_ROOT = os.environ.get("DATA_EXPORT_ROOT", os.path.join(BASE_DIR, "exports"))
+# If set, downloads are delegated to NGINX (X-Accel-Redirect) through
+# this internal location (e.g. "/protected-exports/"):
+DATA_EXPORT_ACCEL_REDIRECT = os.environ.get("DATA_EXPORT_ACCEL_REDIRECT", "")
+
+# -- Streaming responses configs (opt-in, `stream=true` query param):
+# Number of rows fetched (server-side cursor) and rendered at once:
+STREAMING_RESPONSE_CHUNK_SIZE = int(os.environ.get("STREAMING_RESPONSE_CHUNK_SIZE", 1000))
@@ -1,3 +1,15 @@
 from .base import *  # noqa: F401
 
 DEBUG = False
+
+# Tests create / update market sessions directly through the ORM
+# (no cache invalidation), so market session caching is disabled:
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+    }
+}
+MARKET_SESSION_LOCAL_CACHE_TTL = 0
+
+# Rows created by the tests are returned by delta sync requests right away:
+DELTA_SYNC_COMMIT_WINDOW = 0
@@ -0,0 +1,113 @@
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+class ConditionalGet:
+    """
+    ETag / Last-Modified validators for GET views, computed from the row
+    count and max. update timestamp of the view queryset, so unchanged
+    responses can be answered with a 304 before fetching and serializing
+    rows.
+
+    The aggregate query only runs when it is needed: to check a request
+    that carries validators (If-None-Match / If-Modified-Since), or to add
+    the headers to a response whose queryset was not fetched by the view
+    (otherwise, the validators are computed from the loaded rows).
+
+    Usage:
+        conditional = ConditionalGet(request, queryset, "updated_at")
+        not_modified = conditional.not_modified_response()
+        if not_modified is not None:
+            return not_modified
+        ...
+        return conditional.add_headers(Response(data))
+    """
+
+    def __init__(self, request, queryset, timestamp_field):
+        self.request = request
+        self.queryset = queryset
+        self.timestamp_field = timestamp_field
+        self.etag = None
+        self.last_modified = None
+
+    @classmethod
+    def from_instances(cls, request, instances, timestamp_field):
+        """
+        Validators for already loaded (e.g., cached) model instances.
+        """
+        conditional = cls(request, None, timestamp_field)
+        conditional._set_validators_from_instances(instances)
+        return conditional
+
+    def _has_validators(self):
+        return ("HTTP_IF_NONE_MATCH" in self.request.META
+                or "HTTP_IF_MODIFIED_SINCE" in self.request.META)
+
+    def _compute_validators(self):
+        if self.etag is not None:
+            return
+        # Rows already fetched by the view (e.g., on serialization):
+        instances = getattr(self.queryset, "_result_cache", None)
+        if instances is not None:
+            self._set_validators_from_instances(instances)
+            return
+        queryset = self.queryset
+        if not queryset.query.is_sliced:
+            queryset = queryset.order_by()
+        stats = queryset.aggregate(
+            count=Count("pk"),
+            last_modified=Max(self.timestamp_field)
+        )
+        self._set_validators(stats["count"], stats["last_modified"])
+
+    def _set_validators_from_instances(self, instances):
+        timestamps = [getattr(x, self.timestamp_field) for x in instances]
+        self._set_validators(len(instances), max(timestamps, default=None))
+
+    def _set_validators(self, count, last_modified):
+        self.last_modified = last_modified
+        # Responses depend on the user and on the query params:
+        key = ":".join([
+            str(self.request.user.pk),
+            self.request.get_full_path(),
+            str(count),
+            last_modified.isoformat() if last_modified else "",
+        ])
+        self.etag = f'"{hashlib.md5(key.encode("utf-8")).hexdigest()}"'
+
+    @property
+    def last_modified_timestamp(self):
+        if self.last_modified is None:
+            return None
+        return int(self.last_modified.timestamp())
+
+    def not_modified_response(self):
+        """
+        304 (or 412) response if the client copy is still valid (given
+        its If-None-Match / If-Modified-Since headers), else None.
+        """
+        if not self._has_validators():
+            return None
+        self._compute_validators()
+        response = get_conditional_response(
+            self.request,
+            etag=self.etag,
+            last_modified=self.last_modified_timestamp
+        )
+        if response is None:
+            return None
+        return self.add_headers(Response(status=response.status_code))
+
+    def add_headers(self, response):
+        self._compute_validators()
+        response["ETag"] = self.etag
+        if self.last_modified is not None:
+            response["Last-Modified"] = http_date(
+                self.last_modified_timestamp
+            )
+        patch_vary_headers(response, ["Authorization"])
+        return response
@@ -0,0 +1,170 @@
+import json
+import base64
+import binascii
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import F, Field, Func, Value
+from django.db.models.lookups import GreaterThan
+from rest_framework import exceptions
+
+
+class RowValue(Func):
+    """
+    SQL row value constructor (`ROW(a, b, ...)`), compared as a whole.
+    """
+    function = "ROW"
+    output_field = Field()
+
+
+class KeysetPagination:
+    """
+    Keyset (cursor) pagination over a unique ordered set of fields
+    (e.g., `("datetime", "id")`).
+
+    Each page is fetched with a row value comparison filter, `WHERE
+    ROW(keys) > ROW(cursor keys)` (matched against composite indexes on
+    the keys), and a LIMIT, so deep pages cost the same as the first one
+    (no OFFSET). One extra row is fetched to know if there is a next
+    page (single query). The `next` cursor is an opaque (base64)
+    encoding of the keys of the last row in the page.
+
+    Pagination is only applied if the request declares the `page_size`
+    or `cursor` query params. Otherwise, responses are limited to
+    `settings.PAGINATION_MAX_UNPAGINATED_ROWS` rows (larger responses
+    are rejected, asking for pagination). Usage mirrors DRF paginators:
+        page = paginator.paginate_queryset(queryset, request)
+        data = <represent page, with `paginator.representation_fields`
+                for serializer-free representations>
+        data = paginator.get_paginated_data(data, page)
+    """
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.page_size = None
+        self.next_cursor = None
+
+    def encode_cursor(self, keys):
+        values = [v.isoformat() if hasattr(v, "isoformat") else v
+                  for v in keys]
+        payload = json.dumps(values, default=str).encode("utf-8")
+        return base64.urlsafe_b64encode(payload).decode("ascii")
+
+    def decode_cursor(self, queryset, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if len(values) != len(self.fields):
+                raise ValueError
+            opts = queryset.model._meta
+            return [opts.get_field(f).to_python(v)
+                    for f, v in zip(self.fields, values)]
+        except (TypeError, ValueError, binascii.Error, DjangoValidationError):
+            raise exceptions.ValidationError(
+                f"Query param '{self.cursor_query_param}' is not valid."
+            )
+
+    def get_page_size(self, request):
+        page_size = request.query_params.get(self.page_size_query_param)
+        if page_size is None:
+            return settings.PAGINATION_DEFAULT_PAGE_SIZE
+        try:
+            page_size = int(page_size)
+            if not (0 < page_size <= settings.PAGINATION_MAX_PAGE_SIZE):
+                raise ValueError
+        except ValueError:
+            raise exceptions.ValidationError(
+                f"Query param '{self.page_size_query_param}' must be an "
+                f"integer between 1 and {settings.PAGINATION_MAX_PAGE_SIZE}."
+            )
+        return page_size
+
+    def keyset_filter(self, queryset, keys):
+        # ROW(f1, f2, ...) > ROW(k1, k2, ...):
+        opts = queryset.model._meta
+        return GreaterThan(
+            RowValue(*[F(f) for f in self.fields]),
+            RowValue(*[Value(k, output_field=opts.get_field(f))
+                       for f, k in zip(self.fields, keys)])
+        )
+
+    @property
+    def key_lookups(self):
+        # Keys added to serializer-free representations of a page (see
+        # `representation_fields`), to encode the next cursor:
+        return {f"_keyset_{f}": f for f in self.fields}
+
+    def representation_fields(self, fields):
+        """
+        Representation fields (output key -> lookup) of the page rows,
+        with the keys required to encode the next cursor.
+        """
+        if self.page_size is None:
+            return fields
+        return {**fields, **self.key_lookups}
+
+    def is_requested(self, request):
+        query_params = request.query_params
+        return (self.page_size_query_param in query_params) \
+            or (self.cursor_query_param in query_params)
+
+    def paginate_queryset(self, queryset, request, required=False):
+        """
+        Returns the (unevaluated) queryset for the requested page. If
+        pagination was not requested (and is not `required`, in which
+        case the default page size is used), returns the queryset limited
+        to the max. nr. of unpaginated rows.
+        """
+        if not (required or self.is_requested(request)):
+            # One extra row, to detect responses over the limit:
+            return queryset[:settings.PAGINATION_MAX_UNPAGINATED_ROWS + 1]
+
+        self.page_size = self.get_page_size(request)
+        cursor = request.query_params.get(self.cursor_query_param)
+        queryset = queryset.order_by(*self.fields)
+        if cursor:
+            keys = self.decode_cursor(queryset, cursor)
+            queryset = queryset.filter(self.keyset_filter(queryset, keys))
+        # One extra row, to check if there is a next page:
+        return queryset[:self.page_size + 1]
+
+    def get_paginated_data(self, data, page):
+        """
+        :param data: representation of the `page` rows
+        :param page: page queryset (evaluated by serializers, if `data`
+        is not a serializer-free representation)
+        :return: paginated response data (`data` if not paginated)
+        """
+        if self.page_size is None:
+            if len(data) > settings.PAGINATION_MAX_UNPAGINATED_ROWS:
+                raise exceptions.ValidationError(
+                    f"Query returns more than "
+                    f"{settings.PAGINATION_MAX_UNPAGINATED_ROWS} rows. Use "
+                    f"pagination ('{self.page_size_query_param}' / "
+                    f"'{self.cursor_query_param}' query params), stream "
+                    f"the response ('stream=true') or narrow the query "
+                    f"filters."
+                )
+            return data
+
+        data = list(data[:self.page_size + 1])
+        if len(data) > self.page_size:
+            last = data[self.page_size - 1]
+            if isinstance(last, dict) and all(k in last
+                                              for k in self.key_lookups):
+                keys = [last[k] for k in self.key_lookups]
+            else:
+                # Rows represented from the (cached) page instances:
+                last = page[self.page_size - 1]
+                keys = [getattr(last, f) for f in self.fields]
+            self.next_cursor = self.encode_cursor(keys)
+            data = data[:self.page_size]
+        for row in data:
+            for k in self.key_lookups:
+                row.pop(k, None)
+        return {
+            "next": self.next_cursor,
+            "page_size": self.page_size,
+            "results": data,
+        }
@@ -19,3 +19,13 @@ class ForecastResourceNotAssigned(APIException):
     default_detail = "Resource ID '{}' is not registered in the platform. " \
                      "Resource owner must register it first."
     default_code = 'forecast_resource_not_assigned'
+
+
+class ExportNotFinished(APIException):
+
+    def __init__(self, export_status):
+        super().__init__(self.default_detail.format(export_status))
+    status_code = 409
+    default_detail = "Export is not finished yet (status '{}'). " \
+                     "Please retry later."
+    default_code = 'export_not_finished'
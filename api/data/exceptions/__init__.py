@@ -1,4 +1,5 @@
 from .Exception import (
     RawResourceNotAssigned,
-    ForecastResourceNotAssigned
+    ForecastResourceNotAssigned,
+    ExportNotFinished
 )
@@ -0,0 +1,116 @@
+import pandas as pd
+
+from django.db import connection
+
+from ..models.raw_data_coverage import RawDataCoverage
+from .representation import format_datetime
+
+
+def series_ranges(timestamps, interval):
+    """
+    Split timestamps into contiguous [start, end] ranges (consecutive
+    timestamps at most `interval` minutes apart).
+    """
+    ts = pd.Series(pd.to_datetime(timestamps, utc=True))
+    ts = ts.drop_duplicates().sort_values()
+    range_id = (ts.diff() > pd.Timedelta(minutes=interval)).cumsum()
+    bounds = ts.groupby(range_id).agg(["min", "max"])
+    return list(zip(bounds["min"], bounds["max"]))
+
+
+def merge_ranges(ranges, interval):
+    """
+    Merge overlapping / adjacent (at most `interval` minutes apart)
+    [start, end] ranges.
+    """
+    step = pd.Timedelta(minutes=interval)
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + step:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def lock_coverage(resource, interval):
+    """
+    Get (or create) and lock the coverage entry of `resource`, until the
+    end of the current transaction (serializes uploads per resource).
+    """
+    coverage, _ = RawDataCoverage.objects.select_for_update().get_or_create(
+        resource_id=resource.id,
+        defaults={"user_id": resource.user_id, "time_interval": interval}
+    )
+    return coverage
+
+
+def update_coverage(coverage, timestamps, interval):
+    """
+    Merge the timestamps of a new upload into a (locked) coverage entry.
+    """
+    stored = [(pd.Timestamp(start), pd.Timestamp(end))
+              for start, end in coverage.ranges]
+    ranges = merge_ranges(stored + series_ranges(timestamps, interval),
+                          interval)
+    coverage.ranges = [[format_datetime(start), format_datetime(end)]
+                       for start, end in ranges]
+    coverage.first_datetime = ranges[0][0].to_pydatetime()
+    coverage.last_datetime = ranges[-1][1].to_pydatetime()
+    coverage.n_gaps = len(ranges) - 1
+    coverage.time_interval = interval
+    coverage.save()
+    return coverage
+
+
+def rebuild_coverage(conn=connection):
+    """
+    Rebuild the coverage index of all resources from the `raw_data`
+    table (gaps-and-islands query), e.g., after raw data partitions are
+    detached or rows are deleted outside the ingestion path.
+    """
+    coverage_table = RawDataCoverage._meta.db_table
+    with conn.cursor() as cursor:
+        cursor.execute(f'DELETE FROM "{coverage_table}"')
+        cursor.execute(f"""
+            WITH steps AS (
+                SELECT resource_id, user_id, time_interval, datetime,
+                       CASE WHEN datetime - lag(datetime) OVER w
+                                 <= time_interval * interval '1 minute'
+                            THEN 0 ELSE 1 END AS new_range
+                FROM raw_data
+                WINDOW w AS (PARTITION BY resource_id ORDER BY datetime)
+            ), islands AS (
+                SELECT *, sum(new_range) OVER (PARTITION BY resource_id
+                                               ORDER BY datetime) AS range_id
+                FROM steps
+            ), ranges AS (
+                SELECT resource_id, range_id,
+                       (array_agg(user_id))[1] AS user_id,
+                       (array_agg(time_interval
+                                  ORDER BY datetime DESC))[1] AS time_interval,
+                       min(datetime) AS range_start,
+                       max(datetime) AS range_end
+                FROM islands
+                GROUP BY resource_id, range_id
+            )
+            INSERT INTO "{coverage_table}" (resource_id, user_id,
+                                            time_interval, ranges,
+                                            first_datetime, last_datetime,
+                                            n_gaps, updated_at)
+            SELECT resource_id,
+                   (array_agg(user_id))[1],
+                   (array_agg(time_interval ORDER BY range_end DESC))[1],
+                   jsonb_agg(jsonb_build_array(
+                       to_char(range_start AT TIME ZONE 'UTC',
+                               'YYYY-MM-DD"T"HH24:MI:SS"Z"'),
+                       to_char(range_end AT TIME ZONE 'UTC',
+                               'YYYY-MM-DD"T"HH24:MI:SS"Z"')
+                   ) ORDER BY range_start),
+                   min(range_start),
+                   max(range_end),
+                   count(*) - 1,
+                   now()
+            FROM ranges
+            GROUP BY resource_id
+        """)
@@ -0,0 +1,228 @@
+import os
+import csv
+import uuid
+
+import pandas as pd
+import structlog
+
+from django.conf import settings
+from django.utils import timezone
+
+from market.models import MarketSessionTransactions, MarketSessionBalance
+from ..models.raw_data import RawData
+from ..models.market_forecasts import MarketForecasts
+from ..models.data_export import DataExport
+from ..serializers.raw_data import RawDataRetrieveSerializer
+from ..serializers.market_forecasts import MarketForecastsRetrieveSerializer
+from .representation import iter_values_representation
+
+logger = structlog.get_logger("api_logger")
+
+ExportTable = DataExport.ExportTable
+
+# Exported table -> (model, output columns, datetime columns, date
+# filter field, ordering):
+EXPORT_SOURCES = {
+    ExportTable.RAW_DATA: (
+        RawData,
+        RawDataRetrieveSerializer.values_fields,
+        RawDataRetrieveSerializer.values_datetime_fields,
+        "datetime",
+        ("datetime", "id"),
+    ),
+    ExportTable.MARKET_FORECASTS: (
+        MarketForecasts,
+        MarketForecastsRetrieveSerializer.values_fields,
+        MarketForecastsRetrieveSerializer.values_datetime_fields,
+        "datetime",
+        ("datetime", "id"),
+    ),
+    ExportTable.MARKET_SESSION_TRANSACTIONS: (
+        MarketSessionTransactions,
+        {
+            "market_session": "market_session_id",
+            "user": "user_id",
+            "resource": "resource_id",
+            "amount": "amount",
+            "transaction_type": "transaction_type",
+            "registered_at": "registered_at",
+            "resource_name": "resource__name",
+        },
+        ("registered_at",),
+        "registered_at",
+        ("registered_at", "tid"),
+    ),
+    ExportTable.MARKET_SESSION_BALANCE: (
+        MarketSessionBalance,
+        {
+            "market_session": "market_session_id",
+            "user": "user_id",
+            "resource": "resource_id",
+            "session_balance": "session_balance",
+            "session_deposit": "session_deposit",
+            "session_payment": "session_payment",
+            "session_revenue": "session_revenue",
+            "registered_at": "registered_at",
+        },
+        ("registered_at",),
+        "registered_at",
+        ("registered_at", "bal_id"),
+    ),
+}
+
+
+def export_queryset(export):
+    """
+    Queryset of the rows to export (already filtered and ordered).
+    """
+    model, _, _, date_field, ordering = EXPORT_SOURCES[export.table]
+    filters = export.filters
+    query = model.objects.filter(user_id=filters["user"])
+    if filters.get("resource") is not None:
+        query = query.filter(resource_id=filters["resource"])
+    if filters.get("market_session") is not None:
+        query = query.filter(market_session_id=filters["market_session"])
+    if filters.get("start_date") is not None:
+        query = query.filter(**{f"{date_field}__gte": filters["start_date"]})
+    if filters.get("end_date") is not None:
+        query = query.filter(**{f"{date_field}__lte": filters["end_date"]})
+    return query.order_by(*ordering)
+
+
+def iter_export_chunks(export):
+    """
+    Rows to export, fetched with a server-side cursor and grouped in
+    lists of (at most) `settings.DATA_EXPORT_CHUNK_SIZE` rows.
+    """
+    _, fields, datetime_fields, _, _ = EXPORT_SOURCES[export.table]
+    chunk_size = settings.DATA_EXPORT_CHUNK_SIZE
+    rows = iter_values_representation(queryset=export_queryset(export),
+                                      fields=fields,
+                                      datetime_fields=datetime_fields,
+                                      chunk_size=chunk_size)
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_csv(export, path, progress):
+    columns = list(EXPORT_SOURCES[export.table][1].keys())
+    n_rows = 0
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for chunk in iter_export_chunks(export):
+            writer.writerows(chunk)
+            n_rows += len(chunk)
+            progress(n_rows)
+    return n_rows
+
+
+def parquet_frame(export, chunk):
+    """
+    Chunk of rows as a DataFrame with Parquet friendly types (datetimes
+    as UTC timestamps and UUIDs as strings).
+    """
+    _, fields, datetime_fields, _, _ = EXPORT_SOURCES[export.table]
+    df = pd.DataFrame(chunk, columns=list(fields.keys()))
+    for column in datetime_fields:
+        df[column] = pd.to_datetime(df[column], utc=True, format="ISO8601")
+    for column in df.columns[df.dtypes == object]:
+        if len(df) and isinstance(df[column].iloc[0], uuid.UUID):
+            df[column] = df[column].astype(str)
+    return df
+
+
+def write_parquet(export, path, progress):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    n_rows = 0
+    writer = None
+    try:
+        for chunk in iter_export_chunks(export):
+            df = parquet_frame(export, chunk)
+            if writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                writer = pq.ParquetWriter(path, table.schema)
+            else:
+                table = pa.Table.from_pandas(df, schema=writer.schema,
+                                             preserve_index=False)
+            writer.write_table(table)
+            n_rows += len(chunk)
+            progress(n_rows)
+        if writer is None:
+            # No rows - file with the column names only:
+            table = pa.Table.from_pandas(parquet_frame(export, []),
+                                         preserve_index=False)
+            pq.write_table(table, path)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
+
+
+EXPORT_WRITERS = {
+    DataExport.ExportFormat.CSV: write_csv,
+    DataExport.ExportFormat.PARQUET: write_parquet,
+}
+
+
+def run_export(export_id):
+    """
+    Write the rows of a pending export into its file (in
+    DATA_EXPORT_ROOT). The file is only exposed (renamed) once fully
+    written.
+
+    :return: True if the export was processed, False if it was not
+    pending (e.g., already taken by another worker)
+    """
+    # Take the export (only one worker may process it):
+    taken = DataExport.objects.filter(
+        id=export_id,
+        status=DataExport.ExportStatus.PENDING
+    ).update(status=DataExport.ExportStatus.RUNNING,
+             updated_at=timezone.now())
+    if not taken:
+        return False
+
+    export = DataExport.objects.get(id=export_id)
+
+    def progress(n_rows):
+        # Heartbeat (running exports without updates are restarted):
+        DataExport.objects.filter(id=export_id).update(
+            n_rows=n_rows,
+            updated_at=timezone.now()
+        )
+
+    name = f"{export.id}.{export.file_format}"
+    path = export.file.storage.path(name)
+    tmp_path = f"{path}.part"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Rows are streamed from a server-side cursor (declared WITH HOLD
+        # in autocommit mode, i.e., read from a single snapshot), while
+        # heartbeats are committed as the export progresses:
+        n_rows = EXPORT_WRITERS[export.file_format](export, tmp_path,
+                                                    progress)
+        os.replace(tmp_path, path)
+    except Exception:
+        logger.exception(f"Failed to export {export.table} "
+                         f"(export {export.id}).")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        export.status = DataExport.ExportStatus.FAILED
+        # Details are logged (not exposed to the user):
+        export.error = "Failed to export data."
+    else:
+        export.status = DataExport.ExportStatus.FINISHED
+        export.file.name = name
+        export.n_rows = n_rows
+    export.finished_at = timezone.now()
+    export.save()
+    return True
@@ -0,0 +1,114 @@
+import re
+import datetime as dt
+
+
+# Tables range-partitioned (monthly) by `datetime`:
+PARTITIONED_TABLES = ("raw_data", "market_forecasts")
+PARTITION_KEY = "datetime"
+
+
+def month_start(date):
+    return dt.date(date.year, date.month, 1)
+
+
+def add_months(date, months):
+    month = date.year * 12 + date.month - 1 + months
+    return dt.date(month // 12, month % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+def _bound(month):
+    # Partition bounds are UTC month boundaries:
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def list_partitions(cursor, table):
+    """
+    Monthly partitions attached to `table`.
+
+    :return: dict mapping each partition month (first day) to its name
+    """
+    cursor.execute(
+        "SELECT c.relname FROM pg_inherits i "
+        "JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = %s::regclass",
+        [table]
+    )
+    pattern = re.compile(rf"^{re.escape(table)}_p(\d{{4}})(\d{{2}})$")
+    partitions = {}
+    for name, in cursor.fetchall():
+        match = pattern.match(name)
+        if match:
+            month = dt.date(int(match.group(1)), int(match.group(2)), 1)
+            partitions[month] = name
+    return partitions
+
+
+def create_partition(cursor, table, month):
+    """
+    Create the partition of `table` for `month`.
+
+    Rows of that month already stored in the default partition are moved
+    into the new partition before it is attached (PostgreSQL refuses to
+    attach a range overlapping rows in the default partition).
+    """
+    name = partition_name(table, month)
+    default = default_partition_name(table)
+    start, end = _bound(month), _bound(add_months(month, 1))
+    in_range = f'"{PARTITION_KEY}" >= {start} AND "{PARTITION_KEY}" < {end}'
+
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [default])
+    has_default, = cursor.fetchone()
+    if has_default:
+        cursor.execute(f'SELECT EXISTS (SELECT 1 FROM "{default}" '
+                       f'WHERE {in_range})')
+        has_default_rows, = cursor.fetchone()
+    else:
+        has_default_rows = False
+
+    if not has_default_rows:
+        cursor.execute(f'CREATE TABLE "{name}" PARTITION OF "{table}" '
+                       f'FOR VALUES FROM ({start}) TO ({end})')
+        return name
+
+    cursor.execute(f'CREATE TABLE "{name}" (LIKE "{table}" '
+                   f'INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cursor.execute(f'WITH moved AS (DELETE FROM "{default}" '
+                   f'WHERE {in_range} RETURNING *) '
+                   f'INSERT INTO "{name}" SELECT * FROM moved')
+    # Matching CHECK constraint lets ATTACH skip the validation scan:
+    cursor.execute(f'ALTER TABLE "{name}" ADD CONSTRAINT "{name}_range" '
+                   f'CHECK ({in_range})')
+    cursor.execute(f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" '
+                   f'FOR VALUES FROM ({start}) TO ({end})')
+    cursor.execute(f'ALTER TABLE "{name}" DROP CONSTRAINT "{name}_range"')
+    return name
+
+
+def create_default_partition(cursor, table):
+    cursor.execute(f'CREATE TABLE IF NOT EXISTS '
+                   f'"{default_partition_name(table)}" '
+                   f'PARTITION OF "{table}" DEFAULT')
+
+
+def detach_partition(cursor, table, name, action="detach",
+                     archive_schema="archive"):
+    """
+    Detach partition `name` from `table` and, depending on `action`:
+        - "detach": keep it as a standalone table
+        - "archive": move it to the `archive_schema` schema
+        - "drop": drop it
+    """
+    cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+    if action == "archive":
+        cursor.execute(f'CREATE SCHEMA IF NOT EXISTS "{archive_schema}"')
+        cursor.execute(f'ALTER TABLE "{name}" SET SCHEMA "{archive_schema}"')
+    elif action == "drop":
+        cursor.execute(f'DROP TABLE "{name}"')
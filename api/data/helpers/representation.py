@@ -0,0 +1,48 @@
+def format_datetime(value):
+    """
+    Format datetimes as DRF `DateTimeField` does (ISO 8601, 'Z' for UTC).
+    """
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def iter_values_representation(queryset, fields, datetime_fields=(),
+                               chunk_size=None):
+    """
+    Serializer-free representation of `queryset` rows.
+
+    Rows are fetched as tuples with `values_list` (no model instances
+    nor serializer fields are created) and converted into dicts with
+    the same keys and values as the matching DRF serializer output.
+
+    :param queryset: Queryset to represent
+    :param fields: dict mapping each output key to a queryset lookup
+    :param datetime_fields: output keys holding datetime values
+    :param chunk_size: if set, rows are fetched with a server-side cursor
+    (`QuerySet.iterator`) in chunks of `chunk_size` rows
+    :return: generator of dicts (one per row)
+    """
+    keys = list(fields.keys())
+    dt_positions = [keys.index(k) for k in datetime_fields]
+    rows = queryset.values_list(*fields.values())
+    if chunk_size is not None:
+        rows = rows.iterator(chunk_size=chunk_size)
+
+    for row in rows:
+        if dt_positions:
+            row = list(row)
+            for i in dt_positions:
+                if row[i] is not None:
+                    row[i] = format_datetime(row[i])
+        yield dict(zip(keys, row))
+
+
+def values_representation(queryset, fields, datetime_fields=()):
+    """
+    List version of `iter_values_representation`.
+    """
+    return list(iter_values_representation(queryset=queryset,
+                                           fields=fields,
+                                           datetime_fields=datetime_fields))
@@ -1,29 +1,119 @@
+import io
+
+from collections import namedtuple
+
 import psycopg2.extras as extras
 
+from django.conf import settings
+from django.db import transaction
+
+
+UpsertResult = namedtuple("UpsertResult", ["inserted", "updated"])
+
+
+def _upsert_statement(table, columns, constraint_columns, source):
+    update_set = ','.join(f"{c}=EXCLUDED.{c}" for c in columns
+                          if c not in constraint_columns)
+    return "INSERT INTO %s (%s) %s " \
+           "ON CONFLICT (%s) " \
+           "DO UPDATE SET %s " \
+           "RETURNING (xmax = 0) AS inserted" % (table, ','.join(columns),
+                                                 source,
+                                                 ','.join(constraint_columns),
+                                                 update_set)
+
+
+def to_sql_update(conn, df, table, constraint_columns, page_size=None):
+    """
+    Upsert a DataFrame into `table` with INSERT ... ON CONFLICT DO UPDATE.
+
+    Rows are sent in pages of `page_size` rows (one statement per page),
+    all inside the same transaction. Returns the number of inserted and
+    updated rows (from the `xmax` system column of the affected rows).
+    """
+    page_size = page_size or settings.DATA_UPSERT_PAGE_SIZE
+    # Repeated keys in the same batch would make ON CONFLICT fail
+    # (a row cannot be affected twice). Keep the last occurrence:
+    df = df.drop_duplicates(subset=constraint_columns, keep="last")
+    tuples = list(df.astype(object)
+                    .where(df.notna(), None)
+                    .itertuples(index=False, name=None))
+
+    query = _upsert_statement(
+        table=table,
+        columns=list(df.columns),
+        constraint_columns=constraint_columns,
+        source="VALUES %s"
+    )
+
+    with transaction.atomic(using=conn.alias):
+        with conn.cursor() as cursor:
+            rows = extras.execute_values(cursor, query, tuples,
+                                         page_size=page_size,
+                                         fetch=True)
+    nr_inserted = sum(1 for (inserted,) in rows if inserted)
+    return UpsertResult(inserted=nr_inserted,
+                        updated=len(rows) - nr_inserted)
+
+
+def copy_to_sql_update(conn, df, table, constraint_columns):
+    """
+    Upsert a DataFrame into `table` using PostgreSQL COPY.
+
+    Rows are streamed as CSV into a temporary staging table (dropped on
+    commit) and merged into the target table with a single
+    INSERT ... ON CONFLICT statement, so the batch is only sent once.
+    """
+    df = df.drop_duplicates(subset=constraint_columns, keep="last")
+
+    columns = ','.join(df.columns)
+    staging_table = f"{table}_staging"
+    merge_query = _upsert_statement(
+        table=table,
+        columns=list(df.columns),
+        constraint_columns=constraint_columns,
+        source=f"SELECT {columns} FROM {staging_table}"
+    )
+
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False, na_rep="")
+    buffer.seek(0)
+
+    with transaction.atomic(using=conn.alias):
+        with conn.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS "
+                f"SELECT {columns} FROM {table} WITH NO DATA;"
+            )
+            cursor.copy_expert(
+                f"COPY {staging_table} ({columns}) "
+                f"FROM STDIN WITH (FORMAT csv);",
+                buffer
+            )
+            cursor.execute(
+                f"WITH merged AS ({merge_query}) "
+                f"SELECT count(*) FILTER (WHERE inserted), "
+                f"count(*) FILTER (WHERE NOT inserted) FROM merged;"
+            )
+            nr_inserted, nr_updated = cursor.fetchone()
+
+    return UpsertResult(inserted=nr_inserted, updated=nr_updated)
+
+
+def upsert_dataframe(conn, df, table, constraint_columns):
+    """
+    Upsert a DataFrame into `table`, picking the ingestion engine by size.
 
-def to_sql_update(conn, df, table, constraint_columns):
-    tuples = []
-    for val in df.to_numpy():
-        tuples.append(tuple(map(lambda x: None if str(x) == "nan" else x, val)))
-
-    conflict_set = ','.join(list(df.columns))  # column names
-    excluded_set = ','.join('EXCLUDED.' + str(e) for e in df.columns)
-    try:
-        query = "INSERT INTO %s(%s) VALUES %%s;" % (table, conflict_set)
-        cursor = conn.cursor()
-        extras.execute_values(cursor, query, tuples)
-        conn.commit()
-        cursor.close()
-        return ''
-    except Exception:
-        constraint_columns = ','.join(constraint_columns)
-        query = "INSERT INTO %s(%s) VALUES %%s " \
-                "ON CONFLICT (%s) " \
-                "DO UPDATE SET (%s)=(%s);" % (table, conflict_set,
-                                              constraint_columns,
-                                              conflict_set, excluded_set)
-        cursor = conn.cursor()
-        extras.execute_values(cursor, query, tuples)
-        conn.commit()
-        cursor.close()
-        return "One or more database records were updated."
+    Small batches use a paged INSERT ... VALUES statement, which avoids
+    creating a staging table. Batches with at least
+    `DATA_UPSERT_COPY_MIN_ROWS` rows are streamed through COPY.
+    """
+    if len(df) >= settings.DATA_UPSERT_COPY_MIN_ROWS:
+        return copy_to_sql_update(conn=conn,
+                                  df=df,
+                                  table=table,
+                                  constraint_columns=constraint_columns)
+    return to_sql_update(conn=conn,
+                         df=df,
+                         table=table,
+                         constraint_columns=constraint_columns)
@@ -0,0 +1,73 @@
+import io
+import json
+import warnings
+
+import pandas as pd
+
+from rest_framework import exceptions
+
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl")
+CSV_MEDIA_TYPES = ("text/csv",)
+
+
+def iter_line_chunks(stream, chunk_size):
+    """
+    Read a byte stream line by line, yielding lists with at most
+    `chunk_size` non-empty (UTF-8 decoded) lines. Only one chunk is kept
+    in memory at each time.
+    """
+    lines = []
+    for line in iter(stream.readline, b""):
+        line = line.decode("utf-8").strip()
+        if not line:
+            continue
+        lines.append(line)
+        if len(lines) == chunk_size:
+            yield lines
+            lines = []
+    if lines:
+        yield lines
+
+
+def read_csv_header(stream):
+    """
+    Read the CSV header line (first line of the stream).
+    """
+    header = stream.readline().decode("utf-8").strip()
+    columns = [c.strip() for c in header.split(",")]
+    if ("datetime" not in columns) or ("value" not in columns):
+        raise exceptions.ValidationError(
+            "CSV header must include 'datetime' and 'value' columns."
+        )
+    return columns
+
+
+def parse_lines_chunk(lines, media_type, header=None):
+    """
+    Parse a chunk of NDJSON or CSV lines into a dict of columns
+    (column name -> list of values), as expected by
+    `ColumnarTimeseriesField`.
+    """
+    if media_type in CSV_MEDIA_TYPES:
+        try:
+            with warnings.catch_warnings():
+                # Rows with more fields than the header would otherwise
+                # be truncated (or shifted into the index) silently:
+                warnings.simplefilter("error", pd.errors.ParserWarning)
+                df = pd.read_csv(io.StringIO("\n".join(lines)),
+                                 header=None,
+                                 names=header,
+                                 index_col=False,
+                                 dtype=object,
+                                 skipinitialspace=True)
+        except (ValueError, pd.errors.ParserError,
+                pd.errors.ParserWarning) as e:
+            raise exceptions.ValidationError(f"Invalid CSV chunk: {e}")
+    else:
+        try:
+            df = pd.DataFrame.from_records([json.loads(x) for x in lines])
+        except (TypeError, ValueError) as e:
+            raise exceptions.ValidationError(f"Invalid NDJSON chunk: {e}")
+
+    return {column: df[column].tolist() for column in df.columns}
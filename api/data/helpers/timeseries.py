@@ -0,0 +1,56 @@
+from django.db.models import (
+    Avg,
+    Min,
+    Max,
+    Sum,
+    Func,
+    Value,
+    CharField,
+    IntegerField,
+    DateTimeField,
+)
+
+
+RESAMPLE_AGGREGATIONS = {
+    "avg": Avg,
+    "min": Min,
+    "max": Max,
+    "sum": Sum,
+}
+
+
+class EpochBucket(Func):
+    """
+    Floors timestamps to `seconds` wide buckets aligned on the Unix epoch
+    (UTC), i.e., `date_bin(interval, ts, '1970-01-01')`, which is only
+    available from PostgreSQL 14.
+    """
+    template = "to_timestamp(floor(extract(epoch FROM %(expressions)s) " \
+               "/ %(seconds)d) * %(seconds)d)"
+    output_field = DateTimeField()
+
+    def __init__(self, expression, seconds, **extra):
+        super().__init__(expression, seconds=int(seconds), **extra)
+
+
+def resample_queryset(queryset, interval, aggregation):
+    """
+    Downsample raw data rows into `interval` minutes buckets (per
+    resource and units), aggregating values in the database.
+
+    :param queryset: RawData queryset (already filtered)
+    :param interval: bucket width (minutes)
+    :param aggregation: one of `RESAMPLE_AGGREGATIONS`
+    :return: values queryset with one row per resource / bucket
+    """
+    aggregate = RESAMPLE_AGGREGATIONS[aggregation]
+    return queryset.order_by().annotate(
+        bucket=EpochBucket("datetime", seconds=interval * 60)
+    ).values(
+        "bucket", "resource_id", "resource__name", "resource_type", "units"
+    ).annotate(
+        bucket_value=aggregate("value"),
+        bucket_registered_at=Max("registered_at"),
+        bucket_interval=Value(interval, output_field=IntegerField()),
+        bucket_aggregation=Value(aggregation, output_field=CharField()),
+    ).order_by("bucket", "resource_id")
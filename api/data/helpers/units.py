@@ -0,0 +1,57 @@
+from django.conf import settings
+from django.db.models import (
+    F,
+    Case,
+    When,
+    Value,
+    CharField,
+    FloatField,
+)
+
+
+# Value of each unit in Watt:
+UNIT_SCALES = {
+    "w": 1.0,
+    "kw": 1e3,
+    "mw": 1e6,
+}
+
+# Output key -> annotation, for rows of `convert_units_queryset`:
+CONVERTED_UNITS_FIELDS = {
+    "value": "converted_value",
+    "units": "converted_units",
+}
+
+
+def conversion_factor(from_units, to_units):
+    return UNIT_SCALES[from_units] / UNIT_SCALES[to_units]
+
+
+def normalize_units(data, units):
+    """
+    Convert the `value` column of a time-series DataFrame (all values in
+    `units`) to the canonical unit (`settings.DATA_CANONICAL_UNITS`).
+    The original unit is kept in the `original_units` column.
+    """
+    canonical_units = settings.DATA_CANONICAL_UNITS
+    data["value"] = data["value"] * conversion_factor(units, canonical_units)
+    data["units"] = canonical_units
+    data["original_units"] = units
+    return data
+
+
+def convert_units_queryset(queryset, units, value_field="value"):
+    """
+    Annotate `queryset` rows with their values converted (in SQL) to
+    `units`, as `converted_value` / `converted_units`.
+    """
+    factor = Case(
+        *[When(units=from_units,
+               then=Value(conversion_factor(from_units, units)))
+          for from_units in UNIT_SCALES],
+        output_field=FloatField()
+    )
+    return queryset.annotate(
+        converted_value=F(value_field) * factor,
+        converted_units=Value(units, output_field=CharField()),
+    )
@@ -0,0 +1,171 @@
+import re
+import datetime as dt
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from market.models import MarketSession
+from users.models import UserResources
+from ...models.raw_data import RawData
+from ...models.market_forecasts import MarketForecasts
+
+
+class Command(BaseCommand):
+    help = "Seed the raw_data / market_forecasts tables (inside a " \
+           "transaction that is rolled back) and compare the query plans " \
+           "of the data API queries without / with the access-pattern " \
+           "indexes (EXPLAIN ANALYZE)."
+
+    START = dt.datetime(2020, 1, 1, tzinfo=dt.timezone.utc)
+    EXECUTION_TIME = re.compile(r"Execution Time: ([\d.]+) ms")
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50_000_000,
+                            help="Nr. of raw_data rows to seed.")
+        parser.add_argument("--forecast-rows", type=int, default=5_000_000,
+                            help="Nr. of market_forecasts rows to seed.")
+        parser.add_argument("--resources", type=int, default=100,
+                            help="Nr. of resources the rows are split by.")
+        parser.add_argument("--sessions", type=int, default=50,
+                            help="Nr. of market sessions (forecasts).")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("This benchmark requires a PostgreSQL DB.")
+
+        with transaction.atomic():
+            self.run(**options)
+            # Benchmark data is never persisted:
+            transaction.set_rollback(True)
+        self.stdout.write("Benchmark data rolled back.")
+
+    def run(self, rows, forecast_rows, resources, sessions, **kwargs):
+        indexes = [(model, index)
+                   for model in (RawData, MarketForecasts)
+                   for index in model._meta.indexes]
+
+        # Seed without the new indexes (they are built afterwards):
+        with connection.schema_editor() as schema_editor:
+            for model, index in indexes:
+                schema_editor.remove_index(model, index)
+
+        self.stdout.write(f"Seeding {rows} raw_data rows and "
+                          f"{forecast_rows} market_forecasts rows ...")
+        queries = self.seed(rows, forecast_rows, resources, sessions)
+        self.analyze()
+        before = self.explain(queries, label="Without indexes")
+
+        self.stdout.write("Building indexes ...")
+        with connection.schema_editor() as schema_editor:
+            for model, index in indexes:
+                schema_editor.add_index(model, index)
+        self.analyze()
+        after = self.explain(queries, label="With indexes")
+
+        self.stdout.write("\nExecution time (ms):")
+        for name in queries:
+            self.stdout.write(f"  {name:<32} {before[name]:>12.3f} "
+                              f"-> {after[name]:>10.3f}")
+
+    def seed(self, rows, forecast_rows, resources, sessions):
+        user = get_user_model().objects.create_user(
+            email="benchmark@data.indexes",
+            password="benchmark",
+            first_name="Benchmark",
+            last_name="Indexes",
+        )
+        resource_ids = [
+            str(UserResources.objects.create(
+                user=user,
+                name=f"benchmark-{i}",
+                type=UserResources.ResourceType.MEASUREMENT,
+            ).id)
+            for i in range(resources)
+        ]
+        session_ids = [
+            MarketSession.objects.create(
+                session_number=-(i + 1),
+                status=MarketSession.MarketStatus.FINISHED,
+                market_price=0, b_min=0, b_max=0, n_price_steps=0, delta=0
+            ).id
+            for i in range(sessions)
+        ]
+
+        with connection.cursor() as cursor:
+            # Time-ordered appends, round-robin by resource:
+            cursor.execute(
+                """
+                INSERT INTO raw_data (user_id, resource_id, resource_type,
+                                      datetime, value, units, time_interval,
+                                      aggregation_type, registered_at)
+                SELECT %(user)s,
+                       (%(resources)s::uuid[])[1 + i %% %(n_resources)s],
+                       'measurements',
+                       %(start)s::timestamptz
+                         + (i / %(n_resources)s) * interval '15 minutes',
+                       random(), 'kw', 15, 'avg', now()
+                FROM generate_series(0, %(rows)s - 1) AS i
+                """,
+                {"user": user.id, "resources": resource_ids,
+                 "n_resources": resources, "start": self.START, "rows": rows}
+            )
+            cursor.execute(
+                """
+                INSERT INTO market_forecasts (user_id, resource_id,
+                                              market_session_id, datetime,
+                                              request, value, units,
+                                              registered_at)
+                SELECT %(user)s,
+                       (%(resources)s::uuid[])[1 + i %% %(n_resources)s],
+                       (%(sessions)s::int[])
+                         [1 + (i / %(n_resources)s) %% %(n_sessions)s],
+                       ts, ts - interval '1 day', random(), 'kw', now()
+                FROM generate_series(0, %(rows)s - 1) AS i,
+                LATERAL (
+                    SELECT %(start)s::timestamptz
+                             + (i / (%(n_resources)s * %(n_sessions)s))
+                             * interval '1 hour' AS ts
+                ) AS t
+                """,
+                {"user": user.id, "resources": resource_ids,
+                 "n_resources": resources, "sessions": session_ids,
+                 "n_sessions": sessions, "start": self.START,
+                 "rows": forecast_rows}
+            )
+
+        # Queries issued by the data API views:
+        resource_id = resource_ids[len(resource_ids) // 2]
+        mid = self.START + dt.timedelta(
+            minutes=15 * (rows // max(resources, 1)) // 2
+        )
+        return {
+            "raw_data: resource + range": RawData.objects.filter(
+                resource_id=resource_id,
+                datetime__gte=mid,
+                datetime__lte=mid + dt.timedelta(days=7),
+            ).order_by("datetime"),
+            "raw_data: datetime range": RawData.objects.filter(
+                datetime__gte=mid,
+                datetime__lte=mid + dt.timedelta(hours=1),
+            ).order_by("datetime"),
+            "forecasts: session + resource": MarketForecasts.objects.filter(
+                market_session_id=session_ids[len(session_ids) // 2],
+                resource_id=resource_id,
+            ).order_by("datetime", "request"),
+        }
+
+    @staticmethod
+    def analyze():
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE raw_data")
+            cursor.execute("ANALYZE market_forecasts")
+
+    def explain(self, queries, label):
+        times = {}
+        for name, queryset in queries.items():
+            plan = queryset.explain(analyze=True, buffers=True)
+            self.stdout.write(f"\n-- {label} | {name}\n{plan}")
+            match = self.EXECUTION_TIME.search(plan)
+            times[name] = float(match.group(1)) if match else float("nan")
+        return times
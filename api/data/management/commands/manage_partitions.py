@@ -0,0 +1,77 @@
+import datetime as dt
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from ...helpers.partitions import (
+    PARTITIONED_TABLES,
+    month_start,
+    add_months,
+    list_partitions,
+    create_partition,
+    detach_partition,
+)
+
+
+class Command(BaseCommand):
+    help = "Pre-create the upcoming monthly partitions of the data " \
+           "tables and detach (or archive / drop) the partitions older " \
+           "than the retention period. Meant to run periodically " \
+           "(e.g., daily cron job)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead", type=int,
+            default=settings.DATA_PARTITIONS_PREMAKE_MONTHS,
+            help="Nr. of future monthly partitions to keep created."
+        )
+        parser.add_argument(
+            "--retention-months", type=int,
+            default=settings.DATA_PARTITIONS_RETENTION_MONTHS,
+            help="Partitions older than this nr. of months are detached "
+                 "(0 - keep all partitions)."
+        )
+        parser.add_argument(
+            "--action", choices=("detach", "archive", "drop"),
+            default="detach",
+            help="What to do with expired partitions: detach (keep as "
+                 "standalone table), archive (detach and move to the "
+                 "archive schema) or drop."
+        )
+        parser.add_argument(
+            "--table", choices=PARTITIONED_TABLES, action="append",
+            help="Table to manage (default: all partitioned tables)."
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Partitioning requires a PostgreSQL DB.")
+        if options["months_ahead"] < 0 or options["retention_months"] < 0:
+            raise CommandError("Nr. of months must be non-negative.")
+
+        current_month = month_start(dt.datetime.now(dt.timezone.utc).date())
+        for table in options["table"] or PARTITIONED_TABLES:
+            with transaction.atomic(), connection.cursor() as cursor:
+                partitions = list_partitions(cursor, table)
+
+                for i in range(options["months_ahead"] + 1):
+                    month = add_months(current_month, i)
+                    if month not in partitions:
+                        name = create_partition(cursor, table, month)
+                        self.stdout.write(f"Created partition {name}")
+
+                if options["retention_months"] == 0:
+                    continue
+                cutoff = add_months(current_month,
+                                    -options["retention_months"])
+                for month, name in sorted(partitions.items()):
+                    if month >= cutoff:
+                        break
+                    detach_partition(
+                        cursor, table, name,
+                        action=options["action"],
+                        archive_schema=settings.DATA_PARTITIONS_ARCHIVE_SCHEMA
+                    )
+                    self.stdout.write(f"Detached partition {name} "
+                                      f"({options['action']})")
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from ...helpers.coverage import rebuild_coverage
+from ...models.raw_data_coverage import RawDataCoverage
+
+
+class Command(BaseCommand):
+    help = "Rebuild the raw data coverage index from the raw_data table " \
+           "(e.g., after detaching / dropping raw data partitions)."
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("This command requires a PostgreSQL DB.")
+
+        with transaction.atomic():
+            rebuild_coverage()
+        self.stdout.write(f"Rebuilt coverage index of "
+                          f"{RawDataCoverage.objects.count()} resources.")
@@ -0,0 +1,59 @@
+import time
+import datetime as dt
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from ...helpers.export import run_export
+from ...models.data_export import DataExport
+
+
+class Command(BaseCommand):
+    help = "Process pending data exports (requested through the export " \
+           "endpoint). Run with --loop as a dedicated export worker, or " \
+           "periodically (e.g., cron job). Exports interrupted by a " \
+           "worker restart are detected by their heartbeat and restarted."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop", action="store_true",
+            help="Keep polling for pending exports (export worker)."
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=5,
+            help="Seconds between polls for pending exports (--loop)."
+        )
+        parser.add_argument(
+            "--stale-minutes", type=int, default=10,
+            help="Running exports without heartbeat (progress update) "
+                 "for longer than this nr. of minutes are considered "
+                 "interrupted and processed again."
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            n_processed = self.process_exports(options["stale_minutes"])
+            if not options["loop"]:
+                self.stdout.write(f"{n_processed} exports processed.")
+                return
+            if not n_processed:
+                time.sleep(options["poll_interval"])
+
+    def process_exports(self, stale_minutes):
+        stale_before = timezone.now() - dt.timedelta(minutes=stale_minutes)
+        n_stale = DataExport.objects.filter(
+            status=DataExport.ExportStatus.RUNNING,
+            updated_at__lt=stale_before
+        ).update(status=DataExport.ExportStatus.PENDING)
+        if n_stale:
+            self.stdout.write(f"{n_stale} interrupted exports restarted.")
+
+        pending = DataExport.objects.filter(
+            status=DataExport.ExportStatus.PENDING
+        ).order_by("registered_at").values_list("id", flat=True)
+        n_processed = 0
+        for export_id in list(pending):
+            n_processed += run_export(export_id)
+        return n_processed
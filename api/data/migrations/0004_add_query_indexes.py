@@ -0,0 +1,33 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:01
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Indexes are built concurrently (no write locks on large tables):
+    atomic = False
+
+    dependencies = [
+        ('data', '0003_alter_rawdata_time_interval_alter_rawdata_units'),
+        ('market', '0002_initial'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='marketforecasts',
+            index=models.Index(fields=['market_session', 'resource', 'datetime', 'request'], name='forecasts_session_res_dt_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='rawdata',
+            index=models.Index(fields=['resource', 'datetime'], name='raw_data_resource_dt_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='rawdata',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['datetime'], name='raw_data_datetime_brin'),
+        ),
+    ]
@@ -0,0 +1,181 @@
+"""
+Converts `raw_data` and `market_forecasts` into declarative PostgreSQL
+range-partitioned tables (monthly partitions on `datetime`, plus a
+DEFAULT partition for rows outside the pre-created months).
+
+Notes (PostgreSQL 12):
+  - Primary / unique keys of partitioned tables must include the
+    partition key, so the primary key becomes `(id, datetime)` (ids are
+    still generated by a sequence and the ORM keeps using `id`);
+  - Identity columns are not supported on partitioned tables, so `id`
+    is backed by a regular (owned) sequence;
+  - Unique constraints, foreign keys and indexes are recreated with
+    their original names, so later schema migrations keep working.
+
+Reverting copies the data back into plain (unpartitioned) tables, with
+the original primary key, constraints and indexes (so reverting
+0004_add_query_indexes afterwards still finds its indexes).
+
+Indexes (including the ones added concurrently in 0004, which may
+already be applied, thus not reordered) are built after the data is
+copied into each table, rather than maintained row by row by the copy.
+
+Future partitions are managed with `python manage.py manage_partitions`.
+The partition helpers used here are frozen at this migration (the
+current ones live in data.helpers.partitions).
+"""
+import datetime as dt
+
+from django.conf import settings
+from django.db import migrations
+
+PARTITIONED_TABLES = ("raw_data", "market_forecasts")
+PARTITION_KEY = "datetime"
+
+
+def month_start(date):
+    return dt.date(date.year, date.month, 1)
+
+
+def add_months(date, months):
+    month = date.year * 12 + date.month - 1 + months
+    return dt.date(month // 12, month % 12 + 1, 1)
+
+
+def create_partition(cursor, table, month):
+    # Partition bounds are UTC month boundaries:
+    start = f"'{month.isoformat()} 00:00:00+00'"
+    end = f"'{add_months(month, 1).isoformat()} 00:00:00+00'"
+    cursor.execute(f'CREATE TABLE "{table}_p{month:%Y%m}" '
+                   f'PARTITION OF "{table}" '
+                   f'FOR VALUES FROM ({start}) TO ({end})')
+
+
+def create_default_partition(cursor, table):
+    cursor.execute(f'CREATE TABLE "{table}_default" '
+                   f'PARTITION OF "{table}" DEFAULT')
+
+
+def table_constraints_and_indexes(cursor, table):
+    """
+    Unique / foreign key constraints and (non-constraint) indexes of
+    `table`, as (name, definition) pairs.
+    """
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype IN ('u', 'f')",
+        [table]
+    )
+    constraints = cursor.fetchall()
+    cursor.execute(
+        "SELECT i.relname, pg_get_indexdef(i.oid) FROM pg_index x "
+        "JOIN pg_class i ON i.oid = x.indexrelid "
+        "WHERE x.indrelid = %s::regclass AND NOT EXISTS "
+        "(SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)",
+        [table]
+    )
+    indexes = cursor.fetchall()
+    return constraints, indexes
+
+
+def add_constraints_and_indexes(cursor, table, constraints, indexes):
+    for name, definition in constraints:
+        cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" '
+                       f'{definition}')
+    for name, definition in indexes:
+        # e.g. "CREATE INDEX <name> ON [ONLY] public.<old> USING btree (...)"
+        unique = "UNIQUE " if definition.startswith("CREATE UNIQUE") else ""
+        method = definition.split(" USING ", 1)[1]
+        cursor.execute(f'CREATE {unique}INDEX "{name}" ON "{table}" '
+                       f'USING {method}')
+
+
+def partition_table(cursor, table):
+    legacy = f"{table}_unpartitioned"
+    cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+    # Constraints / indexes to recreate (with the same names):
+    constraints, indexes = table_constraints_and_indexes(cursor, legacy)
+
+    cursor.execute(f'CREATE TABLE "{table}" (LIKE "{legacy}" '
+                   f'INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+                   f'PARTITION BY RANGE ("{PARTITION_KEY}")')
+    # Drop `id` default copied from the legacy table (serial sequence):
+    cursor.execute(f'ALTER TABLE "{table}" ALTER COLUMN "id" DROP DEFAULT')
+
+    # Monthly partitions for the stored data and the upcoming months:
+    cursor.execute(f'SELECT min("{PARTITION_KEY}"), max("{PARTITION_KEY}"), '
+                   f'max("id") FROM "{legacy}"')
+    min_date, max_date, max_id = cursor.fetchone()
+    today = dt.datetime.now(dt.timezone.utc).date()
+    month = month_start(min_date if min_date else today)
+    last_month = add_months(month_start(today),
+                            settings.DATA_PARTITIONS_PREMAKE_MONTHS)
+    if max_date:
+        last_month = max(last_month, month_start(max_date))
+    while month <= last_month:
+        create_partition(cursor, table, month)
+        month = add_months(month, 1)
+    create_default_partition(cursor, table)
+
+    cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{legacy}"')
+    cursor.execute(f'DROP TABLE "{legacy}"')
+
+    cursor.execute(f'CREATE SEQUENCE "{table}_id_seq" '
+                   f'OWNED BY "{table}"."id"')
+    cursor.execute(f"SELECT setval('\"{table}_id_seq\"', %s, false)",
+                   [(max_id or 0) + 1])
+    cursor.execute(f'ALTER TABLE "{table}" ALTER COLUMN "id" '
+                   f'SET DEFAULT nextval(\'"{table}_id_seq"\')')
+
+    cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" '
+                   f'PRIMARY KEY ("id", "{PARTITION_KEY}")')
+    add_constraints_and_indexes(cursor, table, constraints, indexes)
+
+
+def unpartition_table(cursor, table):
+    partitioned = f"{table}_partitioned"
+    cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{partitioned}"')
+    constraints, indexes = table_constraints_and_indexes(cursor,
+                                                         partitioned)
+
+    cursor.execute(f'CREATE TABLE "{table}" (LIKE "{partitioned}" '
+                   f'INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{partitioned}"')
+    # Keep the `id` sequence (owned by the partitioned table, thus
+    # dropped with it otherwise):
+    cursor.execute(f'ALTER SEQUENCE "{table}_id_seq" '
+                   f'OWNED BY "{table}"."id"')
+    cursor.execute(f'DROP TABLE "{partitioned}"')
+
+    cursor.execute(f'ALTER TABLE "{table}" ADD CONSTRAINT "{table}_pkey" '
+                   f'PRIMARY KEY ("id")')
+    add_constraints_and_indexes(cursor, table, constraints, indexes)
+
+
+def partition_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            partition_table(cursor, table)
+
+
+def unpartition_tables(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for table in PARTITIONED_TABLES:
+            unpartition_table(cursor, table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0004_add_query_indexes'),
+    ]
+
+    operations = [
+        # No model state changes:
+        migrations.RunPython(partition_tables,
+                             reverse_code=unpartition_tables),
+    ]
@@ -0,0 +1,114 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:06
+
+from django.db import migrations, models
+
+
+# Unit mapping frozen at the time of this migration (independent of
+# `settings.DATA_CANONICAL_UNITS` / `data.helpers.units` at migrate time):
+CANONICAL_UNITS = "kw"
+UNIT_SCALES = {
+    "w": 1.0,
+    "kw": 1e3,
+    "mw": 1e6,
+}
+# Nr. of ids updated per statement (each batch is committed separately,
+# so rows are not kept locked for the whole table update):
+BATCH_SIZE = 50000
+
+TABLES = ("raw_data", "market_forecasts")
+
+
+def _factor_sql(units_column, to_units=None, from_units=None):
+    return "CASE \"%s\" %s END" % (units_column, " ".join(
+        f"WHEN '{units}' THEN "
+        f"{UNIT_SCALES[from_units or units] / UNIT_SCALES[to_units or units]!r}"
+        for units in UNIT_SCALES
+    ))
+
+
+def _batched_update(cursor, table, set_sql, where_sql, params=()):
+    cursor.execute(f'SELECT min("id"), max("id") FROM "{table}" '
+                   f'WHERE {where_sql}')
+    min_id, max_id = cursor.fetchone()
+    if min_id is None:
+        return
+    for start in range(min_id, max_id + 1, BATCH_SIZE):
+        cursor.execute(
+            f'UPDATE "{table}" SET {set_sql} '
+            f'WHERE "id" >= %s AND "id" < %s AND {where_sql}',
+            [*params, start, start + BATCH_SIZE]
+        )
+
+
+def normalize_stored_units(apps, schema_editor):
+    """
+    Convert stored values to the canonical unit, keeping the original
+    unit in `original_units`.
+    """
+    factor = _factor_sql("units", to_units=CANONICAL_UNITS)
+    with schema_editor.connection.cursor() as cursor:
+        for table in TABLES:
+            _batched_update(
+                cursor, table,
+                set_sql=f'"original_units" = "units", '
+                        f'"value" = "value" * ({factor}), '
+                        f'"units" = %s',
+                where_sql='"original_units" IS NULL',
+                params=[CANONICAL_UNITS]
+            )
+
+
+def restore_original_units(apps, schema_editor):
+    factor = _factor_sql("original_units", from_units=CANONICAL_UNITS)
+    with schema_editor.connection.cursor() as cursor:
+        for table in TABLES:
+            _batched_update(
+                cursor, table,
+                set_sql=f'"value" = "value" * ({factor}), '
+                        f'"units" = "original_units"',
+                where_sql='"original_units" IS NOT NULL'
+            )
+
+
+def add_column_sql(table):
+    # Idempotent - the (non-atomic) migration may be re-run after a
+    # failure in the middle of the batched update:
+    return f'ALTER TABLE "{table}" ADD COLUMN IF NOT EXISTS ' \
+           f'"original_units" varchar(2) NULL;'
+
+
+def drop_column_sql(table):
+    return f'ALTER TABLE "{table}" DROP COLUMN IF EXISTS "original_units";'
+
+
+class Migration(migrations.Migration):
+    # Batches are committed one by one (no long running transaction):
+    atomic = False
+
+    dependencies = [
+        ('data', '0005_partition_tables'),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(add_column_sql(table),
+                                  reverse_sql=drop_column_sql(table))
+                for table in TABLES
+            ],
+            state_operations=[
+                migrations.AddField(
+                    model_name='marketforecasts',
+                    name='original_units',
+                    field=models.CharField(blank=True, choices=[('w', 'Watt'), ('kw', 'Kilo Watt'), ('mw', 'Mega Watt')], max_length=2, null=True),
+                ),
+                migrations.AddField(
+                    model_name='rawdata',
+                    name='original_units',
+                    field=models.CharField(blank=True, choices=[('w', 'Watt'), ('kw', 'Kilowatt'), ('mw', 'Megawatt')], max_length=2, null=True),
+                ),
+            ],
+        ),
+        migrations.RunPython(normalize_stored_units,
+                             reverse_code=restore_original_units),
+    ]
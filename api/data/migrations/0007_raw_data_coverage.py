@@ -0,0 +1,78 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Coverage of the raw data stored before this migration (gaps-and-islands
+# query, frozen at this migration - see data.helpers.coverage):
+BUILD_COVERAGE_SQL = """
+WITH steps AS (
+    SELECT resource_id, user_id, time_interval, datetime,
+           CASE WHEN datetime - lag(datetime) OVER w
+                     <= time_interval * interval '1 minute'
+                THEN 0 ELSE 1 END AS new_range
+    FROM raw_data
+    WINDOW w AS (PARTITION BY resource_id ORDER BY datetime)
+), islands AS (
+    SELECT *, sum(new_range) OVER (PARTITION BY resource_id
+                                   ORDER BY datetime) AS range_id
+    FROM steps
+), ranges AS (
+    SELECT resource_id, range_id,
+           (array_agg(user_id))[1] AS user_id,
+           (array_agg(time_interval ORDER BY datetime DESC))[1] AS time_interval,
+           min(datetime) AS range_start,
+           max(datetime) AS range_end
+    FROM islands
+    GROUP BY resource_id, range_id
+)
+INSERT INTO raw_data_coverage (resource_id, user_id, time_interval, ranges,
+                               first_datetime, last_datetime, n_gaps,
+                               updated_at)
+SELECT resource_id,
+       (array_agg(user_id))[1],
+       (array_agg(time_interval ORDER BY range_end DESC))[1],
+       jsonb_agg(jsonb_build_array(
+           to_char(range_start AT TIME ZONE 'UTC',
+                   'YYYY-MM-DD"T"HH24:MI:SS"Z"'),
+           to_char(range_end AT TIME ZONE 'UTC',
+                   'YYYY-MM-DD"T"HH24:MI:SS"Z"')
+       ) ORDER BY range_start),
+       min(range_start),
+       max(range_end),
+       count(*) - 1,
+       now()
+FROM ranges
+GROUP BY resource_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0006_normalize_units'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RawDataCoverage',
+            fields=[
+                ('resource', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='raw_data_coverage', serialize=False, to='users.userresources')),
+                ('time_interval', models.IntegerField()),
+                ('ranges', models.JSONField(blank=True, default=list)),
+                ('first_datetime', models.DateTimeField(blank=True, null=True)),
+                ('last_datetime', models.DateTimeField(blank=True, null=True)),
+                ('n_gaps', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'raw_data_coverage',
+            },
+        ),
+        migrations.RunSQL(BUILD_COVERAGE_SQL,
+                          reverse_sql=migrations.RunSQL.noop),
+    ]
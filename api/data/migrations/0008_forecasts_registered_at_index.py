@@ -0,0 +1,21 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0007_raw_data_coverage'),
+        ('market', '0002_initial'),
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='marketforecasts',
+            index=models.Index(fields=['registered_at'], name='forecasts_registered_at_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:26
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0008_forecasts_registered_at_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataExport',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('table', models.TextField(choices=[('raw_data', 'Raw Data'), ('market_forecasts', 'Market Forecasts'), ('market_session_transactions', 'Market Session Transactions'), ('market_session_balance', 'Market Session Balance')])),
+                ('file_format', models.TextField(choices=[('csv', 'Csv'), ('parquet', 'Parquet')], default='csv')),
+                ('filters', models.JSONField(blank=True, default=dict)),
+                ('status', models.TextField(choices=[('pending', 'Pending'), ('running', 'Running'), ('finished', 'Finished'), ('failed', 'Failed')], default='pending')),
+                ('file', models.FileField(blank=True, null=True, upload_to='exports/')),
+                ('n_rows', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('registered_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'data_export',
+                'indexes': [models.Index(fields=['user', 'registered_at'], name='data_export_user_reg_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:35
+
+import data.models.data_export
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data', '0009_data_export'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dataexport',
+            name='file',
+            field=models.FileField(blank=True, null=True, storage=data.models.data_export.export_storage, upload_to=''),
+        ),
+    ]
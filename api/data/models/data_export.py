@@ -0,0 +1,116 @@
+import os
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+
+
+class ExportStorage(FileSystemStorage):
+    """
+    Storage of the exported files, in `settings.DATA_EXPORT_ROOT`
+    (private, see `DataExport.file`).
+    """
+    @property
+    def base_location(self):
+        return settings.DATA_EXPORT_ROOT
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+
+def export_storage():
+    return ExportStorage()
+
+
+class DataExport(models.Model):
+    """
+    Asynchronous export of a data / market table into a file (CSV or
+    Parquet), written by the `run_data_exports` worker.
+    """
+    class ExportTable(models.TextChoices):
+        RAW_DATA = "raw_data"
+        MARKET_FORECASTS = "market_forecasts"
+        MARKET_SESSION_TRANSACTIONS = "market_session_transactions"
+        MARKET_SESSION_BALANCE = "market_session_balance"
+
+    class ExportFormat(models.TextChoices):
+        CSV = "csv"
+        PARQUET = "parquet"
+
+    class ExportStatus(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        FINISHED = "finished"
+        FAILED = "failed"
+
+    # Export ID:
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    # User who requested the export:
+    user = models.ForeignKey(
+        to="users.User",
+        on_delete=models.CASCADE,
+    )
+    # Exported table:
+    table = models.TextField(
+        choices=ExportTable.choices,
+        null=False,
+        blank=False
+    )
+    # Export file format:
+    file_format = models.TextField(
+        choices=ExportFormat.choices,
+        default=ExportFormat.CSV,
+        null=False,
+        blank=False
+    )
+    # Query filters ({"user": ..., "resource": ..., "start_date": ...}):
+    filters = models.JSONField(
+        default=dict,
+        blank=True
+    )
+    # Export status:
+    status = models.TextField(
+        choices=ExportStatus.choices,
+        default=ExportStatus.PENDING,
+        null=False,
+        blank=False
+    )
+    # Exported file (relative to DATA_EXPORT_ROOT, which is not publicly
+    # served - downloads go through the authenticated export endpoint):
+    file = models.FileField(
+        storage=export_storage,
+        null=True,
+        blank=True
+    )
+    # Nr. of exported rows:
+    n_rows = models.IntegerField(
+        default=0
+    )
+    # Error message (failed exports):
+    error = models.TextField(
+        null=True,
+        blank=True
+    )
+    # Register date:
+    registered_at = models.DateTimeField(auto_now_add=True)
+    # Update date (also the heartbeat of running exports):
+    updated_at = models.DateTimeField(auto_now=True)
+    # Export finish date:
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        db_table = "data_export"
+        indexes = [
+            # Export status polling (GET /export):
+            models.Index(fields=["user", "registered_at"],
+                         name="data_export_user_reg_idx"),
+        ]
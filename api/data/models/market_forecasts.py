@@ -45,9 +45,26 @@ class MarketForecasts(models.Model):
         null=False,
         blank=False)
 
+    # Original time-series unit (values are stored in the canonical unit,
+    # see settings.DATA_CANONICAL_UNITS):
+    original_units = models.CharField(
+        max_length=2,
+        choices=ForecastsUnits.choices,
+        null=True,
+        blank=True)
+
     # Insert date:
     registered_at = models.DateTimeField(blank=False)
 
     class Meta:
         db_table = "market_forecasts"
         unique_together = ("user", "resource", "market_session", "datetime")
+        indexes = [
+            # Session / resource queries, ordered by (datetime, request):
+            models.Index(fields=["market_session", "resource",
+                                 "datetime", "request"],
+                         name="forecasts_session_res_dt_idx"),
+            # Delta sync queries (GET /market-forecasts?since=...):
+            models.Index(fields=["registered_at"],
+                         name="forecasts_registered_at_idx"),
+        ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.indexes import BrinIndex
 from users.models import UserResources
 
 
@@ -53,6 +54,13 @@ class RawData(models.Model):
         choices=RawDataUnits.choices,
         null=False,
         blank=False)
+    # Original time-series unit (values are stored in the canonical unit,
+    # see settings.DATA_CANONICAL_UNITS):
+    original_units = models.CharField(
+        max_length=2,
+        choices=RawDataUnits.choices,
+        null=True,
+        blank=True)
     # Time-series time resolution:
     time_interval = models.IntegerField(
         choices=RawDataTimeInterval.choices,
@@ -70,3 +78,11 @@ class RawData(models.Model):
     class Meta:
         db_table = "raw_data"
         unique_together = ("user", "resource", "datetime")
+        indexes = [
+            # Resource time-range queries (GET /raw-data?resource=...):
+            models.Index(fields=["resource", "datetime"],
+                         name="raw_data_resource_dt_idx"),
+            # Time-range scans (rows are appended in time order):
+            BrinIndex(fields=["datetime"],
+                      name="raw_data_datetime_brin"),
+        ]
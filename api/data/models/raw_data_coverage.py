@@ -0,0 +1,44 @@
+from django.db import models
+
+
+class RawDataCoverage(models.Model):
+    """
+    Per-resource coverage index of the raw data time-series (contiguous
+    ranges of timestamps present), maintained by the ingestion path.
+    """
+    # Resource ID (one coverage entry per resource):
+    resource = models.OneToOneField(
+        to="users.UserResources",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="raw_data_coverage",
+    )
+    # User ID:
+    user = models.ForeignKey(
+        to="users.User",
+        on_delete=models.CASCADE,
+    )
+    # Time-series time resolution (minutes) of the last upload:
+    time_interval = models.IntegerField(
+        null=False,
+        blank=False)
+    # Contiguous ranges, sorted by start ([[start, end], ...], ISO 8601):
+    ranges = models.JSONField(
+        default=list,
+        blank=True)
+    # First timestamp of the series:
+    first_datetime = models.DateTimeField(
+        blank=True,
+        null=True)
+    # Last timestamp of the series:
+    last_datetime = models.DateTimeField(
+        blank=True,
+        null=True)
+    # Number of gaps between ranges:
+    n_gaps = models.IntegerField(
+        default=0)
+    # Update date:
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "raw_data_coverage"
@@ -22,6 +22,58 @@ def raw_data_query_params():
                           type=openapi.TYPE_INTEGER,
                           required=True,
                           description="Filter by agent resource identifier"),
+        openapi.Parameter("fast", openapi.IN_QUERY,
+                          type=openapi.TYPE_BOOLEAN,
+                          required=False,
+                          description="If true, rows are read and "
+                                      "serialized through a faster path "
+                                      "(same response format). "
+                                      "Defaults to false."),
+        openapi.Parameter("stream", openapi.IN_QUERY,
+                          type=openapi.TYPE_BOOLEAN,
+                          required=False,
+                          description="If true, the response rows are "
+                                      "streamed in chunks (same response "
+                                      "format), for large downloads. "
+                                      "Can not be combined with "
+                                      "pagination. Defaults to false."),
+        openapi.Parameter("page_size", openapi.IN_QUERY,
+                          type=openapi.TYPE_INTEGER,
+                          required=False,
+                          description="Enables keyset pagination, with "
+                                      "this number of records per page. "
+                                      "Paginated responses return "
+                                      "`{'next': <cursor>, 'page_size': "
+                                      "<int>, 'results': [...]}`. "
+                                      "Responses without pagination are "
+                                      "limited to "
+                                      "PAGINATION_MAX_UNPAGINATED_ROWS "
+                                      "rows (400 if exceeded)."),
+        openapi.Parameter("cursor", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=False,
+                          description="Pagination cursor (the 'next' "
+                                      "field of the previous page)."),
+        openapi.Parameter("resample", openapi.IN_QUERY,
+                          type=openapi.TYPE_INTEGER,
+                          required=False,
+                          description="Downsample the time-series to this "
+                                      "time resolution (minutes), e.g. 60 "
+                                      "for hourly data. Buckets are "
+                                      "aligned on UTC."),
+        openapi.Parameter("agg", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=False,
+                          enum=["avg", "min", "max", "sum"],
+                          description="Aggregation applied to each "
+                                      "resampled bucket. Defaults to avg."),
+        openapi.Parameter("units", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=False,
+                          enum=["w", "kw", "mw"],
+                          description="Convert values to these units. "
+                                      "By default, values are returned "
+                                      "in the canonical (stored) unit."),
     ]
 
 
@@ -47,4 +99,94 @@ def market_forecasts_query_params():
                           type=openapi.TYPE_INTEGER,
                           required=True,
                           description="Filter by market session identifier"),
+        openapi.Parameter("fast", openapi.IN_QUERY,
+                          type=openapi.TYPE_BOOLEAN,
+                          required=False,
+                          description="If true, rows are read and "
+                                      "serialized through a faster path "
+                                      "(same response format). "
+                                      "Defaults to false."),
+        openapi.Parameter("stream", openapi.IN_QUERY,
+                          type=openapi.TYPE_BOOLEAN,
+                          required=False,
+                          description="If true, the response rows are "
+                                      "streamed in chunks (same response "
+                                      "format), for large downloads. "
+                                      "Can not be combined with "
+                                      "pagination. Defaults to false."),
+        openapi.Parameter("page_size", openapi.IN_QUERY,
+                          type=openapi.TYPE_INTEGER,
+                          required=False,
+                          description="Enables keyset pagination, with "
+                                      "this number of records per page. "
+                                      "Paginated responses return "
+                                      "`{'next': <cursor>, 'page_size': "
+                                      "<int>, 'results': [...]}`. "
+                                      "Responses without pagination are "
+                                      "limited to "
+                                      "PAGINATION_MAX_UNPAGINATED_ROWS "
+                                      "rows (400 if exceeded)."),
+        openapi.Parameter("cursor", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=False,
+                          description="Pagination cursor (the 'next' "
+                                      "field of the previous page)."),
+        openapi.Parameter("units", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=False,
+                          enum=["w", "kw", "mw"],
+                          description="Convert values to these units. "
+                                      "By default, values are returned "
+                                      "in the canonical (stored) unit."),
+        openapi.Parameter("since", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=False,
+                          description="Delta sync: only return forecasts "
+                                      "inserted or updated after this "
+                                      "watermark (ISO 8601 datetime, "
+                                      "compared with `registered_at`). "
+                                      "Responses are paginated (`{'next': "
+                                      "<cursor>, 'page_size': ..., "
+                                      "'results': [...], 'watermark': "
+                                      "<datetime>}`): follow 'next' "
+                                      "(with the same 'since') until it "
+                                      "is null, then send 'watermark' "
+                                      "on the next request. Rows are "
+                                      "only returned once older than "
+                                      "the commit window "
+                                      "(DELTA_SYNC_COMMIT_WINDOW)."),
+    ]
+
+
+def raw_data_coverage_query_params():
+    return [
+        openapi.Parameter("resource", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=False,
+                          description="Filter by agent resource identifier"),
+    ]
+
+
+def raw_data_stream_query_params():
+    return [
+        openapi.Parameter("resource_name", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=True,
+                          description="Agent resource name"),
+        openapi.Parameter("time_interval", openapi.IN_QUERY,
+                          type=openapi.TYPE_INTEGER,
+                          required=True,
+                          enum=[5, 15, 30, 60],
+                          description="Time-series time resolution "
+                                      "(minutes)"),
+        openapi.Parameter("aggregation_type", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=True,
+                          enum=["avg"],
+                          description="Time-series aggregation type"),
+        openapi.Parameter("units", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=True,
+                          enum=["w", "kw", "mw"],
+                          description="Time-series units"),
     ]
@@ -135,6 +135,54 @@ RawDataResponse = {
 }
 
 
+###############################
+# RawDataCoverageView
+###############################
+GetRawDataCoverageResponse = \
+    openapi.Response(
+        description="Success",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "code": create_schema(
+                    type=openapi.TYPE_INTEGER,
+                    enum=[200],
+                    description="Response status code."
+                ),
+                "data": create_schema(
+                    type=openapi.TYPE_OBJECT,
+                    description="Response data."
+                ),
+            },
+        ),
+        examples={
+            "application/json": {
+                "code": 200,
+                "data": [
+                    {
+                        "resource": "b8d8a2a4-5c5a-4d5e-8e0f-3a4b5c6d7e8f",
+                        "resource_name": "park-1",
+                        "time_interval": 60,
+                        "first_datetime": "2022-10-01T00:00:00Z",
+                        "last_datetime": "2022-10-03T23:00:00Z",
+                        "n_gaps": 1,
+                        "ranges": [
+                            ["2022-10-01T00:00:00Z", "2022-10-01T23:00:00Z"],
+                            ["2022-10-03T00:00:00Z", "2022-10-03T23:00:00Z"]
+                        ],
+                        "updated_at": "2022-10-04T00:00:12.131623Z"
+                    }
+                ]
+            },
+        }
+    )
+
+
+RawDataCoverageResponse = {
+    "GET": GetRawDataCoverageResponse,
+}
+
+
 ###############################
 # MarketForecastsView
 ###############################
@@ -178,3 +226,62 @@ GetMarketForecastsResponse = \
 MarketForecastsResponse = {
     "GET": GetMarketForecastsResponse,
 }
+
+
+###############################
+# DataExportView
+###############################
+_data_export_example = {
+    "id": "5f0c6a1e-2b7d-4c1a-9a3e-6d2f8b9c0e1a",
+    "table": "raw_data",
+    "file_format": "csv",
+    "filters": {
+        "user": "0a1b2c3d-4e5f-6a7b-8c9d-0e1f2a3b4c5d",
+        "resource": "b8d8a2a4-5c5a-4d5e-8e0f-3a4b5c6d7e8f",
+        "start_date": "2022-10-01T00:00:00Z",
+        "end_date": "2022-10-31T23:00:00Z"
+    },
+    "status": "finished",
+    "n_rows": 744,
+    "error": None,
+    "download_url": "/api/data/export/"
+                    "5f0c6a1e-2b7d-4c1a-9a3e-6d2f8b9c0e1a/download",
+    "registered_at": "2022-11-01T10:00:00.131623Z",
+    "finished_at": "2022-11-01T10:00:02.472161Z"
+}
+
+
+def _data_export_response(code, description, data):
+    return openapi.Response(
+        description=description,
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "code": create_schema(
+                    type=openapi.TYPE_INTEGER,
+                    enum=[code],
+                    description="Response status code."
+                ),
+                "data": create_schema(
+                    type=openapi.TYPE_OBJECT,
+                    description="Response data."
+                ),
+            },
+        ),
+        examples={
+            "application/json": {
+                "code": code,
+                "data": data
+            },
+        }
+    )
+
+
+DataExportResponse = {
+    "GET": _data_export_response(200, "Success", [_data_export_example]),
+    "POST": _data_export_response(
+        202, "Accepted",
+        {**_data_export_example, "status": "pending", "n_rows": 0,
+         "download_url": None, "finished_at": None}
+    ),
+}
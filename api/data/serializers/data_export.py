@@ -0,0 +1,82 @@
+from django.urls import reverse
+from rest_framework import serializers
+
+from ..models.data_export import DataExport
+
+
+class DataExportFiltersSerializer(serializers.Serializer):
+    # Only available to superusers (other users export their own data):
+    user = serializers.UUIDField(required=False)
+    resource = serializers.UUIDField(required=False)
+    market_session = serializers.IntegerField(required=False)
+    start_date = serializers.DateTimeField(required=False)
+    end_date = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs):
+        start_date = attrs.get("start_date")
+        end_date = attrs.get("end_date")
+        if start_date and end_date and start_date > end_date:
+            raise serializers.ValidationError(
+                "Filter 'start_date' must be lower than 'end_date'."
+            )
+        return attrs
+
+
+# Filters not available for an exported table (no such column):
+UNSUPPORTED_FILTERS = {
+    DataExport.ExportTable.RAW_DATA: ("market_session",),
+}
+
+
+class DataExportCreateSerializer(serializers.ModelSerializer):
+    filters = DataExportFiltersSerializer(required=False)
+
+    class Meta:
+        model = DataExport
+        fields = ["table", "file_format", "filters"]
+
+    def validate(self, attrs):
+        user = self.context["request"].user
+        filters = attrs.get("filters", {})
+        unsupported = [x for x in UNSUPPORTED_FILTERS.get(attrs["table"], [])
+                       if x in filters]
+        if unsupported:
+            raise serializers.ValidationError({
+                "filters": f"Filters {unsupported} are not available for "
+                           f"table '{attrs['table']}'."
+            })
+        if not user.is_superuser or "user" not in filters:
+            filters["user"] = user.id
+        # JSON representation of the filters:
+        attrs["filters"] = DataExportFiltersSerializer(filters).data
+        return attrs
+
+    def create(self, validated_data):
+        return DataExport.objects.create(
+            user=self.context["request"].user,
+            **validated_data
+        )
+
+
+class DataExportRetrieveSerializer(serializers.ModelSerializer):
+    # Authenticated download endpoint (finished exports only):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = DataExport
+        fields = ["id",
+                  "table",
+                  "file_format",
+                  "filters",
+                  "status",
+                  "n_rows",
+                  "error",
+                  "download_url",
+                  "registered_at",
+                  "finished_at"]
+
+    @staticmethod
+    def get_download_url(instance):
+        if instance.status != DataExport.ExportStatus.FINISHED:
+            return None
+        return reverse("data:data-export-download", args=[instance.id])
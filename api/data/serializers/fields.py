@@ -0,0 +1,126 @@
+import pandas as pd
+
+from rest_framework import serializers
+
+
+class ColumnarTimeseriesField(serializers.Field):
+    """
+    Time-series payload in columnar format, validated with pandas.
+
+    Accepts either parallel arrays of timestamps and values:
+        {"datetime": ["2022-10-01T00:00:00Z", ...], "value": [7802, ...]}
+    or a regular series, given by its first timestamp (ISO string or
+    epoch seconds) and time interval (minutes):
+        {"start": "2022-10-01T00:00:00Z", "interval": 15, "value": [...]}
+
+    Extra timestamp columns (e.g. forecasts `request`) can be declared
+    through `extra_datetime_columns` and accept either an array (one
+    timestamp per value) or a single timestamp applied to all values.
+
+    Validation runs vectorized over the full arrays, and the field
+    returns a DataFrame with `datetime`, `value` and extra columns.
+    """
+    MAX_REPORTED_ERRORS = 10
+
+    default_error_messages = {
+        "invalid": "Expected a columnar object with 'value' and either "
+                   "'datetime' or 'start' and 'interval' fields.",
+        "not_a_list": "Expected a list of items but got type '{input_type}'.",
+        "length_mismatch": "Field '{field}' must have the same length "
+                           "as 'value' ({expected} items).",
+        "invalid_datetime": "Invalid or null timestamps at positions "
+                            "{positions}.",
+        "invalid_value": "Invalid or null values at positions {positions}.",
+        "invalid_interval": "Field 'interval' must be a positive integer "
+                            "(minutes).",
+        "invalid_start": "Field 'start' must be an ISO 8601 datetime or "
+                         "an epoch timestamp (seconds).",
+        "empty": "This list may not be empty.",
+    }
+
+    def __init__(self, extra_datetime_columns=(), **kwargs):
+        self.extra_datetime_columns = tuple(extra_datetime_columns)
+        super().__init__(**kwargs)
+
+    def _positions(self, mask):
+        positions = mask.to_numpy().nonzero()[0]
+        return positions[:self.MAX_REPORTED_ERRORS].tolist()
+
+    def _to_list(self, data):
+        if not isinstance(data, list):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        return data
+
+    @staticmethod
+    def _parse_datetime(data):
+        return pd.to_datetime(pd.Series(data, dtype=object), utc=True,
+                              errors="coerce", format="ISO8601")
+
+    def _parse_start(self, start):
+        if isinstance(start, (int, float)) and not isinstance(start, bool):
+            # Epoch (seconds):
+            start = pd.Timestamp(start, unit="s", tz="UTC")
+        else:
+            start = self._parse_datetime([start]).iloc[0]
+        if pd.isna(start):
+            self.fail("invalid_start")
+        return start
+
+    def to_internal_value(self, data):
+        if not isinstance(data, dict) or ("value" not in data):
+            self.fail("invalid")
+
+        raw_values = self._to_list(data["value"])
+        if len(raw_values) == 0:
+            self.fail("empty")
+        size = len(raw_values)
+
+        values = pd.to_numeric(pd.Series(raw_values, dtype=object),
+                               errors="coerce")
+        if values.isna().any():
+            self.fail("invalid_value",
+                      positions=self._positions(values.isna()))
+
+        if "datetime" in data:
+            raw_datetime = self._to_list(data["datetime"])
+            if len(raw_datetime) != size:
+                self.fail("length_mismatch", field="datetime", expected=size)
+            timestamps = self._parse_datetime(raw_datetime)
+            if timestamps.isna().any():
+                self.fail("invalid_datetime",
+                          positions=self._positions(timestamps.isna()))
+        elif ("start" in data) and ("interval" in data):
+            interval = data["interval"]
+            if isinstance(interval, bool) or not isinstance(interval, int) \
+                    or interval <= 0:
+                self.fail("invalid_interval")
+            timestamps = pd.date_range(start=self._parse_start(data["start"]),
+                                       periods=size,
+                                       freq=f"{interval}min")
+        else:
+            self.fail("invalid")
+
+        df = pd.DataFrame({"datetime": timestamps,
+                           "value": values.astype(float)})
+
+        for column in self.extra_datetime_columns:
+            if column not in data:
+                raise serializers.ValidationError(
+                    {column: ["This field is required."]}
+                )
+            is_list = isinstance(data[column], list)
+            if is_list and len(data[column]) != size:
+                self.fail("length_mismatch", field=column, expected=size)
+            column_ts = self._parse_datetime(
+                data[column] if is_list else [data[column]]
+            )
+            if column_ts.isna().any():
+                self.fail("invalid_datetime",
+                          positions=self._positions(column_ts.isna()))
+            # A single timestamp is shared by all values:
+            df[column] = column_ts if is_list else column_ts.iloc[0]
+
+        return df
+
+    def to_representation(self, value):
+        return value.to_dict(orient="list")
@@ -9,10 +9,26 @@ from users.util.validators import ResourceNameValidator
 
 from .. import exceptions as data_exceptions
 from ..models.market_forecasts import MarketForecasts
-from ..helpers.sql import to_sql_update
+from ..helpers.sql import upsert_dataframe
+from ..helpers.units import normalize_units
+from .fields import ColumnarTimeseriesField
 
 
 class MarketForecastsRetrieveSerializer(serializers.ModelSerializer):
+    # Output key -> queryset lookup, for the serializer-free read path
+    # (see `data.helpers.representation`). Must match this serializer:
+    values_fields = {
+        "market_session": "market_session_id",
+        "datetime": "datetime",
+        "request": "request",
+        "value": "value",
+        "units": "units",
+        "resource": "resource_id",
+        "registered_at": "registered_at",
+        "resource_name": "resource__name",
+    }
+    values_datetime_fields = ("datetime", "request", "registered_at")
+
     class Meta:
         model = MarketForecasts
         fields = ["market_session",
@@ -91,9 +107,9 @@ class MarketForecastsCreateSerializer(serializers.Serializer):
         data["resource_id"] = resource_id
         # data["resource_name"] = resource_name
         data["market_session_id"] = validated_data["market_session"]
-        data["units"] = validated_data["units"]
+        data = normalize_units(data, validated_data["units"])
         data["registered_at"] = dt.datetime.utcnow()
-        msg = to_sql_update(
+        result = upsert_dataframe(
             conn=connection,
             df=data,
             table=MarketForecasts._meta.db_table,
@@ -104,4 +120,20 @@ class MarketForecastsCreateSerializer(serializers.Serializer):
                 "datetime"
             ],
         )
-        return {"status": "ok", "message": msg}
+        msg = "One or more database records were updated." \
+            if result.updated > 0 else ''
+        return {"status": "ok",
+                "message": msg,
+                "inserted": result.inserted,
+                "updated": result.updated}
+
+
+class MarketForecastsColumnarCreateSerializer(MarketForecastsCreateSerializer):
+    """
+    Same as `MarketForecastsCreateSerializer`, but with the `timeseries`
+    field given in columnar format (see `ColumnarTimeseriesField`).
+    The forecast `request` timestamp can be a single value or an array.
+    """
+    timeseries = ColumnarTimeseriesField(required=True,
+                                         allow_null=False,
+                                         extra_datetime_columns=["request"])
@@ -1,7 +1,7 @@
 import pandas as pd
 import datetime as dt
 
-from django.db import connection
+from django.db import connection, transaction
 from rest_framework import serializers
 
 from users.models import UserResources
@@ -9,10 +9,41 @@ from users.util.validators import ResourceNameValidator
 
 from .. import exceptions as data_exceptions
 from ..models.raw_data import RawData
-from ..helpers.sql import to_sql_update
+from ..models.raw_data_coverage import RawDataCoverage
+from ..helpers.sql import upsert_dataframe
+from ..helpers.units import normalize_units
+from ..helpers.coverage import lock_coverage, update_coverage
+from .fields import ColumnarTimeseriesField
 
 
 class RawDataRetrieveSerializer(serializers.ModelSerializer):
+    # Output key -> queryset lookup, for the serializer-free read path
+    # (see `data.helpers.representation`). Must match this serializer:
+    values_fields = {
+        "datetime": "datetime",
+        "value": "value",
+        "units": "units",
+        "resource": "resource_id",
+        "resource_type": "resource_type",
+        "time_interval": "time_interval",
+        "aggregation_type": "aggregation_type",
+        "registered_at": "registered_at",
+        "resource_name": "resource__name",
+    }
+    values_datetime_fields = ("datetime", "registered_at")
+    # Same output keys, for resampled rows (see `data.helpers.timeseries`):
+    resample_values_fields = {
+        "datetime": "bucket",
+        "value": "bucket_value",
+        "units": "units",
+        "resource": "resource_id",
+        "resource_type": "resource_type",
+        "time_interval": "bucket_interval",
+        "aggregation_type": "bucket_aggregation",
+        "registered_at": "bucket_registered_at",
+        "resource_name": "resource__name",
+    }
+
     class Meta:
         model = RawData
         fields = ["datetime",
@@ -92,6 +123,19 @@ class RawDataCreateSerializer(serializers.Serializer):
         """
         # Get timeseries info:
         data = pd.DataFrame(validated_data["timeseries"])
+        result = self.insert_timeseries(data, validated_data)
+        msg = "One or more database records were updated." \
+            if result.updated > 0 else ''
+        return {"status": "ok",
+                "message": msg,
+                "inserted": result.inserted,
+                "updated": result.updated}
+
+    @staticmethod
+    def insert_timeseries(data, validated_data):
+        """
+        Upsert a (datetime, value) DataFrame for the validated resource.
+        """
         # todo: process data - adjust to time resolution here or on aux step
         # Get resource info:
         resource_data = validated_data["resource_data"]
@@ -105,16 +149,56 @@ class RawDataCreateSerializer(serializers.Serializer):
         data["resource_type"] = resource_type
         data["time_interval"] = validated_data["time_interval"]
         data["aggregation_type"] = validated_data["aggregation_type"]
-        data["units"] = validated_data["units"]
+        data = normalize_units(data, validated_data["units"])
         data["registered_at"] = dt.datetime.utcnow()
-        msg = to_sql_update(
-            conn=connection,
-            df=data,
-            table=RawData._meta.db_table,
-            constraint_columns=[
-                "user_id",
-                "resource_id",
-                "datetime"
-            ],
-        )
-        return {"status": "ok", "message": msg}
+        with transaction.atomic():
+            # Coverage index is updated along with the series:
+            coverage = lock_coverage(resource=resource_data,
+                                     interval=validated_data["time_interval"])
+            result = upsert_dataframe(
+                conn=connection,
+                df=data,
+                table=RawData._meta.db_table,
+                constraint_columns=[
+                    "user_id",
+                    "resource_id",
+                    "datetime"
+                ],
+            )
+            update_coverage(coverage=coverage,
+                            timestamps=data["datetime"],
+                            interval=validated_data["time_interval"])
+        return result
+
+
+class RawDataColumnarCreateSerializer(RawDataCreateSerializer):
+    """
+    Same as `RawDataCreateSerializer`, but with the `timeseries` field
+    given in columnar format (see `ColumnarTimeseriesField`).
+    """
+    timeseries = ColumnarTimeseriesField(required=True,
+                                         allow_null=False)
+
+
+class RawDataStreamSerializer(RawDataCreateSerializer):
+    """
+    Resource metadata for streamed raw data uploads. The time-series
+    itself is read from the request body, chunk by chunk.
+    """
+    timeseries = None
+
+
+class RawDataCoverageSerializer(serializers.ModelSerializer):
+    resource_name = serializers.CharField(source="resource.name",
+                                          read_only=True)
+
+    class Meta:
+        model = RawDataCoverage
+        fields = ["resource",
+                  "resource_name",
+                  "time_interval",
+                  "first_datetime",
+                  "last_datetime",
+                  "n_gaps",
+                  "ranges",
+                  "updated_at"]
@@ -0,0 +1,113 @@
+import datetime as dt
+
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from users.models import UserResources
+from market.models import MarketSession
+from ..models.raw_data import RawData
+from ..models.market_forecasts import MarketForecasts
+
+
+def create_user(use_custom_data=False, verify_email=True, **kwargs):
+    if use_custom_data:
+        data = {
+            'email': kwargs["email"],
+            'password': kwargs["password"],
+            'first_name': kwargs["first_name"],
+            'last_name': kwargs["last_name"],
+        }
+    else:
+        data = {
+            'email': 'carl.sagan@bob.bob',
+            'password': 'foo',
+            'first_name': "Carl",
+            'last_name': "Sagan"
+        }
+
+    user = get_user_model().objects.create_user(**data,
+                                                is_active=verify_email,
+                                                is_verified=verify_email)
+    user.raw_password = data["password"]
+    return user
+
+
+def create_superuser():
+    data = {'email': 'admin@user.com', 'password': 'admin_foo'}
+    admin_user = get_user_model().objects.create_superuser(
+        email=data["email"],
+        password=data["password"]
+    )
+    admin_user.raw_password = data["password"]
+    return admin_user
+
+
+def create_and_login_superuser(client):
+    user = create_superuser()
+    client.login(email=user.email, password=user.raw_password)
+    return user
+
+
+def login_user(client, user):
+    response = client.post(reverse("token_obtain_pair"),
+                           data={"email": user.email,
+                                 "password": user.raw_password})
+    user_token = response.data['access']
+    client.credentials(HTTP_AUTHORIZATION="Bearer " + user_token)
+
+
+def create_user_resource(user, name="resource-1"):
+    return UserResources.objects.create(
+        user_id=user.id,
+        name=name,
+        type="measurements",
+        to_forecast=True
+    )
+
+
+def create_market_session(session_number=1, status="open"):
+    return MarketSession.objects.create(
+        session_number=session_number,
+        status=status,
+        market_price=56842.10,
+        b_min=10000,
+        b_max=100000,
+        n_price_steps=20,
+        delta=0.05
+    )
+
+
+def create_raw_data(resource, nr_points=10, time_interval=60,
+                    start=dt.datetime(2022, 10, 1, tzinfo=dt.timezone.utc)):
+    step = dt.timedelta(minutes=time_interval)
+    return RawData.objects.bulk_create([
+        RawData(
+            user_id=resource.user_id,
+            resource=resource,
+            resource_type=resource.type,
+            datetime=start + i * step,
+            value=float(i),
+            units="kw",
+            time_interval=time_interval,
+            aggregation_type="avg",
+            registered_at=dt.datetime.now(dt.timezone.utc),
+        ) for i in range(nr_points)
+    ])
+
+
+def create_market_forecasts(resource, market_session, nr_points=10,
+                            start=dt.datetime(2022, 10, 1,
+                                              tzinfo=dt.timezone.utc)):
+    step = dt.timedelta(minutes=15)
+    return MarketForecasts.objects.bulk_create([
+        MarketForecasts(
+            user_id=resource.user_id,
+            resource=resource,
+            market_session=market_session,
+            datetime=start + i * step,
+            request=start,
+            value=float(i),
+            units="kw",
+            registered_at=dt.datetime.now(dt.timezone.utc),
+        ) for i in range(nr_points)
+    ])
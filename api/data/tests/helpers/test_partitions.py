@@ -0,0 +1,141 @@
+# flake8: noqa
+
+import io
+import datetime as dt
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TransactionTestCase
+
+from ...helpers.partitions import (
+    month_start,
+    add_months,
+    partition_name,
+    default_partition_name,
+    list_partitions,
+    create_partition,
+)
+from ...models.raw_data import RawData
+from ..common import create_user, create_user_resource, create_raw_data
+
+
+class TestPartitions(TransactionTestCase):
+    """
+        Tests for the monthly partitions helpers and the
+        `manage_partitions` command.
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.current_month = month_start(
+            dt.datetime.now(dt.timezone.utc).date()
+        )
+        with connection.cursor() as cursor:
+            self.initial_partitions = list_partitions(cursor, "raw_data")
+
+    def tearDown(self):
+        # Partitions (DDL) are not rolled back between tests - drop the
+        # partitions created / detached by the test:
+        with connection.cursor() as cursor:
+            created = set(list_partitions(cursor, "raw_data").values()) \
+                - set(self.initial_partitions.values())
+            for name in created:
+                cursor.execute(f'DROP TABLE "{name}"')
+            for month in range(-12, 0):
+                name = partition_name("raw_data",
+                                      add_months(self.current_month, month))
+                cursor.execute(f'DROP TABLE IF EXISTS "{name}"')
+                cursor.execute(f'DROP TABLE IF EXISTS "archive"."{name}"')
+
+    def manage_partitions(self, *args):
+        stdout = io.StringIO()
+        call_command("manage_partitions", "--table", "raw_data", *args,
+                     stdout=stdout)
+        return stdout.getvalue()
+
+    def count_rows(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT count(*) FROM "{table}"')
+            return cursor.fetchone()[0]
+
+    def test_add_months(self):
+        self.assertEqual(add_months(dt.date(2022, 11, 1), 2),
+                         dt.date(2023, 1, 1))
+        self.assertEqual(add_months(dt.date(2022, 1, 1), -1),
+                         dt.date(2021, 12, 1))
+
+    def test_create_future_partitions(self):
+        self.manage_partitions("--months-ahead", "5")
+        with connection.cursor() as cursor:
+            partitions = list_partitions(cursor, "raw_data")
+        for i in range(6):
+            month = add_months(self.current_month, i)
+            self.assertEqual(partitions[month],
+                             partition_name("raw_data", month))
+
+    def test_create_partitions_idempotent(self):
+        output = self.manage_partitions("--months-ahead", "5")
+        self.assertIn("Created partition", output)
+        with connection.cursor() as cursor:
+            partitions = list_partitions(cursor, "raw_data")
+        # Re-runs do not create (nor fail on) existing partitions:
+        self.assertEqual(self.manage_partitions("--months-ahead", "5"), "")
+        with connection.cursor() as cursor:
+            self.assertEqual(list_partitions(cursor, "raw_data"), partitions)
+
+    def test_create_partition_moves_default_rows(self):
+        # Rows without a partition are stored in the default partition:
+        resource = create_user_resource(user=create_user())
+        create_raw_data(resource=resource, nr_points=3,
+                        start=dt.datetime(2022, 10, 1,
+                                          tzinfo=dt.timezone.utc))
+        default = default_partition_name("raw_data")
+        self.assertEqual(self.count_rows(default), 3)
+
+        with connection.cursor() as cursor:
+            name = create_partition(cursor, "raw_data", dt.date(2022, 10, 1))
+        self.assertEqual(self.count_rows(default), 0)
+        self.assertEqual(self.count_rows(name), 3)
+        self.assertEqual(RawData.objects.count(), 3)
+
+    def test_drop_old_partitions(self):
+        resource = create_user_resource(user=create_user())
+        old_months = [add_months(self.current_month, i) for i in (-6, -5, -1)]
+        with connection.cursor() as cursor:
+            for month in old_months:
+                create_partition(cursor, "raw_data", month)
+        for month in old_months:
+            create_raw_data(resource=resource, nr_points=2,
+                            start=dt.datetime(month.year, month.month, 1,
+                                              tzinfo=dt.timezone.utc))
+
+        output = self.manage_partitions("--retention-months", "3",
+                                        "--action", "drop")
+        self.assertEqual(output.count("Detached partition"), 2)
+        with connection.cursor() as cursor:
+            partitions = list_partitions(cursor, "raw_data")
+            for month in old_months[:2]:
+                self.assertNotIn(month, partitions)
+                cursor.execute("SELECT to_regclass(%s)",
+                               [partition_name("raw_data", month)])
+                self.assertIsNone(cursor.fetchone()[0])
+        # Partitions within the retention period are kept:
+        self.assertIn(old_months[2], partitions)
+        self.assertEqual(RawData.objects.count(), 2)
+        # Nothing else to drop:
+        output = self.manage_partitions("--retention-months", "3",
+                                        "--action", "drop")
+        self.assertNotIn("Detached partition", output)
+
+    def test_archive_old_partitions(self):
+        month = add_months(self.current_month, -6)
+        with connection.cursor() as cursor:
+            create_partition(cursor, "raw_data", month)
+        self.manage_partitions("--retention-months", "3",
+                               "--action", "archive")
+        name = partition_name("raw_data", month)
+        with connection.cursor() as cursor:
+            self.assertNotIn(month, list_partitions(cursor, "raw_data"))
+            cursor.execute("SELECT to_regclass(%s)", [f"archive.{name}"])
+            self.assertIsNotNone(cursor.fetchone()[0])
@@ -0,0 +1,119 @@
+# flake8: noqa
+
+import datetime as dt
+
+import pandas as pd
+
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from ...helpers.sql import (
+    upsert_dataframe,
+    copy_to_sql_update,
+    to_sql_update,
+)
+from ...models.raw_data import RawData
+from ..common import create_user, create_user_resource
+
+
+CONSTRAINT_COLUMNS = ["user_id", "resource_id", "datetime"]
+
+
+class TestUpsertDataframe(TransactionTestCase):
+    """
+        Tests for the DataFrame upsert helpers (INSERT ... VALUES and
+        COPY ingestion engines).
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.user = create_user()
+        self.resource = create_user_resource(user=self.user)
+
+    def create_dataframe(self, nr_points, start_value=0.0):
+        start = dt.datetime(2022, 10, 1, tzinfo=dt.timezone.utc)
+        return pd.DataFrame({
+            "user_id": self.user.id,
+            "resource_id": self.resource.id,
+            "resource_type": self.resource.type,
+            "datetime": [start + dt.timedelta(hours=i)
+                         for i in range(nr_points)],
+            "value": [start_value + i for i in range(nr_points)],
+            "units": "kw",
+            "time_interval": 60,
+            "aggregation_type": "avg",
+            "registered_at": dt.datetime.now(dt.timezone.utc),
+        })
+
+    def upsert(self, df, copy):
+        with CaptureQueriesContext(connection) as ctx:
+            result = upsert_dataframe(conn=connection,
+                                      df=df,
+                                      table=RawData._meta.db_table,
+                                      constraint_columns=CONSTRAINT_COLUMNS)
+        # Engine picked by batch size (COPY creates a staging table):
+        self.assertEqual(any("raw_data_staging" in q["sql"]
+                             for q in ctx.captured_queries), copy)
+        return result
+
+    def assert_stored_values(self, values):
+        stored = list(RawData.objects.order_by("datetime")
+                      .values_list("value", flat=True))
+        self.assertEqual(stored, values)
+
+    @override_settings(DATA_UPSERT_COPY_MIN_ROWS=5)
+    def test_upsert_below_copy_threshold(self):
+        # 4 rows (< 5) - INSERT ... VALUES statement:
+        result = self.upsert(self.create_dataframe(nr_points=4), copy=False)
+        self.assertEqual((result.inserted, result.updated), (4, 0))
+        result = self.upsert(self.create_dataframe(nr_points=4,
+                                                   start_value=10.0),
+                             copy=False)
+        self.assertEqual((result.inserted, result.updated), (0, 4))
+        self.assert_stored_values([10.0, 11.0, 12.0, 13.0])
+
+    @override_settings(DATA_UPSERT_COPY_MIN_ROWS=5)
+    def test_upsert_above_copy_threshold(self):
+        # 6 rows (>= 5) - COPY into a staging table, then merged:
+        result = self.upsert(self.create_dataframe(nr_points=6), copy=True)
+        self.assertEqual((result.inserted, result.updated), (6, 0))
+        result = self.upsert(self.create_dataframe(nr_points=6,
+                                                   start_value=10.0),
+                             copy=True)
+        self.assertEqual((result.inserted, result.updated), (0, 6))
+        self.assert_stored_values([10.0 + i for i in range(6)])
+
+    def test_copy_upsert_mixed_rows(self):
+        self.upsert(self.create_dataframe(nr_points=3), copy=False)
+        # 3 existing rows updated, 2 new rows inserted, repeated keys in
+        # the same batch keep the last occurrence:
+        df = self.create_dataframe(nr_points=5, start_value=10.0)
+        df = pd.concat([df.assign(value=-1.0), df], ignore_index=True)
+        result = copy_to_sql_update(conn=connection,
+                                    df=df,
+                                    table=RawData._meta.db_table,
+                                    constraint_columns=CONSTRAINT_COLUMNS)
+        self.assertEqual((result.inserted, result.updated), (2, 3))
+        self.assert_stored_values([10.0 + i for i in range(5)])
+        # Staging table is dropped on commit:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('raw_data_staging')")
+            self.assertIsNone(cursor.fetchone()[0])
+
+    def test_values_upsert_mixed_rows(self):
+        self.upsert(self.create_dataframe(nr_points=3), copy=False)
+        # 3 existing rows updated and 4 new rows inserted, sent in pages
+        # of 2 rows (counts are gathered from all the pages):
+        df = self.create_dataframe(nr_points=7, start_value=10.0)
+        with CaptureQueriesContext(connection) as ctx:
+            result = to_sql_update(conn=connection,
+                                   df=df,
+                                   table=RawData._meta.db_table,
+                                   constraint_columns=CONSTRAINT_COLUMNS,
+                                   page_size=2)
+        self.assertEqual((result.inserted, result.updated), (4, 3))
+        self.assertEqual(sum(q["sql"].startswith("INSERT INTO raw_data")
+                             for q in ctx.captured_queries), 4)
+        self.assert_stored_values([10.0 + i for i in range(7)])
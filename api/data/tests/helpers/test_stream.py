@@ -0,0 +1,60 @@
+import io
+
+from django.test import SimpleTestCase
+from rest_framework import exceptions
+
+from data.helpers.stream import (
+    iter_line_chunks,
+    read_csv_header,
+    parse_lines_chunk,
+)
+
+
+class StreamHelpersTestCase(SimpleTestCase):
+    def test_iter_line_chunks(self):
+        stream = io.BytesIO(b'{"a": 1}\n\n{"a": 2}\r\n{"a": 3}\n  \n{"a": 4}')
+        chunks = list(iter_line_chunks(stream=stream, chunk_size=3))
+        # Blank lines are skipped, last chunk holds the remaining lines:
+        self.assertEqual(chunks, [['{"a": 1}', '{"a": 2}', '{"a": 3}'],
+                                  ['{"a": 4}']])
+
+    def test_iter_line_chunks_empty(self):
+        self.assertEqual(list(iter_line_chunks(stream=io.BytesIO(b""),
+                                               chunk_size=3)), [])
+        self.assertEqual(list(iter_line_chunks(stream=io.BytesIO(b"\n\n"),
+                                               chunk_size=3)), [])
+
+    def test_parse_ndjson_chunk(self):
+        columns = parse_lines_chunk(
+            lines=['{"datetime": "2022-10-01T00:00:00Z", "value": 1.5}',
+                   '{"datetime": "2022-10-01T01:00:00Z", "value": 2}'],
+            media_type="application/x-ndjson"
+        )
+        self.assertEqual(columns, {
+            "datetime": ["2022-10-01T00:00:00Z", "2022-10-01T01:00:00Z"],
+            "value": [1.5, 2],
+        })
+
+    def test_parse_csv_chunk(self):
+        stream = io.BytesIO(b"datetime, value\n2022-10-01T00:00:00Z, 1.5\n")
+        header = read_csv_header(stream)
+        self.assertEqual(header, ["datetime", "value"])
+        lines = next(iter_line_chunks(stream=stream, chunk_size=10))
+        columns = parse_lines_chunk(lines=lines, media_type="text/csv",
+                                    header=header)
+        self.assertEqual(columns, {"datetime": ["2022-10-01T00:00:00Z"],
+                                   "value": ["1.5"]})
+
+    def test_malformed_chunks(self):
+        with self.assertRaises(exceptions.ValidationError):
+            parse_lines_chunk(lines=['{"datetime": "2022-10-01T00:00:00Z"',
+                                     'not json'],
+                              media_type="application/x-ndjson")
+        with self.assertRaises(exceptions.ValidationError):
+            parse_lines_chunk(lines=['2022-10-01T00:00:00Z,1.5,3,4'],
+                              media_type="text/csv",
+                              header=["datetime", "value"])
+        with self.assertRaises(exceptions.ValidationError):
+            read_csv_header(io.BytesIO(b"timestamp,value\n"))
+        with self.assertRaises(exceptions.ValidationError):
+            read_csv_header(io.BytesIO(b""))
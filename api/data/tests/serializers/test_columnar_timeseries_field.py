@@ -0,0 +1,102 @@
+import pandas as pd
+
+from django.test import SimpleTestCase
+from rest_framework import serializers
+
+from data.serializers.fields import ColumnarTimeseriesField
+
+
+class ColumnarTimeseriesSerializer(serializers.Serializer):
+    timeseries = ColumnarTimeseriesField()
+
+
+class ForecastsTimeseriesSerializer(serializers.Serializer):
+    timeseries = ColumnarTimeseriesField(extra_datetime_columns=["request"])
+
+
+class ColumnarTimeseriesFieldTestCase(SimpleTestCase):
+    def setUp(self):
+        self.valid_data = {
+            "datetime": ["2022-10-01T00:00:00Z", "2022-10-01T00:15:00Z"],
+            "value": [7802, 7.5],
+        }
+
+    def validate(self, timeseries, serializer_class=ColumnarTimeseriesSerializer):
+        serializer = serializer_class(data={"timeseries": timeseries})
+        is_valid = serializer.is_valid()
+        return is_valid, serializer
+
+    def test_valid_parallel_arrays(self):
+        is_valid, serializer = self.validate(self.valid_data)
+        self.assertTrue(is_valid)
+        df = serializer.validated_data["timeseries"]
+        self.assertEqual(list(df.columns), ["datetime", "value"])
+        self.assertEqual(df["value"].tolist(), [7802.0, 7.5])
+        self.assertEqual(df["datetime"].iloc[1],
+                         pd.Timestamp("2022-10-01T00:15:00Z"))
+
+    def test_valid_regular_series(self):
+        for start in ("2022-10-01T00:00:00Z", 1664582400):
+            is_valid, serializer = self.validate(
+                {"start": start, "interval": 15, "value": [1, 2, 3]}
+            )
+            self.assertTrue(is_valid)
+            df = serializer.validated_data["timeseries"]
+            self.assertEqual(df["datetime"].tolist(), [
+                pd.Timestamp("2022-10-01T00:00:00Z"),
+                pd.Timestamp("2022-10-01T00:15:00Z"),
+                pd.Timestamp("2022-10-01T00:30:00Z"),
+            ])
+
+    def test_valid_extra_datetime_column(self):
+        is_valid, serializer = self.validate(
+            {**self.valid_data, "request": "2022-09-30T12:00:00Z"},
+            serializer_class=ForecastsTimeseriesSerializer
+        )
+        self.assertTrue(is_valid)
+        df = serializer.validated_data["timeseries"]
+        self.assertEqual(set(df["request"]),
+                         {pd.Timestamp("2022-09-30T12:00:00Z")})
+
+    def test_length_mismatch(self):
+        is_valid, serializer = self.validate(
+            {**self.valid_data, "value": [1, 2, 3]}
+        )
+        self.assertFalse(is_valid)
+        self.assertEqual(
+            serializer.errors["timeseries"][0],
+            "Field 'datetime' must have the same length as 'value' "
+            "(3 items)."
+        )
+        is_valid, serializer = self.validate(
+            {**self.valid_data, "request": ["2022-09-30T12:00:00Z"]},
+            serializer_class=ForecastsTimeseriesSerializer
+        )
+        self.assertFalse(is_valid)
+
+    def test_invalid_types(self):
+        is_valid, serializer = self.validate(
+            {**self.valid_data, "value": [1, "abc"]}
+        )
+        self.assertFalse(is_valid)
+        self.assertEqual(serializer.errors["timeseries"][0],
+                         "Invalid or null values at positions [1].")
+
+        is_valid, serializer = self.validate(
+            {**self.valid_data, "datetime": [None, "2022-10-01"]}
+        )
+        self.assertFalse(is_valid)
+        self.assertEqual(serializer.errors["timeseries"][0],
+                         "Invalid or null timestamps at positions [0].")
+
+        for timeseries in ({**self.valid_data, "value": "1,2"},
+                           {"start": "yesterday", "interval": 15,
+                            "value": [1]},
+                           {"start": "2022-10-01T00:00:00Z",
+                            "interval": True, "value": [1]},
+                           {"value": []},
+                           {"value": [1]},
+                           [{"datetime": "2022-10-01T00:00:00Z",
+                             "value": 1}]):
+            is_valid, _ = self.validate(timeseries)
+            self.assertFalse(is_valid)
@@ -0,0 +1,195 @@
+# flake8: noqa
+
+import io
+import csv
+import shutil
+import tempfile
+
+import pandas as pd
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.test import TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ...models.data_export import DataExport
+from ..common import (
+    create_and_login_superuser,
+    create_user,
+    login_user,
+    create_user_resource,
+    create_raw_data,
+)
+
+DATA_EXPORT_ROOT = tempfile.mkdtemp()
+
+
+@override_settings(DATA_EXPORT_ROOT=DATA_EXPORT_ROOT,
+                   DATA_EXPORT_ACCEL_REDIRECT="",
+                   DATA_EXPORT_CHUNK_SIZE=2)
+class TestDataExportView(TransactionTestCase):
+    """
+        Tests for DataExportView / DataExportDetailView /
+        DataExportDownloadView classes.
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(DATA_EXPORT_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.base_url = reverse("data:data-export")
+        self.super_user = create_and_login_superuser(self.client)
+        self.user = create_user()
+        self.resource = create_user_resource(user=self.user)
+
+    def request_export(self, **data):
+        response = self.client.post(self.base_url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        export = response.json()["data"]
+        self.assertEqual(export["status"], "pending")
+        self.assertIsNone(export["download_url"])
+        return export["id"]
+
+    def get_export(self, export_id):
+        response = self.client.get(
+            reverse("data:data-export-detail", args=[export_id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()["data"]
+
+    def download(self, export):
+        response = self.client.get(export["download_url"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return b"".join(response.streaming_content)
+
+    def test_export_no_auth(self):
+        self.client.credentials(HTTP_AUTHORIZATION="")
+        response = self.client.post(self.base_url,
+                                    data={"table": "raw_data"},
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_export_raw_data_csv(self):
+        create_raw_data(resource=self.resource, nr_points=5)
+        login_user(client=self.client, user=self.user)
+        export_id = self.request_export(
+            table="raw_data",
+            file_format="csv",
+            filters={"resource": str(self.resource.id),
+                     "start_date": "2022-10-01T01:00:00Z"}
+        )
+        # Not processed until the export worker runs:
+        response = self.client.get(
+            reverse("data:data-export-download", args=[export_id])
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        call_command("run_data_exports", stdout=io.StringIO())
+        export = self.get_export(export_id)
+        self.assertEqual(export["status"], "finished")
+        self.assertEqual(export["n_rows"], 4)
+        self.assertEqual(export["filters"]["user"], str(self.user.id))
+        rows = list(csv.DictReader(
+            io.StringIO(self.download(export).decode())
+        ))
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["datetime"], "2022-10-01T01:00:00Z")
+        self.assertEqual(rows[0]["resource_name"], self.resource.name)
+
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["data"]), 1)
+
+    def test_export_raw_data_parquet(self):
+        create_raw_data(resource=self.resource, nr_points=5)
+        login_user(client=self.client, user=self.user)
+        export_id = self.request_export(table="raw_data",
+                                        file_format="parquet")
+        call_command("run_data_exports", stdout=io.StringIO())
+        export = self.get_export(export_id)
+        self.assertEqual(export["status"], "finished")
+        self.assertEqual(export["n_rows"], 5)
+        df = pd.read_parquet(io.BytesIO(self.download(export)))
+        self.assertEqual(len(df), 5)
+        self.assertEqual(df["value"].tolist(), [0.0, 1.0, 2.0, 3.0, 4.0])
+        self.assertEqual(df["resource"].iloc[0], str(self.resource.id))
+        self.assertEqual(df["datetime"].iloc[0],
+                         pd.Timestamp("2022-10-01T00:00:00Z"))
+
+    def test_export_other_user_data(self):
+        create_raw_data(resource=self.resource, nr_points=5)
+        other_user = create_user(use_custom_data=True, **{
+            'email': 'normal2@user.com',
+            'password': 'normal2_foo',
+            'first_name': 'Normal2',
+            'last_name': 'Peanut2'})
+        login_user(client=self.client, user=self.user)
+        export_id = self.request_export(table="raw_data")
+        call_command("run_data_exports", stdout=io.StringIO())
+
+        login_user(client=self.client, user=other_user)
+        # Nor see, nor download other users exports:
+        for url in ("data:data-export-detail", "data:data-export-download"):
+            response = self.client.get(reverse(url, args=[export_id]))
+            self.assertEqual(response.status_code,
+                             status.HTTP_404_NOT_FOUND)
+        # Normal users can only export their own data:
+        export_id = self.request_export(table="raw_data",
+                                        filters={"user": str(self.user.id)})
+        call_command("run_data_exports", stdout=io.StringIO())
+        self.assertEqual(DataExport.objects.get(id=export_id).n_rows, 0)
+
+    def test_restart_interrupted_export(self):
+        create_raw_data(resource=self.resource, nr_points=5)
+        login_user(client=self.client, user=self.user)
+        export_id = self.request_export(table="raw_data")
+        # Worker killed while running the export (no heartbeat since):
+        DataExport.objects.filter(id=export_id).update(status="running")
+        call_command("run_data_exports", stdout=io.StringIO())
+        self.assertEqual(self.get_export(export_id)["status"], "running")
+        call_command("run_data_exports", "--stale-minutes", "0",
+                     stdout=io.StringIO())
+        self.assertEqual(self.get_export(export_id)["status"], "finished")
+
+    @override_settings(DATA_EXPORT_ACCEL_REDIRECT="/protected-exports/")
+    def test_download_accel_redirect(self):
+        login_user(client=self.client, user=self.user)
+        export_id = self.request_export(table="raw_data")
+        call_command("run_data_exports", stdout=io.StringIO())
+        export = self.get_export(export_id)
+        response = self.client.get(export["download_url"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Accel-Redirect"],
+                         f"/protected-exports/{export_id}.csv")
+        self.assertEqual(response.content, b"")
+
+    def test_export_bad_request(self):
+        login_user(client=self.client, user=self.user)
+        response = self.client.post(self.base_url, data={
+            "table": "users",
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.base_url, data={
+            "table": "raw_data",
+            "filters": {"start_date": "2022-10-02T00:00:00Z",
+                        "end_date": "2022-10-01T00:00:00Z"}
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_unsupported_filter(self):
+        # Raw data is not related to market sessions:
+        login_user(client=self.client, user=self.user)
+        response = self.client.post(self.base_url, data={
+            "table": "raw_data",
+            "filters": {"market_session": 1}
+        }, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(DataExport.objects.exists())
+        self.request_export(table="market_forecasts",
+                            filters={"market_session": 1})
@@ -0,0 +1,206 @@
+# flake8: noqa
+
+import datetime as dt
+
+from django.db import connection
+from django.urls import reverse
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ...models.market_forecasts import MarketForecasts
+from ..common import (
+    create_and_login_superuser,
+    create_user,
+    login_user,
+    create_user_resource,
+    create_market_session,
+    create_market_forecasts,
+)
+
+
+class TestMarketForecastsView(TransactionTestCase):
+    """
+        Tests for MarketForecastsView class.
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.client = APIClient()
+        self.base_url = reverse("data:market-forecasts")
+        self.super_user = create_and_login_superuser(self.client)
+        self.user = create_user()
+        self.resource = create_user_resource(user=self.user)
+        self.market_session = create_market_session()
+
+    def count_get_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response.json()["data"]
+
+    def test_list_market_forecasts_no_auth(self):
+        self.client.credentials(HTTP_AUTHORIZATION="")
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_market_forecasts(self):
+        create_market_forecasts(resource=self.resource,
+                                market_session=self.market_session,
+                                nr_points=3)
+        login_user(client=self.client, user=self.user)
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response_data = response.json()["data"]
+        self.assertEqual(len(response_data), 3)
+        self.assertEqual(response_data[0]["market_session"], self.market_session.id)
+        self.assertEqual(response_data[0]["resource_name"], self.resource.name)
+
+    def test_list_market_forecasts_constant_query_count(self):
+        # Nr. of queries per request must not depend on nr. of rows/resources
+        login_user(client=self.client, user=self.user)
+        create_market_forecasts(resource=self.resource,
+                                market_session=self.market_session,
+                                nr_points=5)
+        nr_queries_small, data = self.count_get_queries()
+        self.assertEqual(len(data), 5)
+
+        other_resource = create_user_resource(user=self.user, name="resource-2")
+        MarketForecasts.objects.all().delete()
+        create_market_forecasts(resource=self.resource,
+                                market_session=self.market_session,
+                                nr_points=100)
+        create_market_forecasts(resource=other_resource,
+                                market_session=self.market_session,
+                                nr_points=100)
+        nr_queries_large, data = self.count_get_queries()
+        self.assertEqual(len(data), 200)
+        self.assertEqual(nr_queries_small, nr_queries_large)
+
+    def test_list_market_forecasts_fast_path(self):
+        # Serializer-free read path must return the same response:
+        create_market_forecasts(resource=self.resource,
+                                market_session=self.market_session,
+                                nr_points=5)
+        login_user(client=self.client, user=self.user)
+        response = self.client.get(self.base_url)
+        fast_response = self.client.get(self.base_url, {"fast": "true"})
+        self.assertEqual(fast_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(fast_response.json(), response.json())
+
+    def test_list_market_forecasts_keyset_pagination(self):
+        create_market_forecasts(resource=self.resource,
+                                market_session=self.market_session,
+                                nr_points=5)
+        login_user(client=self.client, user=self.user)
+        response = self.client.get(self.base_url, {"page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = response.json()["data"]
+        self.assertEqual(len(first_page["results"]), 3)
+        self.assertIsNotNone(first_page["next"])
+
+        response = self.client.get(self.base_url, {"page_size": 3,
+                                                   "cursor": first_page["next"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        second_page = response.json()["data"]
+        self.assertEqual(len(second_page["results"]), 2)
+        self.assertIsNone(second_page["next"])
+        self.assertLess(first_page["results"][-1]["datetime"],
+                        second_page["results"][0]["datetime"])
+
+    def test_list_market_forecasts_since_watermark(self):
+        login_user(client=self.client, user=self.user)
+        create_market_forecasts(resource=self.resource,
+                                market_session=self.market_session,
+                                nr_points=5)
+        response = self.client.get(self.base_url,
+                                   {"since": "2022-01-01T00:00:00Z"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual(len(response_data["results"]), 5)
+        watermark = response_data["watermark"]
+        self.assertEqual(watermark,
+                         response_data["results"][-1]["registered_at"])
+
+        # Nothing new since the last watermark:
+        response = self.client.get(self.base_url, {"since": watermark})
+        response_data = response.json()["data"]
+        self.assertEqual(response_data["results"], [])
+        self.assertEqual(response_data["watermark"], watermark)
+
+        # Only rows registered after the watermark are returned:
+        other_resource = create_user_resource(user=self.user, name="resource-2")
+        create_market_forecasts(resource=other_resource,
+                                market_session=self.market_session,
+                                nr_points=3)
+        response = self.client.get(self.base_url, {"since": watermark})
+        response_data = response.json()["data"]
+        self.assertEqual(len(response_data["results"]), 3)
+        self.assertEqual({x["resource"] for x in response_data["results"]},
+                         {str(other_resource.id)})
+
+    def test_list_market_forecasts_since_paginated(self):
+        login_user(client=self.client, user=self.user)
+        forecasts = create_market_forecasts(resource=self.resource,
+                                            market_session=self.market_session,
+                                            nr_points=5)
+        # Two rows registered first, three rows in the same (later) batch:
+        registered_at = dt.datetime(2022, 10, 1, tzinfo=dt.timezone.utc)
+        MarketForecasts.objects.filter(
+            id__in=[x.id for x in forecasts[:2]]
+        ).update(registered_at=registered_at)
+        MarketForecasts.objects.filter(
+            id__in=[x.id for x in forecasts[2:]]
+        ).update(registered_at=registered_at + dt.timedelta(seconds=1))
+
+        since = "2022-01-01T00:00:00Z"
+        response = self.client.get(self.base_url,
+                                   {"since": since, "page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first_page = response.json()["data"]
+        self.assertEqual(len(first_page["results"]), 3)
+        self.assertIsNotNone(first_page["next"])
+        # Batch continues in the next page (watermark stops before it):
+        self.assertEqual(first_page["watermark"],
+                         first_page["results"][1]["registered_at"])
+
+        response = self.client.get(self.base_url,
+                                   {"since": since, "page_size": 3,
+                                    "cursor": first_page["next"]})
+        second_page = response.json()["data"]
+        self.assertEqual(len(second_page["results"]), 2)
+        self.assertIsNone(second_page["next"])
+        self.assertEqual(second_page["watermark"],
+                         second_page["results"][-1]["registered_at"])
+        rows = first_page["results"] + second_page["results"]
+        self.assertEqual(len({x["datetime"] for x in rows}), 5)
+
+    @override_settings(DELTA_SYNC_COMMIT_WINDOW=60)
+    def test_list_market_forecasts_since_commit_window(self):
+        login_user(client=self.client, user=self.user)
+        create_market_forecasts(resource=self.resource,
+                                market_session=self.market_session,
+                                nr_points=5)
+        # Rows registered within the commit window are not returned yet
+        # (and the watermark does not move past them):
+        since = "2022-01-01T00:00:00Z"
+        response = self.client.get(self.base_url, {"since": since})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual(response_data["results"], [])
+        self.assertEqual(response_data["watermark"], since)
+
+        MarketForecasts.objects.update(
+            registered_at=dt.datetime.now(dt.timezone.utc)
+            - dt.timedelta(minutes=2)
+        )
+        response = self.client.get(self.base_url, {"since": since})
+        self.assertEqual(len(response.json()["data"]["results"]), 5)
+
+    def test_list_market_forecasts_since_bad_query_params(self):
+        login_user(client=self.client, user=self.user)
+        response = self.client.get(self.base_url, {"since": "yesterday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,85 @@
+# flake8: noqa
+
+from django.urls import reverse
+from django.test import TransactionTestCase
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ..common import (
+    create_and_login_superuser,
+    create_user,
+    login_user,
+    create_user_resource,
+)
+
+
+class TestRawDataCoverageView(TransactionTestCase):
+    """
+        Tests for RawDataCoverageView class.
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.client = APIClient()
+        self.base_url = reverse("data:raw-data-coverage")
+        self.raw_data_url = reverse("data:raw-data")
+        self.super_user = create_and_login_superuser(self.client)
+        self.user = create_user()
+        self.resource = create_user_resource(user=self.user)
+
+    def post_raw_data(self, start, nr_points):
+        payload = {
+            "resource_name": self.resource.name,
+            "time_interval": 60,
+            "aggregation_type": "avg",
+            "units": "kw",
+            "timeseries": {"start": start, "interval": 60,
+                           "value": [1.0] * nr_points}
+        }
+        response = self.client.post(self.raw_data_url, data=payload,
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_get_coverage_no_auth(self):
+        self.client.credentials(HTTP_AUTHORIZATION="")
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_get_coverage(self):
+        login_user(client=self.client, user=self.user)
+        self.post_raw_data(start="2022-10-01T00:00:00Z", nr_points=24)
+        self.post_raw_data(start="2022-10-03T00:00:00Z", nr_points=24)
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual(len(response_data), 1)
+        self.assertEqual(response_data[0]["resource"], str(self.resource.id))
+        self.assertEqual(response_data[0]["n_gaps"], 1)
+        self.assertEqual(response_data[0]["ranges"],
+                         [["2022-10-01T00:00:00Z", "2022-10-01T23:00:00Z"],
+                          ["2022-10-03T00:00:00Z", "2022-10-03T23:00:00Z"]])
+        self.assertEqual(response_data[0]["last_datetime"],
+                         "2022-10-03T23:00:00Z")
+
+        # Filling the gap merges both ranges:
+        self.post_raw_data(start="2022-10-02T00:00:00Z", nr_points=24)
+        response = self.client.get(self.base_url,
+                                   {"resource": str(self.resource.id)})
+        response_data = response.json()["data"]
+        self.assertEqual(response_data[0]["n_gaps"], 0)
+        self.assertEqual(response_data[0]["ranges"],
+                         [["2022-10-01T00:00:00Z", "2022-10-03T23:00:00Z"]])
+
+    def test_get_coverage_other_users(self):
+        login_user(client=self.client, user=self.user)
+        self.post_raw_data(start="2022-10-01T00:00:00Z", nr_points=24)
+        other_user = create_user(use_custom_data=True,
+                                 email="other@user.com",
+                                 password="foo",
+                                 first_name="Other",
+                                 last_name="User")
+        login_user(client=self.client, user=other_user)
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"], [])
@@ -0,0 +1,129 @@
+# flake8: noqa
+
+import json
+
+from django.urls import reverse
+from django.test import TransactionTestCase, override_settings
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ...models.raw_data import RawData
+from ..common import (
+    create_and_login_superuser,
+    create_user,
+    login_user,
+    create_user_resource,
+)
+
+
+@override_settings(DATA_STREAM_CHUNK_SIZE=2)
+class TestRawDataStreamView(TransactionTestCase):
+    """
+        Tests for RawDataStreamView class.
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.client = APIClient()
+        self.super_user = create_and_login_superuser(self.client)
+        self.user = create_user()
+        self.resource = create_user_resource(user=self.user)
+        self.base_url = reverse("data:raw-data-stream") + "?" + "&".join([
+            f"resource_name={self.resource.name}",
+            "time_interval=60",
+            "aggregation_type=avg",
+            "units=kw",
+        ])
+
+    def post_stream(self, body, content_type="application/x-ndjson"):
+        return self.client.generic("POST", self.base_url,
+                                   data=body.encode("utf-8"),
+                                   content_type=content_type)
+
+    @staticmethod
+    def ndjson(nr_points, start_hour=0):
+        return "\n".join(
+            json.dumps({"datetime": f"2022-10-01T{start_hour + i:02d}:00:00Z",
+                        "value": float(i)})
+            for i in range(nr_points)
+        )
+
+    def test_stream_no_auth(self):
+        self.client.credentials(HTTP_AUTHORIZATION="")
+        response = self.post_stream(self.ndjson(nr_points=1))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_stream_ndjson_chunks(self):
+        login_user(client=self.client, user=self.user)
+        response = self.post_stream(self.ndjson(nr_points=5))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual(response_data["status"], "ok")
+        self.assertEqual(response_data["rows"], 5)
+        self.assertEqual(response_data["inserted"], 5)
+        # Body parsed and inserted in chunks of 2 rows:
+        self.assertEqual([(c["first_row"], c["rows"])
+                          for c in response_data["chunks"]],
+                         [(0, 2), (2, 2), (4, 1)])
+        self.assertEqual(RawData.objects.count(), 5)
+
+        response = self.post_stream(self.ndjson(nr_points=3))
+        self.assertEqual(response.json()["data"]["updated"], 3)
+
+    def test_stream_csv_chunks(self):
+        login_user(client=self.client, user=self.user)
+        body = "datetime,value\n" + "\n".join(
+            f"2022-10-01T{i:02d}:00:00Z,{i}" for i in range(3)
+        )
+        response = self.post_stream(body, content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual(response_data["status"], "ok")
+        self.assertEqual(len(response_data["chunks"]), 2)
+        self.assertEqual(
+            list(RawData.objects.order_by("datetime")
+                 .values_list("value", flat=True)),
+            [0.0, 1.0, 2.0]
+        )
+
+    def test_stream_malformed_body(self):
+        login_user(client=self.client, user=self.user)
+        # Second chunk has an invalid line, the others are inserted:
+        lines = self.ndjson(nr_points=5).split("\n")
+        lines[3] = '{"datetime": "2022-10-01T03:00:00Z", "value":'
+        response = self.post_stream("\n".join(lines))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual(response_data["status"], "error")
+        self.assertEqual([c["status"] for c in response_data["chunks"]],
+                         ["ok", "error", "ok"])
+        self.assertEqual(response_data["inserted"], 3)
+        self.assertEqual(RawData.objects.count(), 3)
+
+        # Invalid CSV header / rows:
+        response = self.post_stream("timestamp,value\n2022-10-01T00:00:00Z,1",
+                                    content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.post_stream("datetime,value\n2022-10-01T00:00:00Z,1,2",
+                                    content_type="text/csv")
+        self.assertEqual(response.json()["data"]["status"], "error")
+
+    def test_stream_empty_body(self):
+        login_user(client=self.client, user=self.user)
+        response = self.post_stream("")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.post_stream("", content_type="text/csv")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        # Body with blank lines only (no rows):
+        response = self.post_stream("\n\n")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"]["rows"], 0)
+        self.assertFalse(RawData.objects.exists())
+
+    def test_stream_unsupported_media_type(self):
+        login_user(client=self.client, user=self.user)
+        response = self.post_stream(self.ndjson(nr_points=1),
+                                    content_type="application/xml")
+        self.assertEqual(response.status_code,
+                         status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
@@ -0,0 +1,270 @@
+# flake8: noqa
+
+import json
+
+from django.db import connection
+from django.urls import reverse
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ...models.raw_data import RawData
+from ..common import (
+    create_and_login_superuser,
+    create_user,
+    login_user,
+    create_user_resource,
+    create_raw_data,
+)
+
+
+class TestRawDataView(TransactionTestCase):
+    """
+        Tests for RawDataView class.
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.client = APIClient()
+        self.base_url = reverse("data:raw-data")
+        self.super_user = create_and_login_superuser(self.client)
+        self.user = create_user()
+        self.resource = create_user_resource(user=self.user)
+
+    def count_get_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries), response.json()["data"]
+
+    def test_list_raw_data_no_auth(self):
+        self.client.credentials(HTTP_AUTHORIZATION="")
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_list_raw_data(self):
+        create_raw_data(resource=self.resource, nr_points=3)
+        login_user(client=self.client, user=self.user)
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response_data = response.json()["data"]
+        self.assertEqual(len(response_data), 3)
+        self.assertEqual(response_data[0]["resource"], str(self.resource.id))
+        self.assertEqual(response_data[0]["resource_name"], self.resource.name)
+        self.assertEqual(response_data[0]["datetime"], "2022-10-01T00:00:00Z")
+
+    def test_list_raw_data_constant_query_count(self):
+        # Nr. of queries per request must not depend on nr. of rows/resources
+        login_user(client=self.client, user=self.user)
+        create_raw_data(resource=self.resource, nr_points=5)
+        nr_queries_small, data = self.count_get_queries()
+        self.assertEqual(len(data), 5)
+
+        other_resource = create_user_resource(user=self.user, name="resource-2")
+        RawData.objects.all().delete()
+        create_raw_data(resource=self.resource, nr_points=100)
+        create_raw_data(resource=other_resource, nr_points=100)
+        nr_queries_large, data = self.count_get_queries()
+        self.assertEqual(len(data), 200)
+        self.assertEqual(nr_queries_small, nr_queries_large)
+
+    def test_list_raw_data_fast_path(self):
+        # Serializer-free read path must return the same response:
+        create_raw_data(resource=self.resource, nr_points=5)
+        login_user(client=self.client, user=self.user)
+        response = self.client.get(self.base_url)
+        fast_response = self.client.get(self.base_url, {"fast": "true"})
+        self.assertEqual(fast_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(fast_response.json(), response.json())
+
+    def test_list_raw_data_fast_path_bad_query_params(self):
+        login_user(client=self.client, user=self.user)
+        response = self.client.get(self.base_url, {"fast": "asdsd"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_raw_data_keyset_pagination(self):
+        create_raw_data(resource=self.resource, nr_points=5)
+        login_user(client=self.client, user=self.user)
+        params = {"page_size": 2}
+        datetimes = []
+        for _ in range(3):
+            response = self.client.get(self.base_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = response.json()["data"]
+            self.assertEqual(page["page_size"], 2)
+            datetimes += [x["datetime"] for x in page["results"]]
+            params["cursor"] = page["next"]
+        self.assertIsNone(page["next"])
+        self.assertEqual(len(datetimes), 5)
+        self.assertEqual(datetimes, sorted(datetimes))
+        self.assertEqual(datetimes[0], "2022-10-01T00:00:00Z")
+
+    def test_list_raw_data_keyset_pagination_fast_path(self):
+        # Same pages (and cursors) from the serializer-free read path:
+        create_raw_data(resource=self.resource, nr_points=5)
+        login_user(client=self.client, user=self.user)
+        params = {"page_size": 2}
+        for _ in range(3):
+            response = self.client.get(self.base_url, params)
+            fast_response = self.client.get(self.base_url,
+                                            {**params, "fast": "true"})
+            self.assertEqual(fast_response.json(), response.json())
+            params["cursor"] = response.json()["data"]["next"]
+
+    def test_list_raw_data_keyset_pagination_single_query(self):
+        create_raw_data(resource=self.resource, nr_points=5)
+        login_user(client=self.client, user=self.user)
+        nr_queries, _ = self.count_get_queries()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.base_url, {"page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx.captured_queries), nr_queries)
+
+    @override_settings(PAGINATION_MAX_UNPAGINATED_ROWS=3)
+    def test_list_raw_data_unpaginated_limit(self):
+        create_raw_data(resource=self.resource, nr_points=4)
+        login_user(client=self.client, user=self.user)
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.base_url,
+                                   {"end_date": "2022-10-01T02:00:00Z"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["data"]), 3)
+        response = self.client.get(self.base_url, {"page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_raw_data_keyset_pagination_bad_query_params(self):
+        login_user(client=self.client, user=self.user)
+        response = self.client.get(self.base_url, {"page_size": 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.base_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_raw_data_stream(self):
+        create_raw_data(resource=self.resource, nr_points=5)
+        login_user(client=self.client, user=self.user)
+        response = self.client.get(self.base_url)
+        expected_data = response.json()["data"]
+
+        response = self.client.get(self.base_url, {"stream": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        body = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(body, {"code": 200, "data": expected_data})
+
+        response = self.client.get(self.base_url, {"stream": "true",
+                                                   "page_size": 2})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_raw_data_resample(self):
+        # 15-minute data (values 0..7), resampled to hourly buckets:
+        create_raw_data(resource=self.resource, nr_points=8, time_interval=15)
+        login_user(client=self.client, user=self.user)
+        expected = {"avg": [1.5, 5.5], "min": [0, 4], "max": [3, 7],
+                    "sum": [6, 22]}
+        for agg, values in expected.items():
+            response = self.client.get(self.base_url,
+                                       {"resample": 60, "agg": agg})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response_data = response.json()["data"]
+            self.assertEqual([x["value"] for x in response_data], values)
+            self.assertEqual([x["datetime"] for x in response_data],
+                             ["2022-10-01T00:00:00Z", "2022-10-01T01:00:00Z"])
+            self.assertEqual(response_data[0]["time_interval"], 60)
+            self.assertEqual(response_data[0]["aggregation_type"], agg)
+            self.assertEqual(response_data[0]["resource_name"],
+                             self.resource.name)
+
+    def test_list_raw_data_resample_bad_query_params(self):
+        login_user(client=self.client, user=self.user)
+        for params in [{"resample": "hourly"},
+                       {"resample": 0},
+                       {"resample": 60, "agg": "median"},
+                       {"agg": "avg"},
+                       {"resample": 60, "page_size": 10}]:
+            response = self.client.get(self.base_url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_raw_data_normalizes_units(self):
+        login_user(client=self.client, user=self.user)
+        payload = {
+            "resource_name": self.resource.name,
+            "time_interval": 60,
+            "aggregation_type": "avg",
+            "units": "w",
+            "timeseries": [
+                {"datetime": "2022-10-01T00:00:00Z", "value": 1500.0},
+                {"datetime": "2022-10-01T01:00:00Z", "value": 2500.0},
+            ]
+        }
+        response = self.client.post(self.base_url, data=payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"]["inserted"], 2)
+        # Values are stored in the canonical unit:
+        stored = RawData.objects.order_by("datetime")
+        self.assertEqual([x.value for x in stored], [1.5, 2.5])
+        self.assertEqual({x.units for x in stored}, {"kw"})
+        self.assertEqual({x.original_units for x in stored}, {"w"})
+        # And converted (in the DB) on request:
+        response = self.client.get(self.base_url, {"units": "w"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual([x["value"] for x in response_data], [1500.0, 2500.0])
+        self.assertEqual({x["units"] for x in response_data}, {"w"})
+
+    def test_create_raw_data_columnar(self):
+        login_user(client=self.client, user=self.user)
+        payload = {
+            "resource_name": self.resource.name,
+            "time_interval": 60,
+            "aggregation_type": "avg",
+            "units": "kw",
+            "timeseries": {
+                "datetime": ["2022-10-01T00:00:00Z", "2022-10-01T01:00:00Z"],
+                "value": [1.5, 2.5],
+            }
+        }
+        response = self.client.post(self.base_url, data=payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"]["inserted"], 2)
+        # Regular series (start + interval) updates the same rows:
+        payload["timeseries"] = {"start": "2022-10-01T00:00:00Z",
+                                 "interval": 60,
+                                 "value": [3.5, 4.5]}
+        response = self.client.post(self.base_url, data=payload, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"]["updated"], 2)
+        stored = RawData.objects.order_by("datetime")
+        self.assertEqual([x.value for x in stored], [3.5, 4.5])
+
+    def test_create_raw_data_columnar_bad_request(self):
+        login_user(client=self.client, user=self.user)
+        payload = {
+            "resource_name": self.resource.name,
+            "time_interval": 60,
+            "aggregation_type": "avg",
+            "units": "kw",
+        }
+        for timeseries in (
+                # Length mismatch:
+                {"datetime": ["2022-10-01T00:00:00Z"], "value": [1.5, 2.5]},
+                # Bad types:
+                {"datetime": ["2022-10-01T00:00:00Z"], "value": ["abc"]},
+                {"datetime": ["not-a-date"], "value": [1.5]},
+                {"start": "2022-10-01T00:00:00Z", "interval": "1h",
+                 "value": [1.5]}):
+            response = self.client.post(self.base_url,
+                                        data={**payload,
+                                              "timeseries": timeseries},
+                                        format="json")
+            self.assertEqual(response.status_code,
+                             status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(RawData.objects.exists())
+
+    def test_list_raw_data_units_bad_query_params(self):
+        login_user(client=self.client, user=self.user)
+        response = self.client.get(self.base_url, {"units": "gw"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
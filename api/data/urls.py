@@ -1,11 +1,21 @@
 from django.urls import re_path
 
-from .views.raw_data import RawDataView
+from .views.raw_data import RawDataView, RawDataStreamView, RawDataCoverageView
 from .views.market_forecasts import MarketForecastsView
+from .views.data_export import (
+    DataExportView,
+    DataExportDetailView,
+    DataExportDownloadView,
+)
 
 app_name = "data"
 
 urlpatterns = [
     re_path('raw-data/?$', RawDataView.as_view(), name="raw-data"),
+    re_path('raw-data/stream/?$', RawDataStreamView.as_view(), name="raw-data-stream"),
+    re_path('raw-data/coverage/?$', RawDataCoverageView.as_view(), name="raw-data-coverage"),
     re_path('market-forecasts/?$', MarketForecastsView.as_view(), name="market-forecasts"),
+    re_path('export/?$', DataExportView.as_view(), name="data-export"),
+    re_path('export/(?P<export_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})/?$', DataExportDetailView.as_view(), name="data-export-detail"),
+    re_path('export/(?P<export_id>[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})/download/?$', DataExportDownloadView.as_view(), name="data-export-download"),
 ]
@@ -2,9 +2,13 @@ import re
 import uuid
 import datetime as dt
 
+from django.utils.dateparse import parse_datetime
 from rest_framework import exceptions
 from market.models import MarketSession
 
+from ..helpers.timeseries import RESAMPLE_AGGREGATIONS
+from ..helpers.units import UNIT_SCALES
+
 
 def __validate_datetime_str(dt_str):
     fmt_ = "%Y-%m-%dT%H:%M:%SZ"
@@ -24,6 +28,12 @@ def validate_query_params(
         confirmed=None,
         start_date=None,
         end_date=None,
+        fast=None,
+        stream=None,
+        resample=None,
+        aggregation=None,
+        units=None,
+        since=None,
 ):
     if market_session_id is not None:
         try:
@@ -52,6 +62,55 @@ def validate_query_params(
                 "Query param 'confirmed' must be a boolean (true/false)"
             )
 
+    if fast is not None:
+        if fast.lower() not in ['true', 'false']:
+            raise exceptions.ValidationError(
+                "Query param 'fast' must be a boolean (true/false)"
+            )
+
+    if stream is not None:
+        if stream.lower() not in ['true', 'false']:
+            raise exceptions.ValidationError(
+                "Query param 'stream' must be a boolean (true/false)"
+            )
+
+    if resample is not None:
+        try:
+            if int(resample) <= 0:
+                raise ValueError
+        except ValueError:
+            raise exceptions.ValidationError(
+                "Query param 'resample' must be a positive integer (minutes)."
+            )
+
+    if aggregation is not None:
+        if resample is None:
+            raise exceptions.ValidationError(
+                "Query param 'agg' requires the 'resample' query param."
+            )
+        if aggregation.lower() not in RESAMPLE_AGGREGATIONS:
+            raise exceptions.ValidationError(
+                f"Query param 'agg' must be one of the following "
+                f"{list(RESAMPLE_AGGREGATIONS)}"
+            )
+
+    if units is not None:
+        if units.lower() not in UNIT_SCALES:
+            raise exceptions.ValidationError(
+                f"Query param 'units' must be one of the following "
+                f"{list(UNIT_SCALES)}"
+            )
+
+    if since is not None:
+        try:
+            if parse_datetime(since) is None:
+                raise ValueError
+        except ValueError:
+            raise exceptions.ValidationError(
+                "Query param 'since' must be an ISO 8601 datetime. "
+                "Example: 2021-01-01T10:00:00.123456Z"
+            )
+
     if start_date is not None:
         __validate_datetime_str(start_date)
 
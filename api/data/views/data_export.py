@@ -0,0 +1,151 @@
+import os
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound
+
+from api.renderers.CustomRenderer import CustomRenderer
+
+from ..schemas.query import *
+from ..schemas.responses import *
+from .. import exceptions as data_exceptions
+from ..serializers.data_export import (
+    DataExportCreateSerializer,
+    DataExportRetrieveSerializer,
+)
+from ..models.data_export import DataExport
+
+
+class DataExportView(APIView):
+    renderer_classes = (CustomRenderer,)
+    permission_classes = (IsAuthenticated,)
+
+    @staticmethod
+    def queryset(request):
+        user = request.user
+        if user.is_superuser:
+            user_id = request.query_params.get('user', None)
+            if user_id:
+                query = DataExport.objects.filter(user=user_id)
+            else:
+                query = DataExport.objects.all()
+        else:
+            query = DataExport.objects.filter(user=user.id)
+        return query.order_by('-registered_at')
+
+    @swagger_auto_schema(
+        operation_id="get_data_export",
+        operation_description="Method to list data export requests "
+                              "(and their status).",
+        responses={
+            200: DataExportResponse["GET"],
+            401: NotAuthenticatedResponse,
+            403: ForbiddenAccessResponse,
+            500: "Internal Server Error",
+        })
+    def get(self, request):
+        query = self.queryset(request)
+        serializer = DataExportRetrieveSerializer(query, many=True)
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(
+        operation_id="post_data_export",
+        operation_description="Method to request an export of the "
+                              "raw data, market forecasts, market session "
+                              "transactions or market session balance "
+                              "tables into a CSV or Parquet file. Exports "
+                              "run asynchronously (export worker) - poll "
+                              "the returned export (`GET /export/<id>`) "
+                              "until its status is 'finished', and "
+                              "download it from its 'download_url'.",
+        request_body=DataExportCreateSerializer,
+        responses={
+            202: DataExportResponse["POST"],
+            400: 'Bad request',
+            401: NotAuthenticatedResponse,
+            403: ForbiddenAccessResponse,
+            500: "Internal Server Error",
+        })
+    def post(self, request):
+        serializer = DataExportCreateSerializer(
+            data=request.data,
+            context={"request": request}
+        )
+        serializer.is_valid(raise_exception=True)
+        # Processed by the export worker (`run_data_exports` command):
+        export = serializer.save()
+        return Response(data=DataExportRetrieveSerializer(export).data,
+                        status=status.HTTP_202_ACCEPTED)
+
+
+class DataExportDetailView(APIView):
+    renderer_classes = (CustomRenderer,)
+    permission_classes = (IsAuthenticated,)
+
+    @swagger_auto_schema(
+        operation_id="get_data_export_detail",
+        operation_description="Method to get the status of a data "
+                              "export request.",
+        responses={
+            200: DataExportResponse["GET"],
+            401: NotAuthenticatedResponse,
+            403: ForbiddenAccessResponse,
+            404: 'Not found',
+            500: "Internal Server Error",
+        })
+    def get(self, request, export_id):
+        export = get_user_export(request, export_id)
+        serializer = DataExportRetrieveSerializer(export)
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
+
+
+class DataExportDownloadView(APIView):
+    renderer_classes = (CustomRenderer,)
+    permission_classes = (IsAuthenticated,)
+
+    @swagger_auto_schema(
+        operation_id="get_data_export_download",
+        operation_description="Method to download the file of a finished "
+                              "data export request.",
+        responses={
+            200: 'Exported file (CSV or Parquet)',
+            401: NotAuthenticatedResponse,
+            403: ForbiddenAccessResponse,
+            404: 'Not found',
+            409: 'Export not finished',
+            500: "Internal Server Error",
+        })
+    def get(self, request, export_id):
+        export = get_user_export(request, export_id)
+        if export.status != DataExport.ExportStatus.FINISHED:
+            raise data_exceptions.ExportNotFinished(export.status)
+
+        filename = f"{export.table}-{export.id}.{export.file_format}"
+        if settings.DATA_EXPORT_ACCEL_REDIRECT:
+            # File is sent by NGINX (internal location):
+            response = HttpResponse()
+            response["X-Accel-Redirect"] = os.path.join(
+                settings.DATA_EXPORT_ACCEL_REDIRECT, export.file.name
+            )
+            # Content type is set by NGINX (file extension):
+            del response["Content-Type"]
+            response["Content-Disposition"] = \
+                f'attachment; filename="{filename}"'
+            return response
+        try:
+            file = export.file.open("rb")
+        except FileNotFoundError:
+            raise NotFound("Export file not found.")
+        return FileResponse(file, as_attachment=True, filename=filename)
+
+
+def get_user_export(request, export_id):
+    export = DataExportView.queryset(request).filter(id=export_id).first()
+    if export is None:
+        raise NotFound("Export not found.")
+    return export
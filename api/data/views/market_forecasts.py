@@ -1,22 +1,52 @@
+import datetime as dt
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import status
+from rest_framework import status, exceptions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 from api.utils.permissions import method_permission_classes
 from api.renderers.CustomRenderer import CustomRenderer
+from api.renderers.StreamingRenderer import streaming_response
+from api.utils.pagination import KeysetPagination
+from api.utils.conditional import ConditionalGet
 
 from ..schemas.query import *
 from ..schemas.responses import *
 from ..util.validators import validate_query_params
+from ..helpers.representation import (
+    values_representation,
+    iter_values_representation,
+)
+from ..helpers.units import convert_units_queryset, CONVERTED_UNITS_FIELDS
 from ..serializers.market_forecasts import (
     MarketForecastsRetrieveSerializer,
     MarketForecastsCreateSerializer,
+    MarketForecastsColumnarCreateSerializer,
 )
 from ..models.market_forecasts import MarketForecasts
 
 
+def delta_watermark(rows, since, next_cursor):
+    """
+    Watermark of a delta sync page (rows ordered by registered_at): every
+    row registered until the watermark was returned. If there are more
+    pages, rows sharing the last `registered_at` of the page may continue
+    in the next one, so the watermark stops before them.
+    """
+    if not rows:
+        return since
+    last = rows[-1]["registered_at"]
+    if next_cursor is None:
+        return last
+    earlier = [r["registered_at"] for r in rows if r["registered_at"] != last]
+    return earlier[-1] if earlier else since
+
+
 class MarketForecastsView(APIView):
     renderer_classes = (CustomRenderer,)
     permission_classes = (IsAuthenticated,)
@@ -53,8 +83,10 @@ class MarketForecastsView(APIView):
         if resource_id:
             query = query.filter(resource_id=resource_id)
 
-        # Order records by datetime
-        query = query.order_by('datetime', 'request')
+        # Order records by datetime (resource name is fetched in the
+        # same query, to avoid one extra lookup per row on serialization)
+        query = query.select_related('resource').order_by('datetime',
+                                                          'request')
 
         return query
 
@@ -62,7 +94,7 @@ class MarketForecastsView(APIView):
         operation_id="get_market_forecasts",
         operation_description="Method to get market forecasts for a specific "
                               "agent resource",
-        manual_parameters=raw_data_query_params(),
+        manual_parameters=market_forecasts_query_params(),
         responses={
             200: RawDataResponse["GET"],
             400: 'Bad request',
@@ -71,14 +103,86 @@ class MarketForecastsView(APIView):
             500: "Internal Server Error",
         })
     def get(self, request):
-        address = self.queryset(request)
-        serializer = MarketForecastsRetrieveSerializer(address, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        fast = request.query_params.get('fast', None)
+        units = request.query_params.get('units', None)
+        since = request.query_params.get('since', None)
+        stream = request.query_params.get('stream', None)
+        validate_query_params(fast=fast, stream=stream, units=units,
+                              since=since)
+        stream = (stream is not None) and (stream.lower() == "true")
+        query = self.queryset(request)
+        serializer_class = MarketForecastsRetrieveSerializer
+        fields = serializer_class.values_fields
+        paginator = KeysetPagination(fields=("datetime", "id"))
+        if stream and (paginator.is_requested(request) or since is not None):
+            raise exceptions.ValidationError(
+                "Query param 'stream' can not be combined with 'since' "
+                "or pagination query params."
+            )
+        if since is not None:
+            # Delta sync - rows inserted / updated after the watermark, and
+            # registered before the commit window (rows registered later
+            # may still be uncommitted, and are left to the next request):
+            watermark = parse_datetime(since)
+            if timezone.is_naive(watermark):
+                watermark = timezone.make_aware(watermark, dt.timezone.utc)
+            settled_at = timezone.now() - dt.timedelta(
+                seconds=settings.DELTA_SYNC_COMMIT_WINDOW
+            )
+            query = query.filter(registered_at__gt=watermark,
+                                 registered_at__lte=settled_at)
+            paginator = KeysetPagination(fields=("registered_at", "id"))
+
+        conditional = ConditionalGet(request, query, "registered_at")
+        not_modified = conditional.not_modified_response()
+        if not_modified is not None:
+            return not_modified
+        if units is not None:
+            # Values converted to the requested unit (in the DB):
+            query = convert_units_queryset(queryset=query, units=units.lower())
+            fields = {**fields, **CONVERTED_UNITS_FIELDS}
+        if stream:
+            # Rows are fetched with a server-side cursor and streamed in
+            # chunks (serializer-free read path, same response format):
+            rows = iter_values_representation(
+                queryset=query,
+                fields=fields,
+                datetime_fields=serializer_class.values_datetime_fields,
+                chunk_size=settings.STREAMING_RESPONSE_CHUNK_SIZE
+            )
+            return conditional.add_headers(
+                streaming_response(rows, status=status.HTTP_200_OK)
+            )
+        # Delta responses are always paginated (default page size):
+        page = paginator.paginate_queryset(query, request,
+                                           required=since is not None)
+        if (units is not None) or (fast is not None and fast.lower() == "true"):
+            # Serializer-free read path (same response format):
+            data = values_representation(
+                queryset=page,
+                fields=paginator.representation_fields(fields),
+                datetime_fields=serializer_class.values_datetime_fields
+            )
+        else:
+            data = MarketForecastsRetrieveSerializer(page, many=True).data
+        data = paginator.get_paginated_data(data, page)
+        if since is not None:
+            data["watermark"] = delta_watermark(data["results"], since,
+                                                paginator.next_cursor)
+        return conditional.add_headers(
+            Response(data=data, status=status.HTTP_200_OK)
+        )
 
     @swagger_auto_schema(
         operation_id="post_market_forecasts",
         operation_description="[AdminOnly] Method to register market forecasts "
-                              "for a specific agent resource",
+                              "for a specific agent resource. The "
+                              "'timeseries' field can also be sent in "
+                              "columnar format, either as parallel arrays "
+                              "(`{'datetime': [...], 'request': [...], "
+                              "'value': [...]}`) or as a regular series "
+                              "(`{'start': ..., 'interval': <minutes>, "
+                              "'request': ..., 'value': [...]}`).",
         request_body=MarketForecastsCreateSerializer,
         responses={
             400: 'Bad request',
@@ -88,7 +192,12 @@ class MarketForecastsView(APIView):
         })
     @method_permission_classes((IsAdminUser,))
     def post(self, request):
-        serializer = MarketForecastsCreateSerializer(data=request.data)
+        if isinstance(request.data.get("timeseries"), dict):
+            serializer = MarketForecastsColumnarCreateSerializer(
+                data=request.data
+            )
+        else:
+            serializer = MarketForecastsCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         response = serializer.save()
         return Response(data=response, status=status.HTTP_200_OK)
@@ -1,19 +1,40 @@
+from django.conf import settings
 from drf_yasg.utils import swagger_auto_schema
-from rest_framework import status
+from rest_framework import status, exceptions
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from api.renderers.CustomRenderer import CustomRenderer
+from api.renderers.StreamingRenderer import streaming_response
+from api.utils.pagination import KeysetPagination
 
 from ..schemas.query import *
 from ..schemas.responses import *
 from ..util.validators import validate_query_params
+from ..helpers.representation import (
+    values_representation,
+    iter_values_representation,
+)
+from ..helpers.timeseries import resample_queryset
+from ..helpers.units import convert_units_queryset, CONVERTED_UNITS_FIELDS
+from ..helpers.stream import (
+    NDJSON_MEDIA_TYPES,
+    CSV_MEDIA_TYPES,
+    iter_line_chunks,
+    read_csv_header,
+    parse_lines_chunk,
+)
+from ..serializers.fields import ColumnarTimeseriesField
 from ..serializers.raw_data import (
     RawDataRetrieveSerializer,
     RawDataCreateSerializer,
+    RawDataColumnarCreateSerializer,
+    RawDataStreamSerializer,
+    RawDataCoverageSerializer,
 )
 from ..models.raw_data import RawData
+from ..models.raw_data_coverage import RawDataCoverage
 
 
 class RawDataView(APIView):
@@ -48,8 +69,9 @@ class RawDataView(APIView):
         if resource_id is not None:
             query = query.filter(resource_id=resource_id)
 
-        # Order records by datetime
-        query = query.order_by('datetime')
+        # Order records by datetime (resource name is fetched in the
+        # same query, to avoid one extra lookup per row on serialization)
+        query = query.select_related('resource').order_by('datetime')
 
         return query
 
@@ -66,15 +88,97 @@ class RawDataView(APIView):
             500: "Internal Server Error",
         })
     def get(self, request):
+        fast = request.query_params.get('fast', None)
+        resample = request.query_params.get('resample', None)
+        aggregation = request.query_params.get('agg', None)
+        units = request.query_params.get('units', None)
+        stream = request.query_params.get('stream', None)
+        validate_query_params(fast=fast,
+                              stream=stream,
+                              resample=resample,
+                              aggregation=aggregation,
+                              units=units)
+        stream = (stream is not None) and (stream.lower() == "true")
         query = self.queryset(request)
-        serializer = RawDataRetrieveSerializer(query, many=True)
-        return Response(data=serializer.data, status=status.HTTP_200_OK)
+        paginator = KeysetPagination(fields=("datetime", "id"))
+        fields = RawDataRetrieveSerializer.values_fields
+        if stream and paginator.is_requested(request):
+            raise exceptions.ValidationError(
+                "Query param 'stream' can not be combined with "
+                "pagination query params."
+            )
+
+        if resample is not None:
+            # Downsampled series (aggregated in the DB):
+            if paginator.is_requested(request):
+                raise exceptions.ValidationError(
+                    "Query param 'resample' can not be combined with "
+                    "pagination query params."
+                )
+            query = resample_queryset(
+                queryset=query,
+                interval=int(resample),
+                aggregation=(aggregation or "avg").lower()
+            )
+            fields = RawDataRetrieveSerializer.resample_values_fields
+            if units is not None:
+                query = convert_units_queryset(queryset=query,
+                                               units=units.lower(),
+                                               value_field="bucket_value")
+                fields = {**fields, **CONVERTED_UNITS_FIELDS}
+            if stream:
+                return self.streaming_response(query, fields)
+            page = paginator.paginate_queryset(query, request)
+            data = values_representation(
+                queryset=page,
+                fields=fields,
+                datetime_fields=RawDataRetrieveSerializer.values_datetime_fields
+            )
+            data = paginator.get_paginated_data(data, page)
+            return Response(data=data, status=status.HTTP_200_OK)
+
+        if units is not None:
+            # Values converted to the requested unit (in the DB):
+            query = convert_units_queryset(queryset=query, units=units.lower())
+            fields = {**fields, **CONVERTED_UNITS_FIELDS}
+        if stream:
+            return self.streaming_response(query, fields)
+        page = paginator.paginate_queryset(query, request)
+        if (units is not None) or (fast is not None and fast.lower() == "true"):
+            # Serializer-free read path (same response format):
+            data = values_representation(
+                queryset=page,
+                fields=paginator.representation_fields(fields),
+                datetime_fields=RawDataRetrieveSerializer.values_datetime_fields
+            )
+        else:
+            data = RawDataRetrieveSerializer(page, many=True).data
+        data = paginator.get_paginated_data(data, page)
+        return Response(data=data, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def streaming_response(query, fields):
+        # Rows are fetched with a server-side cursor and streamed in
+        # chunks (serializer-free read path, same response format):
+        rows = iter_values_representation(
+            queryset=query,
+            fields=fields,
+            datetime_fields=RawDataRetrieveSerializer.values_datetime_fields,
+            chunk_size=settings.STREAMING_RESPONSE_CHUNK_SIZE
+        )
+        return streaming_response(rows, status=status.HTTP_200_OK)
 
     @staticmethod
     @swagger_auto_schema(
         operation_id="post_raw_data",
         operation_description="Method for agents to post raw data "
-                              "for a specific resource",
+                              "for a specific resource. The 'timeseries' "
+                              "field can also be sent in columnar format, "
+                              "either as parallel arrays "
+                              "(`{'datetime': [...], 'value': [...]}`) or "
+                              "as a regular series "
+                              "(`{'start': ..., 'interval': <minutes>, "
+                              "'value': [...]}`).",
         request_body=RawDataCreateSerializer,
         responses={
             400: 'Bad request',
@@ -84,7 +188,135 @@ class RawDataView(APIView):
         })
     def post(request):
         request.data["user"] = request.user.id
-        serializer = RawDataCreateSerializer(data=request.data)
+        if isinstance(request.data.get("timeseries"), dict):
+            serializer = RawDataColumnarCreateSerializer(data=request.data)
+        else:
+            serializer = RawDataCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         response = serializer.save()
         return Response(data=response, status=status.HTTP_200_OK)
+
+
+class RawDataStreamView(APIView):
+    renderer_classes = (CustomRenderer,)
+    permission_classes = (IsAuthenticated,)
+
+    @swagger_auto_schema(
+        operation_id="post_raw_data_stream",
+        operation_description="Method for agents to stream large raw data "
+                              "uploads (e.g., historical backfills) for a "
+                              "specific resource. The request body is "
+                              "either NDJSON (`application/x-ndjson`, one "
+                              "`{'datetime': ..., 'value': ...}` object "
+                              "per line) or CSV (`text/csv`, with a "
+                              "'datetime,value' header). The body is "
+                              "parsed and inserted in chunks, and a "
+                              "summary of each chunk is returned. In "
+                              "production, uploads are served by a "
+                              "dedicated worker pool with a 900 s request "
+                              "timeout (the default sync worker timeout is "
+                              "30 s) - larger backfills must be split "
+                              "into several requests.",
+        manual_parameters=raw_data_stream_query_params(),
+        responses={
+            400: 'Bad request',
+            401: NotAuthenticatedResponse,
+            403: ForbiddenAccessResponse,
+            415: 'Unsupported media type',
+            500: "Internal Server Error",
+        })
+    def post(self, request):
+        media_type = request.content_type.split(";")[0].strip().lower()
+        if media_type not in NDJSON_MEDIA_TYPES + CSV_MEDIA_TYPES:
+            raise exceptions.UnsupportedMediaType(media_type)
+
+        serializer = RawDataStreamSerializer(data={
+            **request.query_params.dict(),
+            "user": request.user.id
+        })
+        serializer.is_valid(raise_exception=True)
+
+        # Body is read directly from the request stream (never loaded
+        # as a whole into memory):
+        stream = request.stream
+        if stream is None:
+            raise exceptions.ValidationError("Empty request body.")
+        header = read_csv_header(stream) \
+            if media_type in CSV_MEDIA_TYPES else None
+
+        timeseries_field = ColumnarTimeseriesField()
+        chunks = []
+        first_row = 0
+        for i, lines in enumerate(iter_line_chunks(
+                stream=stream,
+                chunk_size=settings.DATA_STREAM_CHUNK_SIZE)):
+            chunk = {"chunk": i, "first_row": first_row, "rows": len(lines)}
+            first_row += len(lines)
+            try:
+                columns = parse_lines_chunk(lines=lines,
+                                            media_type=media_type,
+                                            header=header)
+                data = timeseries_field.run_validation(columns)
+                result = serializer.insert_timeseries(
+                    data, serializer.validated_data
+                )
+                chunk.update(status="ok",
+                             inserted=result.inserted,
+                             updated=result.updated)
+            except exceptions.ValidationError as e:
+                chunk.update(status="error", errors=e.detail)
+            chunks.append(chunk)
+
+        response = {
+            "status": "ok" if all(c["status"] == "ok" for c in chunks)
+            else "error",
+            "rows": first_row,
+            "inserted": sum(c.get("inserted", 0) for c in chunks),
+            "updated": sum(c.get("updated", 0) for c in chunks),
+            "chunks": chunks,
+        }
+        return Response(data=response, status=status.HTTP_200_OK)
+
+
+class RawDataCoverageView(APIView):
+    renderer_classes = (CustomRenderer,)
+    permission_classes = (IsAuthenticated,)
+
+    @staticmethod
+    def queryset(request):
+        user = request.user
+        resource_id = request.query_params.get('resource', None)
+        validate_query_params(resource_id=resource_id)
+
+        if user.is_superuser:
+            user_id = request.query_params.get('user', None)
+            if user_id:
+                query = RawDataCoverage.objects.filter(user=user_id)
+            else:
+                query = RawDataCoverage.objects.all()
+        else:
+            query = RawDataCoverage.objects.filter(user=user.id)
+
+        if resource_id is not None:
+            query = query.filter(resource_id=resource_id)
+
+        return query.select_related('resource').order_by('resource__name')
+
+    @swagger_auto_schema(
+        operation_id="get_raw_data_coverage",
+        operation_description="Method to get the raw data coverage of "
+                              "agent resources (contiguous time ranges "
+                              "available, last timestamp and number "
+                              "of gaps).",
+        manual_parameters=raw_data_coverage_query_params(),
+        responses={
+            200: RawDataCoverageResponse["GET"],
+            400: 'Bad request',
+            401: NotAuthenticatedResponse,
+            403: ForbiddenAccessResponse,
+            500: "Internal Server Error",
+        })
+    def get(self, request):
+        query = self.queryset(request)
+        serializer = RawDataCoverageSerializer(query, many=True)
+        return Response(data=serializer.data, status=status.HTTP_200_OK)
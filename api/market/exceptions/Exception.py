@@ -37,6 +37,15 @@ class MoreThanOneSessionOpen(APIException):
     default_code = 'more_than_one_session_open'
 
 
+class UnfinishedSessionsOnUpdate(APIException):
+    def __init__(self, session_id):
+        super().__init__(self.default_detail.format(session_id))
+    status_code = 409
+    default_detail = "Unable to update session '{}'. " \
+                     "There are still unfinished sessions."
+    default_code = 'unfinished_sessions_on_update'
+
+
 class NoBidsDataFound(APIException):
 
     def __init__(self, tangle_msg_id):
@@ -156,6 +165,16 @@ class BalanceLowerThanZero(APIException):
     default_code = 'balance_lower_than_zero'
 
 
+class BalanceUpdateLowerThanZero(APIException):
+
+    def __init__(self):
+        super().__init__(self.default_detail)
+    status_code = 409
+    default_detail = "Balance update rejected. The final balance of " \
+                     "(at least) one user would be lower than zero."
+    default_code = 'balance_update_lower_than_zero'
+
+
 class NoMarketAddress(APIException):
 
     def __init__(self):
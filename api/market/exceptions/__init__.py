@@ -6,11 +6,13 @@ from .Exception import (
     TransactionBadOperatorSignal,
     DuplicatedTransactionFound,
     UnfinishedSessions,
+    UnfinishedSessionsOnUpdate,
     NoMarketSession,
     SessionNotOpenForBids,
     UserWalletAddressNotFound,
     BidPaymentNotFound,
     BalanceLowerThanZero,
+    BalanceUpdateLowerThanZero,
     DuplicatedMarketAddress,
     MarketAddressAlreadyExists,
     InvalidIotaAddress,
@@ -0,0 +1,32 @@
+from django.db.models import Max, Sum
+
+
+# Session balance fields summed per user (in each session):
+SESSION_BALANCE_SUM_FIELDS = ["session_deposit", "session_balance",
+                              "session_payment", "session_revenue"]
+
+
+def sum_balances_per_user(queryset):
+    """
+    Sum the (per resource) session balances of each user, in each market
+    session, in the database.
+
+    :param queryset: MarketSessionBalance queryset (already filtered)
+    :return: list of dicts (market_session, user, summed balance fields
+    and last registered_at), ordered by market session and user
+    """
+    rows = queryset.order_by().values("market_session", "user").annotate(
+        **{f"sum_{field}": Sum(field)
+           for field in SESSION_BALANCE_SUM_FIELDS},
+        last_registered_at=Max("registered_at"),
+    ).order_by("market_session", "user")
+    return [
+        {
+            "market_session": row["market_session"],
+            "user": row["user"],
+            **{field: row[f"sum_{field}"]
+               for field in SESSION_BALANCE_SUM_FIELDS},
+            "registered_at": row["last_registered_at"],
+        }
+        for row in rows
+    ]
@@ -0,0 +1,183 @@
+from collections import defaultdict, namedtuple
+
+from django.db import connection, transaction
+from django.db.utils import IntegrityError
+
+from .. import exceptions as market_exceptions
+from ..models.market_session import MarketSessionTransactions
+from ..models.market_balance import MarketBalance, MarketSessionBalance
+
+
+TransactionType = MarketSessionTransactions.TransactionType
+
+LedgerEntry = namedtuple(
+    "LedgerEntry",
+    ["user_id", "market_session_id", "resource_id", "amount",
+     "transaction_type"]
+)
+
+# Market balance / session balance totals updated by each transaction
+# type (besides the balance itself):
+BALANCE_TOTALS = {
+    TransactionType.TRANSFER_IN: ("total_deposit", "session_deposit"),
+    TransactionType.REVENUE: ("total_revenue", "session_revenue"),
+    TransactionType.PAYMENT: ("total_payment", "session_payment"),
+    TransactionType.TRANSFER_OUT: (None, None),
+}
+
+
+def _values_update(cursor, table, key_columns, columns, rows,
+                   returning=None, timestamp_column=None):
+    """
+    Add deltas to several rows of `table` in a single statement, i.e.,
+    `UPDATE table SET col = col + v.col FROM (VALUES ...) AS v`.
+
+    :param key_columns: [(column name, SQL type)] used to match rows
+    :param columns: columns to increment
+    :param rows: [(*key values, *deltas)]
+    :param returning: columns returned for each updated row (if any)
+    :param timestamp_column: column set to the current time (if any)
+    """
+    all_columns = [name for name, _ in key_columns] + columns
+    casts = [f"%s::{sql_type}" for _, sql_type in key_columns] + \
+            ["%s::double precision"] * len(columns)
+    values = ", ".join([f"({', '.join(casts)})"] * len(rows))
+    assignments = ", ".join(f'"{c}" = t."{c}" + v."{c}"' for c in columns)
+    if timestamp_column is not None:
+        assignments += f', "{timestamp_column}" = now()'
+    conditions = " AND ".join(f't."{c}" = v."{c}"' for c, _ in key_columns)
+    sql = f'UPDATE "{table}" AS t SET {assignments} ' \
+          f'FROM (VALUES {values}) AS v ({", ".join(all_columns)}) ' \
+          f'WHERE {conditions}'
+    if returning:
+        sql += f' RETURNING {", ".join(f"t.{c}" for c in returning)}'
+    cursor.execute(sql, [value for row in rows for value in row])
+    return cursor.fetchall() if returning else None
+
+
+def apply_transactions(entries):
+    """
+    Register market transactions and apply them to the users market and
+    session balances with a fixed number of (set-based) statements,
+    regardless of the number of entries. Must run inside an atomic block.
+
+    :param entries: list of `LedgerEntry`
+    :return: updated market balance of each user ({user_id: balance})
+    """
+    # -- Aggregate balance deltas (per user and per user session balance):
+    user_deltas = defaultdict(lambda: defaultdict(float))
+    session_deltas = defaultdict(lambda: defaultdict(float))
+    for entry in entries:
+        total_column, session_column = BALANCE_TOTALS[entry.transaction_type]
+        session_key = (entry.market_session_id,
+                       str(entry.user_id),
+                       str(entry.resource_id))
+        user_deltas[str(entry.user_id)]["balance"] += entry.amount
+        session_deltas[session_key]["session_balance"] += entry.amount
+        if total_column is not None:
+            user_deltas[str(entry.user_id)][total_column] += entry.amount
+            session_deltas[session_key][session_column] += entry.amount
+
+    # -- Register transactions (unique per session/user/resource/type):
+    transactions = [
+        MarketSessionTransactions(
+            market_session_id=entry.market_session_id,
+            user_id=entry.user_id,
+            resource_id=entry.resource_id,
+            amount=entry.amount,
+            transaction_type=entry.transaction_type,
+        )
+        for entry in entries
+    ]
+    try:
+        with transaction.atomic():
+            MarketSessionTransactions.objects.bulk_create(transactions)
+    except IntegrityError:
+        entry = _find_duplicated_transaction(entries)
+        raise market_exceptions.DuplicatedTransactionFound(
+            user_id=entry.user_id,
+            resource_id=entry.resource_id,
+            market_session_id=entry.market_session_id,
+            transaction_type=entry.transaction_type
+        )
+
+    # -- Create missing balance entries (inserted in key order, as
+    # concurrent batches wait on each other's unique index entries):
+    MarketBalance.objects.bulk_create(
+        [MarketBalance(user_id=user_id) for user_id in sorted(user_deltas)],
+        ignore_conflicts=True
+    )
+    MarketSessionBalance.objects.bulk_create(
+        [MarketSessionBalance(market_session_id=market_session_id,
+                              user_id=user_id,
+                              resource_id=resource_id)
+         for market_session_id, user_id, resource_id
+         in sorted(session_deltas)],
+        ignore_conflicts=True
+    )
+
+    # -- Apply deltas (locking market balance rows in a fixed order, so
+    # that concurrent batches do not deadlock; session balances belong to
+    # these users, thus are only updated after the locks are acquired):
+    user_columns = ["balance", "total_deposit", "total_revenue",
+                    "total_payment"]
+    session_columns = ["session_balance", "session_deposit",
+                       "session_revenue", "session_payment"]
+    list(MarketBalance.objects.select_for_update()
+         .filter(user_id__in=list(user_deltas))
+         .order_by("user_id")
+         .values_list("user_id", flat=True))
+    try:
+        with connection.cursor() as cursor:
+            balances = _values_update(
+                cursor,
+                table=MarketBalance._meta.db_table,
+                key_columns=[("user_id", "uuid")],
+                columns=user_columns,
+                rows=[(user_id, *[deltas[c] for c in user_columns])
+                      for user_id, deltas in sorted(user_deltas.items())],
+                returning=["user_id", "balance"],
+                timestamp_column="updated_at"
+            )
+            _values_update(
+                cursor,
+                table=MarketSessionBalance._meta.db_table,
+                key_columns=[("market_session_id", "integer"),
+                             ("user_id", "uuid"),
+                             ("resource_id", "uuid")],
+                columns=session_columns,
+                rows=[(*key, *[deltas[c] for c in session_columns])
+                      for key, deltas in sorted(session_deltas.items())]
+            )
+    except IntegrityError:
+        # Non-negative balances (CHECK constraints):
+        raise market_exceptions.BalanceUpdateLowerThanZero()
+
+    return {str(user_id): balance for user_id, balance in balances}
+
+
+def _find_duplicated_transaction(entries):
+    keys = {(x.market_session_id, str(x.user_id), str(x.resource_id),
+             x.transaction_type): x for x in entries}
+    if len(keys) != len(entries):
+        # Duplicated entries in the batch itself:
+        seen = set()
+        for entry in entries:
+            key = (entry.market_session_id, str(entry.user_id),
+                   str(entry.resource_id), entry.transaction_type)
+            if key in seen:
+                return entry
+            seen.add(key)
+    existing = MarketSessionTransactions.objects.filter(
+        market_session_id__in={x.market_session_id for x in entries},
+        user_id__in={x.user_id for x in entries},
+        resource_id__in={x.resource_id for x in entries},
+        transaction_type__in={x.transaction_type for x in entries},
+    ).values_list("market_session_id", "user_id", "resource_id",
+                  "transaction_type")
+    for market_session_id, user_id, resource_id, transaction_type in existing:
+        key = (market_session_id, str(user_id), str(resource_id),
+               transaction_type)
+        if key in keys:
+            return keys[key]
+    return entries[0]
@@ -0,0 +1,154 @@
+from django.db import connection
+
+
+SUMMARY_TABLE = "market_ledger_summary"
+
+# Summary totals derived from each source table row:
+TRANSACTIONS_TOTALS = """
+    coalesce(sum(amount) FILTER (WHERE transaction_type = 'transfer_in'), 0),
+    coalesce(sum(amount) FILTER (WHERE transaction_type = 'payment'), 0),
+    coalesce(sum(amount) FILTER (WHERE transaction_type = 'revenue'), 0),
+    coalesce(sum(amount) FILTER (WHERE transaction_type = 'transfer_out'), 0),
+    0,
+    count(*)
+"""
+# Only applied transfers (is_solid) are debited from the balance - the
+# pending ones are counted when updated (UPDATE trigger):
+TRANSFER_OUT_TOTALS = """
+    0, 0, 0, 0,
+    coalesce(sum(amount) FILTER (WHERE is_solid), 0),
+    0
+"""
+SUMMARY_COLUMNS = ["total_deposit", "total_payment", "total_revenue",
+                   "total_transfer_out", "total_withdraw", "n_transactions"]
+
+
+def _trigger_function_sql(source_table, totals):
+    """
+    Statement level trigger function that applies the rows inserted /
+    deleted (transition tables) in `source_table` to the summary table.
+    Deleted rows only update existing summary rows (e.g., the summary of
+    a user being deleted is not recreated).
+    """
+    columns = ", ".join(SUMMARY_COLUMNS)
+    increments = ", ".join(f"{c} = s.{c} + EXCLUDED.{c}"
+                           for c in SUMMARY_COLUMNS)
+    decrements = ", ".join(f"{c} = s.{c} - d.{c}" for c in SUMMARY_COLUMNS)
+    return f"""
+    CREATE OR REPLACE FUNCTION {source_table}_ledger_summary()
+    RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE {SUMMARY_TABLE} AS s
+            SET {decrements}, updated_at = now()
+            FROM (SELECT user_id, {totals}
+                  FROM old_rows GROUP BY user_id) AS d (user_id, {columns})
+            WHERE s.user_id = d.user_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO {SUMMARY_TABLE} AS s (user_id, {columns}, updated_at)
+            SELECT user_id, {totals}, now()
+            FROM new_rows GROUP BY user_id ORDER BY user_id
+            ON CONFLICT (user_id) DO UPDATE
+            SET {increments}, updated_at = EXCLUDED.updated_at;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """
+
+
+def _triggers_sql(source_table):
+    transition_tables = {
+        "INSERT": "NEW TABLE AS new_rows",
+        "UPDATE": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "DELETE": "OLD TABLE AS old_rows",
+    }
+    return [
+        f"""
+        CREATE TRIGGER {source_table}_ledger_summary_{op.lower()}
+        AFTER {op} ON {source_table}
+        REFERENCING {tables}
+        FOR EACH STATEMENT
+        EXECUTE PROCEDURE {source_table}_ledger_summary();
+        """
+        for op, tables in transition_tables.items()
+    ]
+
+
+SOURCE_TABLES = {
+    "market_session_transactions": TRANSACTIONS_TOTALS,
+    "balance_transfer_out": TRANSFER_OUT_TOTALS,
+}
+
+TRIGGER_FUNCTIONS_SQL = {
+    table: _trigger_function_sql(table, totals)
+    for table, totals in SOURCE_TABLES.items()
+}
+
+CREATE_TRIGGERS_SQL = [
+    sql
+    for table, function_sql in TRIGGER_FUNCTIONS_SQL.items()
+    for sql in [function_sql, *_triggers_sql(table)]
+]
+
+DROP_TRIGGERS_SQL = [
+    f"DROP FUNCTION IF EXISTS {table}_ledger_summary() CASCADE;"
+    for table in SOURCE_TABLES
+]
+
+
+def rebuild_ledger_summary(conn=connection):
+    """
+    Rebuild the ledger summary of all users from the source tables
+    (market_session_transactions and balance_transfer_out).
+    """
+    columns = ", ".join(SUMMARY_COLUMNS)
+    sources = " UNION ALL ".join(
+        f"SELECT user_id, {totals} FROM {table} GROUP BY user_id"
+        for table, totals in SOURCE_TABLES.items()
+    )
+    with conn.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {SUMMARY_TABLE}")
+        cursor.execute(f"""
+            INSERT INTO {SUMMARY_TABLE} (user_id, {columns}, updated_at)
+            SELECT user_id, {", ".join(f"sum({c})" for c in SUMMARY_COLUMNS)},
+                   now()
+            FROM ({sources}) AS t (user_id, {columns})
+            GROUP BY user_id
+        """)
+
+
+# Market balance columns and the respective values derived from the
+# ledger summary:
+RECONCILED_COLUMNS = {
+    "balance": "s.total_deposit + s.total_payment + s.total_revenue "
+               "+ s.total_transfer_out - s.total_withdraw",
+    "total_deposit": "s.total_deposit",
+    "total_payment": "s.total_payment",
+    "total_revenue": "s.total_revenue",
+    "total_withdraw": "s.total_withdraw",
+}
+
+
+def reconcile_ledger(tolerance=1e-6, conn=connection):
+    """
+    Diff the market balances against the ledger summary (single query).
+
+    :return: list of (user_id, column, market balance value, ledger
+    value) for every column that differs more than `tolerance`
+    """
+    diffs = " UNION ALL ".join(
+        f"SELECT '{column}', coalesce(b.{column}, 0), coalesce({expr}, 0)"
+        for column, expr in RECONCILED_COLUMNS.items()
+    )
+    with conn.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT coalesce(b.user_id, s.user_id), d.*
+            FROM market_balance AS b
+            FULL OUTER JOIN {SUMMARY_TABLE} AS s ON s.user_id = b.user_id
+            CROSS JOIN LATERAL ({diffs}) AS d (column_name, balance, ledger)
+            WHERE abs(d.balance - d.ledger) > %s
+            ORDER BY 1, 2
+        """, [tolerance])
+        return cursor.fetchall()
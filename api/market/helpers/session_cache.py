@@ -0,0 +1,71 @@
+import time
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from ..models.market_session import MarketSession
+
+
+LATEST_SESSION_CACHE_KEY = "market:latest_session"
+# Cached marker for "there are no market sessions":
+NO_SESSION = "no-session"
+
+# Process-local copies ({key: (expiry time, value)}):
+_local_cache = {}
+_local_lock = threading.Lock()
+
+
+def _get_shared_latest_session():
+    value = cache.get(LATEST_SESSION_CACHE_KEY)
+    if value is None:
+        session = MarketSession.objects.order_by('id').last()
+        value = NO_SESSION if session is None else session
+        cache.set(LATEST_SESSION_CACHE_KEY, value,
+                  settings.MARKET_SESSION_CACHE_TTL)
+    return value
+
+
+def get_latest_session(local=False):
+    """
+    Get the latest (current) market session, or None if there are no
+    sessions. The session is read from the shared cache (Django cache
+    framework) and loaded from the DB on cache misses.
+
+    Only for read-only endpoints: invalidation is only guaranteed
+    across processes with a shared cache backend (not the default
+    LocMemCache), so write paths (e.g., bid placement) must validate
+    the session status against the DB.
+
+    :param local: if True, a process-local copy (expiring after
+    `settings.MARKET_SESSION_LOCAL_CACHE_TTL` seconds) is used first.
+    Only for read endpoints, as it is not invalidated across processes.
+    """
+    local_ttl = settings.MARKET_SESSION_LOCAL_CACHE_TTL
+    if local and local_ttl > 0:
+        now = time.monotonic()
+        with _local_lock:
+            expires_at, value = _local_cache.get(LATEST_SESSION_CACHE_KEY,
+                                                 (0, None))
+        if expires_at <= now:
+            value = _get_shared_latest_session()
+            with _local_lock:
+                _local_cache[LATEST_SESSION_CACHE_KEY] = (now + local_ttl,
+                                                          value)
+    else:
+        value = _get_shared_latest_session()
+    return None if value == NO_SESSION else value
+
+
+def invalidate_latest_session():
+    """
+    Invalidate the cached latest session (after the current transaction
+    commits, so other requests can not cache the previous state).
+    """
+    def invalidate():
+        cache.delete(LATEST_SESSION_CACHE_KEY)
+        with _local_lock:
+            _local_cache.pop(LATEST_SESSION_CACHE_KEY, None)
+
+    transaction.on_commit(invalidate)
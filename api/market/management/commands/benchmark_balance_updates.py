@@ -0,0 +1,198 @@
+import time
+import threading
+import statistics
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from users.models import UserResources
+from ...helpers.ledger import LedgerEntry, apply_transactions
+from ...models.market_session import MarketSession, MarketSessionTransactions
+from ...models.market_balance import MarketBalance, MarketSessionBalance
+
+
+def legacy_apply_transaction(entry):
+    """
+    Previous balance update path (read-modify-write of whole rows, no
+    locks), kept for comparison purposes only.
+    """
+    session_balance, _ = MarketSessionBalance.objects.get_or_create(
+        user_id=entry.user_id,
+        resource_id=entry.resource_id,
+        market_session_id=entry.market_session_id
+    )
+    balance, _ = MarketBalance.objects.get_or_create(user_id=entry.user_id)
+    session_balance.session_balance += entry.amount
+    session_balance.session_deposit += entry.amount
+    balance.balance += entry.amount
+    balance.total_deposit += entry.amount
+    MarketSessionTransactions.objects.create(
+        amount=entry.amount,
+        market_session_id=entry.market_session_id,
+        resource_id=entry.resource_id,
+        user_id=entry.user_id,
+        transaction_type=entry.transaction_type,
+    )
+    balance.save()
+    session_balance.save()
+
+
+def atomic_apply_transaction(entry):
+    with transaction.atomic():
+        apply_transactions([entry])
+
+
+class Command(BaseCommand):
+    help = "Concurrency stress benchmark of the market balance updates: " \
+           "many parallel writers register deposits for a small set of " \
+           "users. Reports throughput, latency and lost updates of the " \
+           "previous (read-modify-write) and current (SQL increments) " \
+           "update paths. Benchmark data is deleted afterwards."
+
+    MODES = {
+        "legacy": legacy_apply_transaction,
+        "atomic": atomic_apply_transaction,
+    }
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=16,
+                            help="Nr. of parallel writers (threads, each "
+                                 "with its own DB connection).")
+        parser.add_argument("--iterations", type=int, default=100,
+                            help="Nr. of balance updates per writer.")
+        parser.add_argument("--users", type=int, default=4,
+                            help="Nr. of users whose balances are updated "
+                                 "(fewer users - more contention).")
+        parser.add_argument("--mode", choices=("legacy", "atomic", "both"),
+                            default="both")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("This benchmark requires a PostgreSQL DB.")
+        if min(options["writers"], options["iterations"],
+               options["users"]) < 1:
+            raise CommandError("Nr. of writers / iterations / users must "
+                               "be positive.")
+
+        modes = ["legacy", "atomic"] if options["mode"] == "both" \
+            else [options["mode"]]
+        users, sessions = self.seed(**options)
+        try:
+            for mode in modes:
+                self.reset(users)
+                self.run(mode, users, sessions, **options)
+        finally:
+            MarketSession.objects.filter(id__in=sessions).delete()
+            get_user_model().objects.filter(
+                id__in=[user.id for user, _ in users]
+            ).delete()
+            self.stdout.write("Benchmark data deleted.")
+
+    @staticmethod
+    def seed(writers, iterations, users, **kwargs):
+        """
+        Benchmark users (one resource per writer) and (finished) market
+        sessions, one per iteration, so that every update is a distinct
+        transaction.
+        """
+        user_model = get_user_model()
+        benchmark_users = [
+            user_model.objects.create_user(
+                email=f"benchmark-{i}@balance.updates",
+                password="benchmark",
+                first_name="Benchmark",
+                last_name="Balance",
+            )
+            for i in range(users)
+        ]
+        writer_resources = [
+            UserResources.objects.create(
+                user=benchmark_users[i % users],
+                name=f"benchmark-{i}",
+                type=UserResources.ResourceType.MEASUREMENT,
+            )
+            for i in range(writers)
+        ]
+        sessions = [
+            MarketSession.objects.create(
+                session_number=-(i + 1),
+                status=MarketSession.MarketStatus.FINISHED,
+                market_price=0, b_min=0, b_max=0, n_price_steps=0, delta=0
+            ).id
+            for i in range(iterations)
+        ]
+        return [(x.user, x) for x in writer_resources], sessions
+
+    @staticmethod
+    def reset(users):
+        user_ids = {user.id for user, _ in users}
+        MarketSessionTransactions.objects.filter(user_id__in=user_ids).delete()
+        MarketSessionBalance.objects.filter(user_id__in=user_ids).delete()
+        MarketBalance.objects.filter(user_id__in=user_ids).delete()
+
+    def run(self, mode, users, sessions, writers, **kwargs):
+        apply = self.MODES[mode]
+        latencies = []
+        errors = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(writers)
+
+        def writer(user, resource):
+            writer_latencies = []
+            try:
+                barrier.wait()
+                for session_id in sessions:
+                    entry = LedgerEntry(
+                        user_id=user.id,
+                        market_session_id=session_id,
+                        resource_id=resource.id,
+                        amount=1.0,
+                        transaction_type=MarketSessionTransactions.TransactionType.TRANSFER_IN,
+                    )
+                    start = time.perf_counter()
+                    try:
+                        apply(entry)
+                    except Exception as ex:
+                        with lock:
+                            errors.append(repr(ex))
+                    writer_latencies.append(time.perf_counter() - start)
+            finally:
+                with lock:
+                    latencies.extend(writer_latencies)
+                connection.close()
+
+        threads = [threading.Thread(target=writer, args=users[i])
+                   for i in range(writers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        # Every update deposits 1 - balances must match the nr. of
+        # registered transactions:
+        user_ids = {user.id for user, _ in users}
+        expected = MarketSessionTransactions.objects.filter(
+            user_id__in=user_ids
+        ).count()
+        actual = sum(MarketBalance.objects.filter(
+            user_id__in=user_ids
+        ).values_list("balance", flat=True))
+        latencies_ms = sorted(x * 1000 for x in latencies)
+        p95 = latencies_ms[int(0.95 * (len(latencies_ms) - 1))]
+
+        self.stdout.write(f"\n-- {mode}")
+        self.stdout.write(f"  updates:        {len(latencies_ms)} "
+                          f"({len(errors)} failed)")
+        self.stdout.write(f"  elapsed:        {elapsed:.3f} s "
+                          f"({len(latencies_ms) / elapsed:.1f} updates/s)")
+        self.stdout.write(f"  latency (ms):   "
+                          f"p50={statistics.median(latencies_ms):.3f} "
+                          f"p95={p95:.3f} max={latencies_ms[-1]:.3f}")
+        self.stdout.write(f"  lost updates:   {expected - actual:.0f} "
+                          f"(expected balance {expected}, "
+                          f"actual {actual:.0f})")
+        for error in sorted(set(errors))[:5]:
+            self.stdout.write(f"  error: {error}")
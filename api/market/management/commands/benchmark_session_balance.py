@@ -0,0 +1,125 @@
+import time
+
+import pandas as pd
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from users.models import UserResources
+from ...helpers.balances import sum_balances_per_user
+from ...models.market_session import MarketSession
+from ...models.market_balance import MarketSessionBalance
+from ...serializers.market_balance import MarketSessionBalanceRetrieveSerializer
+
+
+def legacy_sum_balances_per_user(queryset):
+    """
+    Previous aggregation path (DRF serialization + pandas groupby), kept
+    for comparison purposes only.
+    """
+    serializer = MarketSessionBalanceRetrieveSerializer(queryset, many=True)
+    df_ = pd.DataFrame(serializer.data.copy())
+    df_ = df_.groupby(["market_session", "user"]).sum()
+    df_.drop("resource", axis=1, inplace=True)
+    return df_.reset_index().to_dict(orient="records")
+
+
+class Command(BaseCommand):
+    help = "Seed the market_session_balance table (inside a transaction " \
+           "that is rolled back) and compare the sum of session balances " \
+           "per user computed in Python (DRF + pandas) and in the DB."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100_000,
+                            help="Nr. of market_session_balance rows.")
+        parser.add_argument("--users", type=int, default=100,
+                            help="Nr. of users (10 resources per user).")
+        parser.add_argument("--repeat", type=int, default=3,
+                            help="Nr. of timed runs (best is reported).")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("This benchmark requires a PostgreSQL DB.")
+
+        with transaction.atomic():
+            self.run(**options)
+            # Benchmark data is never persisted:
+            transaction.set_rollback(True)
+        self.stdout.write("Benchmark data rolled back.")
+
+    def run(self, rows, users, repeat, **kwargs):
+        self.stdout.write(f"Seeding {rows} market_session_balance rows ...")
+        self.seed(rows, users)
+        queryset = MarketSessionBalance.objects.all()
+
+        timings = {}
+        results = {}
+        for name, aggregate in (("python (DRF + pandas)",
+                                 legacy_sum_balances_per_user),
+                                ("database (values + Sum)",
+                                 sum_balances_per_user)):
+            elapsed = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                results[name] = aggregate(queryset)
+                elapsed.append(time.perf_counter() - start)
+            timings[name] = min(elapsed)
+
+        self.stdout.write("\nSum of session balances per user (best of "
+                          f"{repeat}):")
+        for name, elapsed in timings.items():
+            self.stdout.write(f"  {name:<26} {elapsed * 1000:>10.1f} ms "
+                              f"({len(results[name])} rows)")
+
+    @staticmethod
+    def seed(rows, users):
+        resources_per_user = 10
+        user_model = get_user_model()
+        resource_ids = []
+        for i in range(users):
+            user = user_model.objects.create_user(
+                email=f"benchmark-{i}@session.balance",
+                password="benchmark",
+                first_name="Benchmark",
+                last_name="Balance",
+            )
+            resource_ids += [
+                str(UserResources.objects.create(
+                    user=user,
+                    name=f"benchmark-{j}",
+                    type=UserResources.ResourceType.MEASUREMENT,
+                ).id)
+                for j in range(resources_per_user)
+            ]
+        n_sessions = -(-rows // len(resource_ids))
+        session_ids = [
+            MarketSession.objects.create(
+                session_number=-(i + 1),
+                status=MarketSession.MarketStatus.FINISHED,
+                market_price=0, b_min=0, b_max=0, n_price_steps=0, delta=0
+            ).id
+            for i in range(n_sessions)
+        ]
+
+        with connection.cursor() as cursor:
+            # One balance per session / resource (of each user):
+            cursor.execute(
+                """
+                INSERT INTO market_session_balance (
+                    market_session_id, user_id, resource_id,
+                    session_balance, session_deposit, session_payment,
+                    session_revenue, registered_at
+                )
+                SELECT (%(sessions)s::int[])[1 + i / %(n_resources)s],
+                       r.user_id, r.id,
+                       1000 * random(), 1000 * random(),
+                       -1000 * random(), 1000 * random(), now()
+                FROM generate_series(0, %(rows)s - 1) AS i
+                JOIN user_resources AS r
+                  ON r.id = (%(resources)s::uuid[])[1 + i %% %(n_resources)s]
+                """,
+                {"sessions": session_ids, "resources": resource_ids,
+                 "n_resources": len(resource_ids), "rows": rows}
+            )
+            cursor.execute("ANALYZE market_session_balance")
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from ...helpers.ledger_summary import rebuild_ledger_summary, reconcile_ledger
+
+
+class Command(BaseCommand):
+    help = "Diff the users market balances (market_balance) against the " \
+           "ledger summary derived from the market session transactions " \
+           "and balance transfers out (single set-based query). Fails if " \
+           "any difference is found."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild", action="store_true",
+            help="Rebuild the ledger summary from the source tables first "
+                 "(e.g., if the summary triggers were disabled)."
+        )
+        parser.add_argument(
+            "--tolerance", type=float, default=1e-6,
+            help="Max. absolute difference between balances and ledger "
+                 "totals (floating point rounding)."
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("The ledger summary requires a PostgreSQL DB.")
+
+        with transaction.atomic():
+            if options["rebuild"]:
+                rebuild_ledger_summary()
+                self.stdout.write("Ledger summary rebuilt.")
+            mismatches = reconcile_ledger(tolerance=options["tolerance"])
+
+        for user_id, column, balance, ledger in mismatches:
+            self.stdout.write(f"{user_id} | {column:<15} | "
+                              f"market_balance={balance} | "
+                              f"ledger={ledger} | "
+                              f"diff={balance - ledger}")
+        if mismatches:
+            raise CommandError(f"{len(mismatches)} balance mismatches "
+                               f"found.")
+        self.stdout.write("Market balances match the ledger summary.")
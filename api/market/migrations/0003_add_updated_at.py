@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='marketsession',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AlterField(
+            model_name='marketbalance',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
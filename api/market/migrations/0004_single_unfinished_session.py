@@ -0,0 +1,43 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:13
+
+import structlog
+
+from django.db import migrations, models
+
+
+# init logger:
+logger = structlog.get_logger("api_logger")
+
+
+def finish_duplicate_unfinished_sessions(apps, schema_editor):
+    # The constraint below fails if more than one session is unfinished.
+    # The latest session is the one in use - older unfinished sessions
+    # (left behind by concurrent session creation) are finished:
+    MarketSession = apps.get_model("market", "MarketSession")
+    unfinished = MarketSession.objects.using(
+        schema_editor.connection.alias
+    ).exclude(status="finished").order_by("-id")
+    duplicates = list(unfinished.values_list("id", "status")[1:])
+    if not duplicates:
+        return
+    MarketSession.objects.using(
+        schema_editor.connection.alias
+    ).filter(id__in=[x[0] for x in duplicates]).update(status="finished")
+    logger.warning("Finished duplicate unfinished market sessions.",
+                   sessions=dict(duplicates))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0003_add_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(finish_duplicate_unfinished_sessions,
+                             reverse_code=migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='marketsession',
+            constraint=models.UniqueConstraint(models.Value(True), condition=models.Q(('status', 'finished'), _negated=True), name='market_session_single_unfinished'),
+        ),
+    ]
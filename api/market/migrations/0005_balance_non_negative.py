@@ -0,0 +1,81 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:19
+
+import structlog
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# init logger:
+logger = structlog.get_logger("api_logger")
+
+# (table, constraint, balance column):
+BALANCE_CONSTRAINTS = [
+    ("market_balance", "market_balance_non_negative", "balance"),
+    ("market_session_balance", "market_session_balance_non_negative",
+     "session_balance"),
+]
+
+
+def add_constraint_sql(table, name, column):
+    # NOT VALID - enforced on new writes, without checking existing rows
+    # (which would fail on any negative balance already stored):
+    return f'ALTER TABLE "{table}" ADD CONSTRAINT "{name}" ' \
+           f'CHECK ("{column}" >= 0) NOT VALID;'
+
+
+def drop_constraint_sql(table, name, column):
+    return f'ALTER TABLE "{table}" DROP CONSTRAINT "{name}";'
+
+
+def validate_constraints(apps, schema_editor):
+    # Existing rows are validated if there are no negative balances.
+    # Otherwise, the constraint is kept NOT VALID (and the negative
+    # balances are reported) until the balances are fixed and the
+    # constraint is validated (ALTER TABLE ... VALIDATE CONSTRAINT):
+    with schema_editor.connection.cursor() as cursor:
+        for table, name, column in BALANCE_CONSTRAINTS:
+            cursor.execute(f'SELECT user_id, "{column}" FROM "{table}" '
+                           f'WHERE "{column}" < 0')
+            negative = cursor.fetchall()
+            if negative:
+                logger.warning(
+                    f"Constraint {name} not validated (negative balances).",
+                    table=table,
+                    balances=[(str(u), b) for u, b in negative[:100]],
+                    nr_negative=len(negative)
+                )
+                continue
+            cursor.execute(f'ALTER TABLE "{table}" '
+                           f'VALIDATE CONSTRAINT "{name}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0004_single_unfinished_session'),
+        ('users', '0002_userresources_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunSQL(add_constraint_sql(*args),
+                                  reverse_sql=drop_constraint_sql(*args))
+                for args in BALANCE_CONSTRAINTS
+            ],
+            state_operations=[
+                migrations.AddConstraint(
+                    model_name='marketbalance',
+                    constraint=models.CheckConstraint(check=models.Q(('balance__gte', 0)), name='market_balance_non_negative'),
+                ),
+                migrations.AddConstraint(
+                    model_name='marketsessionbalance',
+                    constraint=models.CheckConstraint(check=models.Q(('session_balance__gte', 0)), name='market_session_balance_non_negative'),
+                ),
+            ],
+        ),
+        migrations.RunPython(validate_constraints,
+                             reverse_code=migrations.RunPython.noop),
+    ]
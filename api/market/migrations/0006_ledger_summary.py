@@ -0,0 +1,174 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Trigger SQL frozen at this migration (the current trigger functions are
+# defined in market.helpers.ledger_summary). Statement level triggers
+# apply the rows inserted / updated / deleted (transition tables) in each
+# source table to the summary table:
+TRANSACTIONS_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION market_session_transactions_ledger_summary()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE market_ledger_summary AS s
+        SET total_deposit = s.total_deposit - d.total_deposit,
+            total_payment = s.total_payment - d.total_payment,
+            total_revenue = s.total_revenue - d.total_revenue,
+            total_transfer_out = s.total_transfer_out - d.total_transfer_out,
+            total_withdraw = s.total_withdraw - d.total_withdraw,
+            n_transactions = s.n_transactions - d.n_transactions,
+            updated_at = now()
+        FROM (SELECT user_id,
+                     coalesce(sum(amount) FILTER (WHERE transaction_type = 'transfer_in'), 0),
+                     coalesce(sum(amount) FILTER (WHERE transaction_type = 'payment'), 0),
+                     coalesce(sum(amount) FILTER (WHERE transaction_type = 'revenue'), 0),
+                     coalesce(sum(amount) FILTER (WHERE transaction_type = 'transfer_out'), 0),
+                     0,
+                     count(*)
+              FROM old_rows GROUP BY user_id)
+             AS d (user_id, total_deposit, total_payment, total_revenue,
+                   total_transfer_out, total_withdraw, n_transactions)
+        WHERE s.user_id = d.user_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO market_ledger_summary AS s
+            (user_id, total_deposit, total_payment, total_revenue,
+             total_transfer_out, total_withdraw, n_transactions, updated_at)
+        SELECT user_id,
+               coalesce(sum(amount) FILTER (WHERE transaction_type = 'transfer_in'), 0),
+               coalesce(sum(amount) FILTER (WHERE transaction_type = 'payment'), 0),
+               coalesce(sum(amount) FILTER (WHERE transaction_type = 'revenue'), 0),
+               coalesce(sum(amount) FILTER (WHERE transaction_type = 'transfer_out'), 0),
+               0,
+               count(*),
+               now()
+        FROM new_rows GROUP BY user_id ORDER BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET total_deposit = s.total_deposit + EXCLUDED.total_deposit,
+            total_payment = s.total_payment + EXCLUDED.total_payment,
+            total_revenue = s.total_revenue + EXCLUDED.total_revenue,
+            total_transfer_out = s.total_transfer_out + EXCLUDED.total_transfer_out,
+            total_withdraw = s.total_withdraw + EXCLUDED.total_withdraw,
+            n_transactions = s.n_transactions + EXCLUDED.n_transactions,
+            updated_at = EXCLUDED.updated_at;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# All transfers out count as withdrawn (replaced in 0008, that only
+# counts the applied ones):
+TRANSFER_OUT_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION balance_transfer_out_ledger_summary()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE market_ledger_summary AS s
+        SET total_withdraw = s.total_withdraw - d.total_withdraw,
+            updated_at = now()
+        FROM (SELECT user_id, coalesce(sum(amount), 0)
+              FROM old_rows GROUP BY user_id) AS d (user_id, total_withdraw)
+        WHERE s.user_id = d.user_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO market_ledger_summary AS s
+            (user_id, total_deposit, total_payment, total_revenue,
+             total_transfer_out, total_withdraw, n_transactions, updated_at)
+        SELECT user_id, 0, 0, 0, 0, coalesce(sum(amount), 0), 0, now()
+        FROM new_rows GROUP BY user_id ORDER BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET total_withdraw = s.total_withdraw + EXCLUDED.total_withdraw,
+            updated_at = EXCLUDED.updated_at;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS_SQL = [
+    f"""
+    CREATE TRIGGER {table}_ledger_summary_{op.lower()}
+    AFTER {op} ON {table}
+    REFERENCING {transition_tables}
+    FOR EACH STATEMENT
+    EXECUTE PROCEDURE {table}_ledger_summary();
+    """
+    for table in ["market_session_transactions", "balance_transfer_out"]
+    for op, transition_tables in [
+        ("INSERT", "NEW TABLE AS new_rows"),
+        ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+        ("DELETE", "OLD TABLE AS old_rows"),
+    ]
+]
+
+DROP_TRIGGERS_SQL = [
+    "DROP FUNCTION IF EXISTS market_session_transactions_ledger_summary() "
+    "CASCADE;",
+    "DROP FUNCTION IF EXISTS balance_transfer_out_ledger_summary() CASCADE;",
+]
+
+# Summary of the transactions registered before this migration:
+BUILD_SUMMARY_SQL = [
+    "DELETE FROM market_ledger_summary;",
+    """
+    INSERT INTO market_ledger_summary
+        (user_id, total_deposit, total_payment, total_revenue,
+         total_transfer_out, total_withdraw, n_transactions, updated_at)
+    SELECT user_id, sum(total_deposit), sum(total_payment),
+           sum(total_revenue), sum(total_transfer_out), sum(total_withdraw),
+           sum(n_transactions), now()
+    FROM (
+        SELECT user_id,
+               coalesce(sum(amount) FILTER (WHERE transaction_type = 'transfer_in'), 0),
+               coalesce(sum(amount) FILTER (WHERE transaction_type = 'payment'), 0),
+               coalesce(sum(amount) FILTER (WHERE transaction_type = 'revenue'), 0),
+               coalesce(sum(amount) FILTER (WHERE transaction_type = 'transfer_out'), 0),
+               0,
+               count(*)
+        FROM market_session_transactions GROUP BY user_id
+        UNION ALL
+        SELECT user_id, 0, 0, 0, 0, coalesce(sum(amount), 0), 0
+        FROM balance_transfer_out GROUP BY user_id
+    ) AS t (user_id, total_deposit, total_payment, total_revenue,
+            total_transfer_out, total_withdraw, n_transactions)
+    GROUP BY user_id;
+    """,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0005_balance_non_negative'),
+        ('users', '0002_userresources_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarketLedgerSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_deposit', models.FloatField(default=0.0)),
+                ('total_payment', models.FloatField(default=0.0)),
+                ('total_revenue', models.FloatField(default=0.0)),
+                ('total_transfer_out', models.FloatField(default=0.0)),
+                ('total_withdraw', models.FloatField(default=0.0)),
+                ('n_transactions', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'market_ledger_summary',
+            },
+        ),
+        migrations.RunSQL(
+            [TRANSACTIONS_FUNCTION_SQL, TRANSFER_OUT_FUNCTION_SQL,
+             *TRIGGERS_SQL],
+            reverse_sql=DROP_TRIGGERS_SQL
+        ),
+        migrations.RunSQL(BUILD_SUMMARY_SQL,
+                          reverse_sql=migrations.RunSQL.noop),
+    ]
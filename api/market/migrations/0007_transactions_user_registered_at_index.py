@@ -0,0 +1,20 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0006_ledger_summary'),
+        ('users', '0002_userresources_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='marketsessiontransactions',
+            index=models.Index(fields=['user', 'registered_at'], name='transactions_user_reg_idx'),
+        ),
+    ]
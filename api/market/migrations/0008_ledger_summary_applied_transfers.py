@@ -0,0 +1,57 @@
+from django.db import migrations
+
+# Trigger SQL frozen at this migration (see 0006). Only applied (is_solid)
+# transfers out count as withdrawn - pending ones are counted when updated
+# (UPDATE trigger):
+TRANSFER_OUT_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION balance_transfer_out_ledger_summary()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE market_ledger_summary AS s
+        SET total_withdraw = s.total_withdraw - d.total_withdraw,
+            updated_at = now()
+        FROM (SELECT user_id,
+                     coalesce(sum(amount) FILTER (WHERE is_solid), 0)
+              FROM old_rows GROUP BY user_id) AS d (user_id, total_withdraw)
+        WHERE s.user_id = d.user_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO market_ledger_summary AS s
+            (user_id, total_deposit, total_payment, total_revenue,
+             total_transfer_out, total_withdraw, n_transactions, updated_at)
+        SELECT user_id, 0, 0, 0, 0,
+               coalesce(sum(amount) FILTER (WHERE is_solid), 0), 0, now()
+        FROM new_rows GROUP BY user_id ORDER BY user_id
+        ON CONFLICT (user_id) DO UPDATE
+        SET total_withdraw = s.total_withdraw + EXCLUDED.total_withdraw,
+            updated_at = EXCLUDED.updated_at;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+# Pending transfers out were counted as withdrawn (only column derived
+# from balance_transfer_out):
+REBUILD_WITHDRAW_SQL = """
+UPDATE market_ledger_summary AS s
+SET total_withdraw = coalesce((SELECT sum(t.amount)
+                               FROM balance_transfer_out AS t
+                               WHERE t.user_id = s.user_id AND t.is_solid), 0),
+    updated_at = now();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('market', '0007_transactions_user_registered_at_index'),
+    ]
+
+    operations = [
+        migrations.RunSQL(TRANSFER_OUT_FUNCTION_SQL,
+                          reverse_sql=migrations.RunSQL.noop),
+        migrations.RunSQL(REBUILD_WITHDRAW_SQL,
+                          reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -10,4 +10,5 @@ from .market_balance import (
     MarketBalance,
     MarketSessionBalance,
     BalanceTransferOut,
+    MarketLedgerSummary,
 )
@@ -19,7 +19,7 @@ class MarketBalance(models.Model):
     # User sum of revenues in market:
     total_revenue = models.FloatField(default=0.0, null=False)
     # Field last update date:
-    updated_at = models.DateTimeField(auto_now_add=True, blank=True,
+    updated_at = models.DateTimeField(auto_now=True, blank=True,
                                       null=False)
 
     def __str__(self):
@@ -27,6 +27,12 @@ class MarketBalance(models.Model):
 
     class Meta:
         db_table = "market_balance"
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(balance__gte=0),
+                name="market_balance_non_negative",
+            ),
+        ]
 
 
 class MarketSessionBalance(models.Model):
@@ -84,6 +90,12 @@ class MarketSessionBalance(models.Model):
         # each user should only have 1 balance for each market session
         unique_together = ("market_session", "user", "resource")
         db_table = "market_session_balance"
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(session_balance__gte=0),
+                name="market_session_balance_non_negative",
+            ),
+        ]
 
 
 class BalanceTransferOut(models.Model):
@@ -129,3 +141,33 @@ class BalanceTransferOut(models.Model):
     class Meta:
         # Each transfer will have its own Tangle message ID
         db_table = "balance_transfer_out"
+
+
+class MarketLedgerSummary(models.Model):
+    # Per user totals derived from the 'market_session_transactions' and
+    # 'balance_transfer_out' tables. Maintained by DB triggers (see
+    # market.helpers.ledger_summary), thus read-only for the application.
+    user = models.OneToOneField("users.User",
+                                on_delete=models.CASCADE,
+                                primary_key=True)
+    # Sum of 'transfer_in' transactions:
+    total_deposit = models.FloatField(default=0.0, null=False)
+    # Sum of 'payment' transactions:
+    total_payment = models.FloatField(default=0.0, null=False)
+    # Sum of 'revenue' transactions:
+    total_revenue = models.FloatField(default=0.0, null=False)
+    # Sum of 'transfer_out' transactions:
+    total_transfer_out = models.FloatField(default=0.0, null=False)
+    # Sum of balance transfers out (withdraws):
+    total_withdraw = models.FloatField(default=0.0, null=False)
+    # Nr. of market session transactions:
+    n_transactions = models.IntegerField(default=0, null=False)
+    # Field last update date:
+    updated_at = models.DateTimeField(auto_now=True, blank=True,
+                                      null=False)
+
+    def __str__(self):
+        return f'{self.user}'
+
+    class Meta:
+        db_table = "market_ledger_summary"
@@ -80,10 +80,25 @@ class MarketSession(models.Model):
         null=False,
         blank=False,
     )
+    # Datetime of the last update
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        blank=True,
+        null=False,
+    )
 
     class Meta:
         unique_together = ("session_number", "session_date")
         db_table = "market_session"
+        constraints = [
+            # There can only be 1 unfinished session at each time
+            # (partial unique index over a constant expression):
+            models.UniqueConstraint(
+                models.Value(True),
+                condition=~models.Q(status="finished"),
+                name="market_session_single_unfinished",
+            ),
+        ]
 
     def __str__(self):
         return f'#{self.pk}: {self.status}'
@@ -150,6 +165,12 @@ class MarketSessionTransactions(models.Model):
         # each user will have once transaction of each type for each session
         unique_together = ("market_session", "user", "resource", "transaction_type")
         db_table = "market_session_transactions"
+        indexes = [
+            # User transaction history (GET /transactions, ordered and
+            # paginated by registered_at):
+            models.Index(fields=["user", "registered_at"],
+                         name="transactions_user_reg_idx"),
+        ]
 
 
 class MarketSessionFee(models.Model):
@@ -73,6 +73,51 @@ def market_session_transactions_query_params():
                           type=openapi.TYPE_INTEGER,
                           required=False,
                           description="Filter by market session identifier"),
+        openapi.Parameter("transaction_type", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=False,
+                          enum=["payment", "revenue",
+                                "transfer_in", "transfer_out"],
+                          description="Filter by transaction type"),
+        openapi.Parameter("start_date", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=False,
+                          description="Filter transactions registered "
+                                      "after this datetime "
+                                      "[`'%Y-%m-%dT%H:%M:%SZ'`]. "
+                                      "Example: 2021-01-01T00:00:00Z"),
+        openapi.Parameter("end_date", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=False,
+                          description="Filter transactions registered "
+                                      "before this datetime "
+                                      "[`'%Y-%m-%dT%H:%M:%SZ'`]. "
+                                      "Example: 2021-01-01T10:00:00Z"),
+        openapi.Parameter("stream", openapi.IN_QUERY,
+                          type=openapi.TYPE_BOOLEAN,
+                          required=False,
+                          description="If true, the response rows are "
+                                      "streamed in chunks (same response "
+                                      "format), for large downloads. "
+                                      "Can not be combined with "
+                                      "pagination. Defaults to false."),
+        openapi.Parameter("page_size", openapi.IN_QUERY,
+                          type=openapi.TYPE_INTEGER,
+                          required=False,
+                          description="Enables keyset pagination, with "
+                                      "this number of records per page. "
+                                      "Paginated responses return "
+                                      "`{'next': <cursor>, 'page_size': "
+                                      "<int>, 'results': [...]}`. "
+                                      "Responses without pagination are "
+                                      "limited to "
+                                      "PAGINATION_MAX_UNPAGINATED_ROWS "
+                                      "rows (400 if exceeded)."),
+        openapi.Parameter("cursor", openapi.IN_QUERY,
+                          type=openapi.TYPE_STRING,
+                          required=False,
+                          description="Pagination cursor (the 'next' "
+                                      "field of the previous page)."),
     ]
 
 
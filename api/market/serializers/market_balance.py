@@ -1,14 +1,23 @@
-from django.db.utils import IntegrityError
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from rest_framework import serializers
 
+from users.models import UserResources
 from .. import exceptions as market_exceptions
-from ..models.market_session import MarketSessionTransactions
+from ..helpers.ledger import LedgerEntry, apply_transactions
+from ..models.market_session import MarketSession, MarketSessionTransactions
 from ..models.market_balance import (
     MarketBalance,
     MarketSessionBalance,
     BalanceTransferOut
 )
 
+TransactionType = MarketSessionTransactions.TransactionType
+
 
 class MarketBalanceSerializer(serializers.ModelSerializer):
     class Meta:
@@ -43,28 +52,32 @@ class BalanceTransferOutSerializer(serializers.ModelSerializer):
     def update(self, instance, validated_data):
         user_id = instance.user_id
         transfer_amount = instance.amount
+        # The balance is debited once, when the transfer is applied
+        # (is_solid - also the state counted in the ledger summary):
+        validated_data["is_solid"] = True
+        if instance.is_solid:
+            return super().update(instance, validated_data)
 
-        # Check if user already has a market balance entry:
-        balance_data = MarketBalance.objects.get(user=user_id)
-        # Update current balance:
-        current_balance = balance_data.balance
-        new_balance = current_balance - transfer_amount
-        # Update withdraw field:
-        current_withdraw = balance_data.total_withdraw
-        new_total_withdraw = current_withdraw + transfer_amount
-        # Final balance cant be lower than zero.
-        if new_balance < 0:
-            raise market_exceptions.BalanceLowerThanZero(
-                init_balance=current_balance,
-                withdraw=transfer_amount,
-                new_balance=new_balance
+        with transaction.atomic():
+            # Update balance / withdraw totals (single UPDATE, only if the
+            # final balance is not lower than zero):
+            updated = MarketBalance.objects.filter(
+                user=user_id,
+                balance__gte=transfer_amount
+            ).update(
+                balance=F("balance") - transfer_amount,
+                total_withdraw=F("total_withdraw") + transfer_amount,
+                updated_at=timezone.now()
             )
-        else:
-            # Update column values:
-            balance_data.balance = new_balance
-            balance_data.total_withdraw = new_total_withdraw
-            # Save balance update:
-            balance_data.save()
+            if not updated:
+                current_balance = MarketBalance.objects.get(
+                    user=user_id
+                ).balance
+                raise market_exceptions.BalanceLowerThanZero(
+                    init_balance=current_balance,
+                    withdraw=transfer_amount,
+                    new_balance=current_balance - transfer_amount
+                )
             return super().update(instance, validated_data)
 
 
@@ -76,9 +89,27 @@ class MarketSessionBalanceRetrieveSerializer(serializers.ModelSerializer):
                   'registered_at']
 
 
-class MarketSessionBalanceCreateSerializer(serializers.Serializer):
+def validate_amount_signal(transaction_type, amount):
+    # -- Validate amount signal (according to transaction_type):
+    # 'transfer_in' / 'revenue' -> positive signal  (money in)
+    # 'transfer_out' or 'payment' -> negative signal (money out)
+    negative_tt = [MarketSessionTransactions.TransactionType.PAYMENT,
+                   MarketSessionTransactions.TransactionType.TRANSFER_OUT]
+    positive_tt = [MarketSessionTransactions.TransactionType.REVENUE,
+                   MarketSessionTransactions.TransactionType.TRANSFER_IN]
+    if (transaction_type in negative_tt) and (amount > 0):
+        raise market_exceptions.TransactionBadOperatorSignal(
+            transaction_type=transaction_type,
+            amount=amount
+        )
+    elif (transaction_type in positive_tt) and (amount < 0):
+        raise market_exceptions.TransactionBadOperatorSignal(
+            transaction_type=transaction_type,
+            amount=amount)
+
+
+class MarketSessionBalanceItemSerializer(serializers.Serializer):
     user = serializers.UUIDField(required=True)
-    market_session = serializers.IntegerField(required=True)
     resource = serializers.UUIDField(required=True)
     transaction_type = serializers.ChoiceField(
         required=True,
@@ -86,112 +117,108 @@ class MarketSessionBalanceCreateSerializer(serializers.Serializer):
     )
     amount = serializers.FloatField(required=True)
 
-    def update(self, instance, validated_data):
-        pass
-
     def validate(self, attrs):
-        """
-        Check if market session is open
-        :param attrs:
-        :return:
-        """
-        transaction_type = attrs["transaction_type"]
-        amount = attrs["amount"]
-
-        # -- Validate amount signal (according to transaction_type):
-        # 'transfer_in' / 'revenue' -> positive signal  (money in)
-        # 'transfer_out' or 'payment' -> negative signal (money out)
-        negative_tt = [MarketSessionTransactions.TransactionType.PAYMENT,
-                       MarketSessionTransactions.TransactionType.TRANSFER_OUT]
-        positive_tt = [MarketSessionTransactions.TransactionType.REVENUE,
-                       MarketSessionTransactions.TransactionType.TRANSFER_IN]
-        if (transaction_type in negative_tt) and (amount > 0):
-            raise market_exceptions.TransactionBadOperatorSignal(
-                transaction_type=transaction_type,
-                amount=amount
-            )
-        elif (transaction_type in positive_tt) and (amount < 0):
-            raise market_exceptions.TransactionBadOperatorSignal(
-                transaction_type=transaction_type,
-                amount=amount)
-
+        validate_amount_signal(transaction_type=attrs["transaction_type"],
+                               amount=attrs["amount"])
         return attrs
 
+
+class MarketSessionBalanceCreateSerializer(MarketSessionBalanceItemSerializer):
+    market_session = serializers.IntegerField(required=True)
+
+    def update(self, instance, validated_data):
+        pass
+
     def create(self, validated_data):
         user_id = validated_data["user"]
-        market_session_id = validated_data['market_session']
-        resource_id = validated_data["resource"]
-        amount = validated_data['amount']
-        transaction_type = validated_data['transaction_type']
-
-        try:
-            # Check if user already has a session balance entry:
-            session_balance_data = MarketSessionBalance.objects.get(
+        # Balances are updated with SQL increments (no lost updates under
+        # concurrent requests):
+        with transaction.atomic():
+            apply_transactions([LedgerEntry(
                 user_id=user_id,
-                resource_id=resource_id,
-                market_session_id=market_session_id
+                market_session_id=validated_data['market_session'],
+                resource_id=validated_data["resource"],
+                amount=validated_data['amount'],
+                transaction_type=validated_data['transaction_type'],
+            )])
+
+        return f"Updated session balance for the user ID ({user_id}). "
+
+
+class MarketSessionSettlementSerializer(serializers.Serializer):
+    """
+    Settles a market session: applies the full vector of payments /
+    revenues (per user and resource) with a fixed number of bulk
+    statements, in a single transaction.
+    """
+    market_session = serializers.IntegerField(required=True)
+    transactions = serializers.ListField(
+        child=MarketSessionBalanceItemSerializer(),
+        allow_empty=False,
+        max_length=settings.MARKET_BULK_MAX_SIZE,
+    )
+
+    def update(self, instance, validated_data):
+        pass
+
+    def validate_transactions(self, transactions):
+        keys = [(x["user"], x["resource"], x["transaction_type"])
+                for x in transactions]
+        if len(set(keys)) != len(keys):
+            raise serializers.ValidationError(
+                "Duplicated transaction (user, resource, transaction_type)."
             )
-        except MarketSessionBalance.DoesNotExist:
-            # If not, create new entry:
-            session_balance_data = MarketSessionBalance.objects.create(
-                user_id=user_id,
-                resource_id=resource_id,
+        return transactions
+
+    def validate(self, attrs):
+        market_session_id = attrs["market_session"]
+        if not MarketSession.objects.filter(id=market_session_id).exists():
+            raise market_exceptions.NoMarketSession(
                 market_session_id=market_session_id
             )
-            session_balance_data.save()
-
-        try:
-            # Check if user already has a market balance entry:
-            balance_data = MarketBalance.objects.get(user_id=user_id)
-        except MarketBalance.DoesNotExist:
-            # If not, create new entry:
-            balance_data = MarketBalance.objects.create(user_id=user_id)
-            balance_data.save()
-
-        # -- Update current session balance:
-        session_balance_data.session_balance += amount
-
-        # -- Update user's market balances:
-        # Balance = topups - payment + revenue - withdrawals:
-        balance_data.balance += amount
-
-        if transaction_type == MarketSessionTransactions.TransactionType.TRANSFER_IN:
-            session_balance_data.session_deposit += amount
-            balance_data.total_deposit += amount
-
-        # If its revenue, update total revenues:
-        elif transaction_type == MarketSessionTransactions.TransactionType.REVENUE:
-            balance_data.total_revenue += amount
-            session_balance_data.session_revenue += amount
-
-        # If its payment, update total revenues:
-        elif transaction_type == MarketSessionTransactions.TransactionType.PAYMENT:
-            balance_data.total_payment += amount
-            session_balance_data.session_payment += amount
-
-        if (balance_data.balance < 0) or (session_balance_data.session_balance < 0):
-            raise ValueError("The user final balance cant be inferior to 0.")
-
-        # -- Create a transaction of type - transfer:
-        try:
-            transaction_data = MarketSessionTransactions.objects.create(
-                amount=amount,
-                market_session_id=market_session_id,
-                resource_id=resource_id,
-                user_id=user_id,
-                transaction_type=transaction_type,
-            )
-        except IntegrityError:
-            raise market_exceptions.DuplicatedTransactionFound(
-                user_id=user_id,
-                resource_id=resource_id,
-                market_session_id=market_session_id,
-                transaction_type=transaction_type
-            )
 
-        # Save to DB:
-        balance_data.save()
-        session_balance_data.save()
-        transaction_data.save()
+        # Check if resources belong to the respective users:
+        resources = dict(UserResources.objects.filter(
+            id__in={x["resource"] for x in attrs["transactions"]}
+        ).values_list("id", "user_id"))
+        for x in attrs["transactions"]:
+            if resources.get(x["resource"]) != x["user"]:
+                raise market_exceptions.UserResourceNotRegistered(
+                    user=x["user"],
+                    resource_id=x["resource"],
+                )
+        return attrs
 
-        return f"Updated session balance for the user ID ({user_id}). "
+    def create(self, validated_data):
+        market_session_id = validated_data["market_session"]
+        transactions = validated_data["transactions"]
+
+        with transaction.atomic():
+            balances = apply_transactions([
+                LedgerEntry(
+                    user_id=x["user"],
+                    market_session_id=market_session_id,
+                    resource_id=x["resource"],
+                    amount=x["amount"],
+                    transaction_type=x["transaction_type"],
+                )
+                for x in transactions
+            ])
+
+        # Aggregated results (per user):
+        users = defaultdict(lambda: defaultdict(float))
+        for x in transactions:
+            users[str(x["user"])][x["transaction_type"]] += x["amount"]
+        return {
+            "market_session": market_session_id,
+            "n_transactions": len(transactions),
+            "users": [
+                {
+                    "user": user_id,
+                    "payment": amounts[TransactionType.PAYMENT],
+                    "revenue": amounts[TransactionType.REVENUE],
+                    "balance": balances[user_id],
+                }
+                for user_id, amounts in users.items()
+            ]
+        }
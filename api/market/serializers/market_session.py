@@ -1,3 +1,5 @@
+from django.db import transaction
+from django.db.utils import IntegrityError
 from rest_framework import serializers
 
 from .. import exceptions as market_exceptions
@@ -51,14 +53,11 @@ class MarketSessionSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         request = self.context.get('request')
         if request.method == 'POST':
-            market_address = MarketWalletAddress.objects.all()
-            if len(market_address) == 0:
+            if not MarketWalletAddress.objects.exists():
                 raise market_exceptions.NoMarketAddress()
 
-            all_sessions = self.Meta.model.objects.all()
-            for market_session in all_sessions:
-                if market_session.status != MarketSession.MarketStatus.FINISHED:
-                    raise market_exceptions.UnfinishedSessions()
+            if self.unfinished_sessions().exists():
+                raise market_exceptions.UnfinishedSessions()
         elif request.method == "PATCH":
             if request.data["status"] == "open":
                 session_id = self.context.get('session_id')
@@ -67,12 +66,40 @@ class MarketSessionSerializer(serializers.ModelSerializer):
                 open_sessions = self.Meta.model.objects \
                     .filter(status="open") \
                     .exclude(id=session_id)
-                if len(open_sessions) > 0:
+                if open_sessions.exists():
                     raise market_exceptions.MoreThanOneSessionOpen(
                         session_id=session_id
                     )
         return attrs
 
+    def unfinished_sessions(self):
+        return self.Meta.model.objects.exclude(
+            status=MarketSession.MarketStatus.FINISHED
+        )
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            # Concurrent session creation (unique index on the
+            # unfinished sessions):
+            if self.unfinished_sessions().exists():
+                raise market_exceptions.UnfinishedSessions()
+            raise
+
+    def update(self, instance, validated_data):
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            # Re-opening a finished session while other is unfinished:
+            if self.unfinished_sessions().exclude(id=instance.id).exists():
+                raise market_exceptions.UnfinishedSessionsOnUpdate(
+                    session_id=instance.id
+                )
+            raise
+
 
 class MarketSessionTransactionsSerializer(serializers.ModelSerializer):
     class Meta:
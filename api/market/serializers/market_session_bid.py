@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
 from django.db.utils import IntegrityError
 from rest_framework import serializers
@@ -18,6 +19,7 @@ from ..models.market_session_bid import (
     MarketSessionBidPayment,
 )
 from ..models.market_wallet import MarketWalletAddress
+from ..helpers.ledger import LedgerEntry, apply_transactions
 
 
 class MarketSessionBidRetrieveSerializer(serializers.ModelSerializer):
@@ -34,11 +36,39 @@ class MarketSessionBidRetrieveSerializer(serializers.ModelSerializer):
         return obj.payment.tangle_msg_id if hasattr(obj, 'payment') and obj.payment else None
 
 
-class MarketSessionBidCreateSerializer(serializers.Serializer):
-    market_session = serializers.IntegerField(
-        required=True,
-        allow_null=False,
-    )
+def get_bid_session(market_session_id):
+    """
+    Market session targeted by bids (must be open). The session status
+    is always read from the DB (never from the session cache, whose
+    copies may be stale in other worker processes after a status
+    update).
+    """
+    market_session = MarketSession.objects.filter(
+        id=market_session_id
+    ).first()
+    if market_session is None:
+        raise market_exceptions.NoMarketSession(
+            market_session_id=market_session_id
+        )
+
+    # Session status must be OPEN to accept bids:
+    if market_session.status != MarketSession.MarketStatus.OPEN:
+        raise market_exceptions.SessionNotOpenForBids(
+            market_session_id=market_session_id
+        )
+    return market_session
+
+
+def validate_bid_resource(resource_data):
+    if resource_data.type != UserResources.ResourceType.MEASUREMENT:
+        # It is only possible to place bids for measurements resources
+        raise market_exceptions.InvalidResourceBid()
+
+    if not resource_data.to_forecast:
+        raise market_exceptions.NoForecastResourceBid()
+
+
+class MarketSessionBidItemSerializer(serializers.Serializer):
     resource = serializers.UUIDField(
         required=True,
         allow_null=False,
@@ -59,6 +89,13 @@ class MarketSessionBidCreateSerializer(serializers.Serializer):
         allow_blank=False
     )
 
+
+class MarketSessionBidCreateSerializer(MarketSessionBidItemSerializer):
+    market_session = serializers.IntegerField(
+        required=True,
+        allow_null=False,
+    )
+
     def update(self, instance, validated_data):
         pass
 
@@ -91,28 +128,11 @@ class MarketSessionBidCreateSerializer(serializers.Serializer):
                 resource_id=resource_id,
             )
 
-        if resource_data.type != UserResources.ResourceType.MEASUREMENT:
-            # It is only possible to place bids for measurements resources
-            raise market_exceptions.InvalidResourceBid()
+        validate_bid_resource(resource_data)
 
-        if not resource_data.to_forecast:
-            raise market_exceptions.NoForecastResourceBid()
-
-        try:
-            # Get market session data:
-            market_session = MarketSession.objects.get(id=market_session_id)
-            attrs["session_number"] = market_session.session_number
-            attrs["session_date"] = market_session.session_date
-        except MarketSession.DoesNotExist:
-            raise market_exceptions.NoMarketSession(
-                market_session_id=market_session_id
-            )
-
-        # Session status must be OPEN to accept bids:
-        if market_session.status != MarketSession.MarketStatus.OPEN:
-            raise market_exceptions.SessionNotOpenForBids(
-                market_session_id=market_session_id
-            )
+        market_session = get_bid_session(market_session_id)
+        attrs["session_number"] = market_session.session_number
+        attrs["session_date"] = market_session.session_date
 
         # Check if a bid for this user_id/market_session_id/resource_id
         # already exists:
@@ -166,6 +186,123 @@ class MarketSessionBidCreateSerializer(serializers.Serializer):
         }
 
 
+class MarketSessionBidBulkCreateSerializer(serializers.Serializer):
+    """
+    Places bids for several resources (same market session) at once.
+    Bids are validated with a constant number of queries (independent
+    of the number of bids) and registered in a single transaction.
+    """
+    market_session = serializers.IntegerField(
+        required=True,
+        allow_null=False,
+    )
+    bids = serializers.ListField(
+        child=MarketSessionBidItemSerializer(),
+        allow_empty=False,
+        max_length=settings.MARKET_BULK_MAX_SIZE,
+    )
+
+    def update(self, instance, validated_data):
+        pass
+
+    def validate_bids(self, bids):
+        resource_ids = [bid["resource"] for bid in bids]
+        if len(set(resource_ids)) != len(resource_ids):
+            raise serializers.ValidationError(
+                "Each resource can only have one bid per request."
+            )
+        return bids
+
+    def validate(self, attrs):
+        request = self.context.get('request')
+        user = request.user
+        market_session_id = attrs["market_session"]
+        resource_ids = [bid["resource"] for bid in attrs["bids"]]
+
+        # Check if user has registered wallet address:
+        if not UserWalletAddress.objects.filter(user_id=user.id).exists():
+            raise market_exceptions.UserWalletAddressNotFound(user=user)
+
+        # Check if all resources belong to user:
+        resources = UserResources.objects.in_bulk(
+            resource_ids,
+            field_name="id"
+        )
+        for resource_id in resource_ids:
+            resource_data = resources.get(resource_id)
+            if (resource_data is None) or (resource_data.user_id != user.id):
+                raise market_exceptions.UserResourceNotRegistered(
+                    user=user,
+                    resource_id=resource_id,
+                )
+            validate_bid_resource(resource_data)
+
+        market_session = get_bid_session(market_session_id)
+        attrs["session_number"] = market_session.session_number
+        attrs["session_date"] = market_session.session_date
+
+        # Check if any of the bids already exists:
+        existing_bid = MarketSessionBid.objects.filter(
+            user_id=user.id,
+            market_session_id=market_session_id,
+            resource_id__in=resource_ids,
+        ).values_list("resource_id", flat=True).first()
+        if existing_bid is not None:
+            raise market_exceptions.BidAlreadyExists(
+                market_session_id=market_session_id,
+                resource_id=existing_bid
+            )
+
+        return attrs
+
+    def create(self, validated_data):
+        user_id = self.context.get('request').user.id
+        market_session_id = validated_data["market_session"]
+
+        bids = [
+            MarketSessionBid(
+                user_id=user_id,
+                market_session_id=market_session_id,
+                resource_id=bid["resource"],
+                bid_price=bid["bid_price"],
+                max_payment=bid["max_payment"],
+                gain_func=bid["gain_func"],
+            )
+            for bid in validated_data["bids"]
+        ]
+        try:
+            with transaction.atomic():
+                MarketSessionBid.objects.bulk_create(bids)
+        except IntegrityError:
+            # Concurrent request placed (some of) these bids:
+            existing_bid = MarketSessionBid.objects.filter(
+                user_id=user_id,
+                market_session_id=market_session_id,
+                resource_id__in=[x.resource_id for x in bids],
+            ).values_list("resource_id", flat=True).first()
+            raise market_exceptions.BidAlreadyExists(
+                market_session_id=market_session_id,
+                resource_id=existing_bid
+            )
+
+        # Get Market Wallet Address:
+        market_wallet = MarketWalletAddress.objects.get()
+
+        return [
+            {
+                "id": bid.id,
+                "user": user_id,
+                "market_session": market_session_id,
+                "resource": bid.resource_id,
+                "bid_price": bid.bid_price,
+                "gain_func": bid.gain_func,
+                "max_payment": bid.max_payment,
+                "market_wallet_address": market_wallet.wallet_address
+            }
+            for bid in bids
+        ]
+
+
 class MarketSessionBidUpdateSerializer(serializers.Serializer):
     tangle_msg_id = serializers.CharField(
         required=True,
@@ -292,9 +429,10 @@ class MarketValidateSessionBidSerializer(serializers.Serializer):
         balance_serializer.is_valid(raise_exception=True)
 
         # Save changes:
-        balance_serializer.save()
-        transaction_data.save()
-        bid_data.save()
+        with transaction.atomic():
+            balance_serializer.save()
+            transaction_data.save()
+            bid_data.save()
 
         return {
             "market_bid": bid_data.id,
@@ -303,3 +441,82 @@ class MarketValidateSessionBidSerializer(serializers.Serializer):
             "user_wallet_address": wallet_address,
             "confirmed": bid_data.confirmed,
         }
+
+
+class MarketValidateSessionBidBulkSerializer(serializers.Serializer):
+    """
+    Validates the payments of several bids at once (e.g., all bids of a
+    session, at gate closure). Either all payments are validated or none.
+    """
+    tangle_msg_ids = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=settings.MARKET_BULK_MAX_SIZE,
+    )
+
+    def update(self, instance, validated_data):
+        pass
+
+    def validate_tangle_msg_ids(self, tangle_msg_ids):
+        if len(set(tangle_msg_ids)) != len(tangle_msg_ids):
+            raise serializers.ValidationError(
+                "Duplicated tangle message IDs."
+            )
+        return tangle_msg_ids
+
+    def validate(self, attrs):
+        tangle_msg_ids = attrs["tangle_msg_ids"]
+        # -- Query payments and the respective bids (single join):
+        payments = MarketSessionBidPayment.objects.select_related(
+            "market_bid"
+        ).in_bulk(tangle_msg_ids, field_name="tangle_msg_id")
+
+        for tangle_msg_id in tangle_msg_ids:
+            if tangle_msg_id not in payments:
+                raise market_exceptions.BidPaymentNotFound(
+                    tangle_msg_id=tangle_msg_id
+                )
+            # -- Check if bid was already confirmed (in IOTA Tangle):
+            if payments[tangle_msg_id].market_bid.confirmed:
+                raise market_exceptions.TransactionAlreadyValid(
+                    tangle_msg_id=tangle_msg_id
+                )
+
+        attrs["payments"] = [payments[x] for x in tangle_msg_ids]
+        return attrs
+
+    def create(self, validated_data):
+        wallet_address = MarketWalletAddress.objects.first().wallet_address
+        payments = validated_data["payments"]
+        bids = [x.market_bid for x in payments]
+        transaction_type = MarketSessionTransactions.TransactionType.TRANSFER_IN
+
+        with transaction.atomic():
+            # Update market session and market balances:
+            apply_transactions([
+                LedgerEntry(
+                    user_id=bid.user_id,
+                    market_session_id=bid.market_session_id,
+                    resource_id=bid.resource_id,
+                    amount=bid.max_payment,
+                    transaction_type=transaction_type,
+                )
+                for bid in bids
+            ])
+            MarketSessionBid.objects.filter(
+                id__in=[bid.id for bid in bids]
+            ).update(confirmed=True)
+            MarketSessionBidPayment.objects.filter(
+                market_bid_id__in=[bid.id for bid in bids]
+            ).update(is_solid=True)
+
+        return [
+            {
+                "market_bid": bid.id,
+                "market_session": bid.market_session_id,
+                "tangle_msg_id": payment.tangle_msg_id,
+                "user_wallet_address": wallet_address,
+                "confirmed": True,
+            }
+            for payment, bid in zip(payments, bids)
+        ]
@@ -0,0 +1,143 @@
+# flake8: noqa
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+
+from ...helpers.ledger_summary import rebuild_ledger_summary, reconcile_ledger
+from ...models import (
+    MarketSession,
+    MarketBalance,
+    MarketLedgerSummary,
+    MarketSessionTransactions,
+    BalanceTransferOut,
+)
+from ...serializers.market_balance import (
+    MarketSessionBalanceCreateSerializer,
+    BalanceTransferOutSerializer,
+)
+from ..common import create_market_session_data
+from ..pipelines import create_users_and_resources
+
+
+class TestMarketLedgerSummary(TransactionTestCase):
+    """
+    Tests for the (trigger maintained) MarketLedgerSummary and the ledger
+    reconciliation.
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.users = create_users_and_resources(nr_users=1,
+                                                nr_resources_per_user=2)
+        self.user = self.users[0]["user"]
+        self.resources = self.users[0]["resources"]
+        self.market_session = MarketSession.objects.create(
+            status="running",
+            **create_market_session_data()
+        )
+
+    def register_transaction(self, resource, transaction_type, amount):
+        serializer = MarketSessionBalanceCreateSerializer(data={
+            "user": str(self.user.id),
+            "market_session": self.market_session.id,
+            "resource": str(resource.id),
+            "transaction_type": transaction_type,
+            "amount": amount,
+        })
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+    def register_transactions(self):
+        self.register_transaction(self.resources[0], "transfer_in", 1000)
+        self.register_transaction(self.resources[1], "transfer_in", 500)
+        self.register_transaction(self.resources[0], "payment", -300)
+        self.register_transaction(self.resources[1], "revenue", 200)
+
+    def test_summary_maintained_on_insert(self):
+        self.register_transactions()
+        summary = MarketLedgerSummary.objects.get(user=self.user)
+        self.assertEqual(summary.total_deposit, 1500)
+        self.assertEqual(summary.total_payment, -300)
+        self.assertEqual(summary.total_revenue, 200)
+        self.assertEqual(summary.total_withdraw, 0)
+        self.assertEqual(summary.n_transactions, 4)
+
+    def test_summary_maintained_on_update_and_delete(self):
+        self.register_transactions()
+        MarketSessionTransactions.objects.filter(
+            transaction_type="revenue"
+        ).update(amount=250)
+        MarketSessionTransactions.objects.filter(
+            transaction_type="payment"
+        ).delete()
+        BalanceTransferOut.objects.create(user=self.user, amount=100,
+                                          user_wallet_address="addr",
+                                          tangle_msg_id="msg",
+                                          is_solid=True)
+        summary = MarketLedgerSummary.objects.get(user=self.user)
+        self.assertEqual(summary.total_payment, 0)
+        self.assertEqual(summary.total_revenue, 250)
+        self.assertEqual(summary.total_withdraw, 100)
+        self.assertEqual(summary.n_transactions, 3)
+
+    def test_rebuild_summary(self):
+        self.register_transactions()
+        MarketLedgerSummary.objects.all().delete()
+        rebuild_ledger_summary()
+        summary = MarketLedgerSummary.objects.get(user=self.user)
+        self.assertEqual(summary.total_deposit, 1500)
+        self.assertEqual(summary.n_transactions, 4)
+
+    def test_reconcile_ledger(self):
+        self.register_transactions()
+        self.assertEqual(reconcile_ledger(), [])
+        call_command("reconcile_ledger")
+
+        # Balance changed outside the ledger:
+        MarketBalance.objects.filter(user=self.user).update(balance=1)
+        mismatches = reconcile_ledger()
+        self.assertEqual(len(mismatches), 1)
+        user_id, column, balance, ledger = mismatches[0]
+        self.assertEqual(user_id, self.user.id)
+        self.assertEqual(column, "balance")
+        self.assertEqual(balance, 1)
+        self.assertEqual(ledger, 1400)
+        with self.assertRaises(CommandError):
+            call_command("reconcile_ledger")
+
+    def test_pending_transfer_out(self):
+        self.register_transactions()
+        serializer = BalanceTransferOutSerializer(data={
+            "user": str(self.user.id),
+            "amount": 100,
+            "user_wallet_address": "addr",
+            "tangle_msg_id": "msg",
+        })
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        # Pending transfer (balance not debited yet) is not a mismatch:
+        summary = MarketLedgerSummary.objects.get(user=self.user)
+        self.assertEqual(summary.total_withdraw, 0)
+        self.assertEqual(reconcile_ledger(), [])
+
+        # Transfer applied (balance debited):
+        transfer_out = BalanceTransferOut.objects.get(user=self.user)
+        serializer = BalanceTransferOutSerializer(
+            transfer_out, data={"is_solid": True}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.update(transfer_out, serializer.validated_data)
+        summary.refresh_from_db()
+        self.assertEqual(summary.total_withdraw, 100)
+        balance = MarketBalance.objects.get(user=self.user)
+        self.assertEqual(balance.balance, 1300)
+        self.assertEqual(balance.total_withdraw, 100)
+        self.assertEqual(reconcile_ledger(), [])
+
+        # Repeated updates do not debit the balance twice:
+        serializer.update(transfer_out, serializer.validated_data)
+        self.assertEqual(MarketBalance.objects.get(user=self.user).balance,
+                         1300)
+        self.assertEqual(reconcile_ledger(), [])
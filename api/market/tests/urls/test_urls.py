@@ -9,11 +9,14 @@ from ...views.market_session import (
 )
 from ...views.market_session_bid import (
     MarketSessionBidView,
-    MarketValidateSessionBidView
+    MarketSessionBidBulkView,
+    MarketValidateSessionBidView,
+    MarketValidateSessionBidBulkView
 )
 from ...views.market_balance import (
     MarketBalanceView,
     MarketSessionBalanceView,
+    MarketSessionSettlementView,
     BalanceTransferOutView
 )
 from ...views.market_wallet import MarketWalletAddressView
@@ -32,9 +35,15 @@ class TestUrls(TestCase):
         url = reverse('market:market-session-bid')
         self.assertEqual(resolve(url).func.view_class, MarketSessionBidView)
 
+        url = reverse('market:market-session-bid-bulk')
+        self.assertEqual(resolve(url).func.view_class, MarketSessionBidBulkView)
+
         url = reverse('market:market-validate-session-bid')
         self.assertEqual(resolve(url).func.view_class, MarketValidateSessionBidView)
 
+        url = reverse('market:market-validate-session-bid-bulk')
+        self.assertEqual(resolve(url).func.view_class, MarketValidateSessionBidBulkView)
+
         url = reverse('market:market-session-price-weight')
         self.assertEqual(resolve(url).func.view_class, MarketPriceWeightView)
 
@@ -47,6 +56,9 @@ class TestUrls(TestCase):
         url = reverse('market:market-session-balance')
         self.assertEqual(resolve(url).func.view_class, MarketSessionBalanceView)
 
+        url = reverse('market:market-session-settlement')
+        self.assertEqual(resolve(url).func.view_class, MarketSessionSettlementView)
+
         url = reverse('market:market-session-fee')
         self.assertEqual(resolve(url).func.view_class, MarketSessionFeeView)
 
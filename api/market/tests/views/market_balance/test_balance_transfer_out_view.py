@@ -0,0 +1,46 @@
+# flake8: noqa
+
+from django.urls import reverse
+from rest_framework import status
+from django.test import TransactionTestCase
+from rest_framework.test import APIClient
+
+from ....models import BalanceTransferOut
+from ...common import create_and_login_superuser
+from ...pipelines import create_users_and_resources
+
+
+class TestBalanceTransferOutView(TransactionTestCase):
+    """
+    Tests for BalanceTransferOutView class.
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.client = APIClient()
+        self.base_url = reverse("market:transfer-out-request")
+        self.super_user = create_and_login_superuser(self.client)
+        self.users = create_users_and_resources(nr_users=1,
+                                                nr_resources_per_user=1)
+        self.user = self.users[0]["user"]
+
+    def create_transfer_out(self, is_solid=False):
+        return BalanceTransferOut.objects.create(
+            user=self.user,
+            amount=1000,
+            user_wallet_address="wallet-address",
+            tangle_msg_id="tangle-msg-id",
+            is_solid=is_solid,
+        )
+
+    def test_list_transfer_out(self):
+        self.create_transfer_out()
+        self.create_transfer_out(is_solid=True)
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["data"]), 2)
+
+        response = self.client.get(self.base_url, {"is_solid": True})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["data"]), 1)
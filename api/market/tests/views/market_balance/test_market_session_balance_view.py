@@ -0,0 +1,151 @@
+# flake8: noqa
+
+from django.db import transaction, IntegrityError
+from django.urls import reverse
+from rest_framework import status
+from django.test import TransactionTestCase
+from rest_framework.test import APIClient
+
+from users.models.user_resources import UserResources
+
+from ....models import (
+    MarketSession,
+    MarketBalance,
+    MarketSessionBalance,
+    MarketSessionTransactions
+)
+from ...common import (
+    create_and_login_superuser,
+    login_user,
+    create_market_session_data,
+)
+from ...pipelines import create_users_and_resources
+from ..response_templates import conflict_error_response
+
+
+class TestMarketSessionBalanceView(TransactionTestCase):
+    """
+    Tests for MarketSessionBalanceView class (balance updates).
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.client = APIClient()
+        self.base_url = reverse("market:market-session-balance")
+        self.super_user = create_and_login_superuser(self.client)
+        self.users = create_users_and_resources(nr_users=1,
+                                                nr_resources_per_user=1)
+        self.user = self.users[0]["user"]
+        self.resource = self.users[0]["resources"][0]
+        self.market_session = MarketSession.objects.create(
+            status="running",
+            **create_market_session_data()
+        )
+
+    def balance_data(self, transaction_type, amount):
+        return {
+            "user": str(self.user.id),
+            "market_session": self.market_session.id,
+            "resource": str(self.resource.id),
+            "transaction_type": transaction_type,
+            "amount": amount,
+        }
+
+    def test_update_balances(self):
+        login_user(client=self.client, user=self.super_user)
+        response = self.client.post(
+            self.base_url,
+            data=self.balance_data("transfer_in", 1000),
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(
+            self.base_url,
+            data=self.balance_data("payment", -400),
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        balance = MarketBalance.objects.get(user=self.user)
+        self.assertEqual(balance.balance, 600)
+        self.assertEqual(balance.total_deposit, 1000)
+        self.assertEqual(balance.total_payment, -400)
+        session_balance = MarketSessionBalance.objects.get(user=self.user)
+        self.assertEqual(session_balance.session_balance, 600)
+        self.assertEqual(session_balance.session_deposit, 1000)
+        self.assertEqual(session_balance.session_payment, -400)
+        self.assertEqual(MarketSessionTransactions.objects.count(), 2)
+
+    def test_update_balances_lower_than_zero(self):
+        login_user(client=self.client, user=self.super_user)
+        self.client.post(self.base_url,
+                         data=self.balance_data("transfer_in", 1000),
+                         format="json")
+        response = self.client.post(
+            self.base_url,
+            data=self.balance_data("payment", -1500),
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        expected_response = conflict_error_response(
+            message="Balance update rejected. The final balance of "
+                    "(at least) one user would be lower than zero."
+        )
+        self.assertEqual(response.json(), expected_response)
+        # Nothing changed:
+        self.assertEqual(MarketBalance.objects.get(user=self.user).balance,
+                         1000)
+        self.assertEqual(MarketSessionTransactions.objects.count(), 1)
+
+    def test_duplicated_transaction(self):
+        login_user(client=self.client, user=self.super_user)
+        data = self.balance_data("transfer_in", 1000)
+        self.client.post(self.base_url, data=data, format="json")
+        response = self.client.post(self.base_url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(MarketBalance.objects.get(user=self.user).balance,
+                         1000)
+
+    def test_list_balances_per_user(self):
+        resource_2 = UserResources.objects.create(
+            user=self.user, name="resource-2", type="measurements"
+        )
+        for resource, deposit in ((self.resource, 1000), (resource_2, 500)):
+            MarketSessionBalance.objects.create(
+                user=self.user,
+                resource=resource,
+                market_session=self.market_session,
+                session_balance=deposit - 100,
+                session_deposit=deposit,
+                session_payment=-100,
+            )
+        login_user(client=self.client, user=self.user)
+
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["data"]), 2)
+
+        response = self.client.get(self.base_url,
+                                   {"balance_by_resource": "false"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual(len(response_data), 1)
+        self.assertEqual(response_data[0]["market_session"], 1)
+        self.assertEqual(response_data[0]["user"], str(self.user.id))
+        self.assertEqual(response_data[0]["session_deposit"], 1500)
+        self.assertEqual(response_data[0]["session_balance"], 1300)
+        self.assertEqual(response_data[0]["session_payment"], -200)
+        self.assertEqual(response_data[0]["session_revenue"], 0)
+        self.assertNotIn("resource", response_data[0])
+
+    def test_non_negative_balance_constraint(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            MarketBalance.objects.create(user=self.user, balance=-1)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            MarketSessionBalance.objects.create(
+                user=self.user,
+                resource=self.resource,
+                market_session=self.market_session,
+                session_balance=-1,
+            )
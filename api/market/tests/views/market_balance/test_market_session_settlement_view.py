@@ -0,0 +1,183 @@
+# flake8: noqa
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from ....models import (
+    MarketSession,
+    MarketBalance,
+    MarketSessionBalance,
+    MarketSessionTransactions
+)
+from ...common import (
+    create_and_login_superuser,
+    login_user,
+    create_market_session_data,
+)
+from ...pipelines import create_users_and_resources
+from ..response_templates import conflict_error_response
+
+
+class TestMarketSessionSettlementView(TransactionTestCase):
+    """
+    Tests for MarketSessionSettlementView class.
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.client = APIClient()
+        self.base_url = reverse("market:market-session-settlement")
+        self.super_user = create_and_login_superuser(self.client)
+        self.users = create_users_and_resources(nr_users=2,
+                                                nr_resources_per_user=2)
+        self.market_session = MarketSession.objects.create(
+            status="running",
+            **create_market_session_data()
+        )
+        # Buyer (user 0) deposits, to be able to pay:
+        buyer = self.users[0]
+        for resource in buyer["resources"]:
+            MarketSessionBalance.objects.create(
+                user=buyer["user"],
+                resource=resource,
+                market_session=self.market_session,
+                session_balance=1000,
+                session_deposit=1000,
+            )
+        MarketBalance.objects.create(user=buyer["user"],
+                                     balance=2000,
+                                     total_deposit=2000)
+
+    def settlement_data(self, payment=-400, revenue=300):
+        buyer, seller = self.users
+        transactions = []
+        for resource in buyer["resources"]:
+            transactions.append({
+                "user": str(buyer["user"].id),
+                "resource": str(resource.id),
+                "transaction_type": "payment",
+                "amount": payment,
+            })
+        for resource in seller["resources"]:
+            transactions.append({
+                "user": str(seller["user"].id),
+                "resource": str(resource.id),
+                "transaction_type": "revenue",
+                "amount": revenue,
+            })
+        return {
+            "market_session": self.market_session.id,
+            "transactions": transactions
+        }
+
+    def test_normal_user_settlement(self):
+        login_user(client=self.client, user=self.users[0]["user"])
+        response = self.client.post(self.base_url,
+                                    data=self.settlement_data(),
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_settlement(self):
+        buyer, seller = self.users
+        login_user(client=self.client, user=self.super_user)
+        response = self.client.post(self.base_url,
+                                    data=self.settlement_data(),
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual(response_data["market_session"], 1)
+        self.assertEqual(response_data["n_transactions"], 4)
+        users_data = {x["user"]: x for x in response_data["users"]}
+        self.assertEqual(users_data[str(buyer["user"].id)],
+                         {"user": str(buyer["user"].id), "payment": -800,
+                          "revenue": 0, "balance": 1200})
+        self.assertEqual(users_data[str(seller["user"].id)],
+                         {"user": str(seller["user"].id), "payment": 0,
+                          "revenue": 600, "balance": 600})
+
+        buyer_balance = MarketBalance.objects.get(user=buyer["user"])
+        self.assertEqual(buyer_balance.balance, 1200)
+        self.assertEqual(buyer_balance.total_payment, -800)
+        seller_balance = MarketBalance.objects.get(user=seller["user"])
+        self.assertEqual(seller_balance.balance, 600)
+        self.assertEqual(seller_balance.total_revenue, 600)
+        for resource in buyer["resources"]:
+            session_balance = MarketSessionBalance.objects.get(
+                user=buyer["user"], resource=resource
+            )
+            self.assertEqual(session_balance.session_balance, 600)
+            self.assertEqual(session_balance.session_payment, -400)
+        for resource in seller["resources"]:
+            session_balance = MarketSessionBalance.objects.get(
+                user=seller["user"], resource=resource
+            )
+            self.assertEqual(session_balance.session_balance, 300)
+            self.assertEqual(session_balance.session_revenue, 300)
+        self.assertEqual(MarketSessionTransactions.objects.count(), 4)
+
+    def test_settlement_constant_nr_queries(self):
+        login_user(client=self.client, user=self.super_user)
+        data = self.settlement_data()
+        data_1 = {**data, "transactions": data["transactions"][:1]}
+        data_n = {**data, "transactions": data["transactions"][1:]}
+        with CaptureQueriesContext(connection) as ctx_1:
+            self.client.post(self.base_url, data=data_1, format="json")
+        with CaptureQueriesContext(connection) as ctx_n:
+            response = self.client.post(self.base_url, data=data_n,
+                                        format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx_1.captured_queries),
+                         len(ctx_n.captured_queries))
+
+    def test_settlement_bad_operator_signal(self):
+        login_user(client=self.client, user=self.super_user)
+        response = self.client.post(self.base_url,
+                                    data=self.settlement_data(payment=400),
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertFalse(MarketSessionTransactions.objects.exists())
+
+    def test_settlement_duplicated_transaction(self):
+        login_user(client=self.client, user=self.super_user)
+        response = self.client.post(self.base_url,
+                                    data=self.settlement_data(),
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(self.base_url,
+                                    data=self.settlement_data(),
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        # Balances are only updated once:
+        buyer_balance = MarketBalance.objects.get(user=self.users[0]["user"])
+        self.assertEqual(buyer_balance.balance, 1200)
+        self.assertEqual(MarketSessionTransactions.objects.count(), 4)
+
+    def test_settlement_resource_of_other_user(self):
+        login_user(client=self.client, user=self.super_user)
+        data = self.settlement_data()
+        other_resource = self.users[1]["resources"][0]
+        data["transactions"][0]["resource"] = str(other_resource.id)
+        response = self.client.post(self.base_url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        expected_response = conflict_error_response(
+            message=f"Resource ID {other_resource.id} is not registered "
+                    f"to user '{self.users[0]['user'].id}'."
+        )
+        self.assertEqual(response.json(), expected_response)
+        self.assertFalse(MarketSessionTransactions.objects.exists())
+
+    def test_settlement_no_market_session(self):
+        login_user(client=self.client, user=self.super_user)
+        data = self.settlement_data()
+        data["market_session"] = 2
+        response = self.client.post(self.base_url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        expected_response = conflict_error_response(
+            message="Market session 2 does not exist."
+        )
+        self.assertEqual(response.json(), expected_response)
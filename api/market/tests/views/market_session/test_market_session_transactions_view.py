@@ -1,8 +1,10 @@
 # flake8: noqa
 
+import json
+
 from django.urls import reverse
 from rest_framework import status
-from django.test import TransactionTestCase
+from django.test import TransactionTestCase, override_settings
 from rest_framework.test import APIClient
 
 from ....models import MarketSession, MarketSessionTransactions
@@ -191,3 +193,109 @@ class TestMarketSessionTransactionsViewView(TransactionTestCase):
 
         response_data = response.json()["data"]
         self.assertEqual(len(response_data), 2)
+
+    def create_user_transactions(self, user, nr_sessions):
+        resource = UserResources.objects.create(**{
+            "user_id": user.id,
+            "name": "resource-1",
+            "type": "measurements",
+            "to_forecast": True
+        })
+        for i in range(nr_sessions):
+            session = self.market_session if i == 0 else \
+                MarketSession.objects.create(
+                    status="finished",
+                    **create_market_session_data(session_number=i + 1)
+                )
+            for transaction_type in ("transfer_in", "payment"):
+                MarketSessionTransactions.objects.create(
+                    amount=1000 if transaction_type == "transfer_in" else -10,
+                    market_session_id=session.id,
+                    resource_id=resource.id,
+                    user_id=user.id,
+                    transaction_type=transaction_type
+                )
+
+    def test_list_session_transactions_keyset_pagination(self):
+        user = create_user()
+        login_user(client=self.client, user=user)
+        self.create_user_transactions(user=user, nr_sessions=3)
+
+        params = {"page_size": 4}
+        transactions = []
+        for _ in range(2):
+            response = self.client.get(self.base_url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            page = response.json()["data"]
+            self.assertEqual(page["page_size"], 4)
+            transactions += page["results"]
+            params["cursor"] = page["next"]
+        self.assertIsNone(page["next"])
+        self.assertEqual(len(transactions), 6)
+        registered_at = [x["registered_at"] for x in transactions]
+        self.assertEqual(registered_at, sorted(registered_at))
+        self.assertEqual(transactions[0]["resource_name"], "resource-1")
+
+        response = self.client.get(self.base_url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_session_transactions_filters(self):
+        user = create_user()
+        login_user(client=self.client, user=user)
+        self.create_user_transactions(user=user, nr_sessions=2)
+
+        response = self.client.get(self.base_url,
+                                   {"transaction_type": "payment"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual(len(response_data), 2)
+        self.assertTrue(all(x["transaction_type"] == "payment"
+                            for x in response_data))
+
+        response = self.client.get(self.base_url,
+                                   {"start_date": "2000-01-01T00:00:00Z",
+                                    "end_date": "2000-01-02T00:00:00Z"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"], [])
+
+        response = self.client.get(self.base_url,
+                                   {"transaction_type": "not-a-type"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.base_url,
+                                   {"start_date": "2000-01-01"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_session_transactions_stream(self):
+        user = create_user()
+        login_user(client=self.client, user=user)
+        self.create_user_transactions(user=user, nr_sessions=2)
+        response = self.client.get(self.base_url)
+        expected_data = response.json()["data"]
+
+        response = self.client.get(self.base_url, {"stream": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        body = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(body, {"code": 200, "data": expected_data})
+        self.assertEqual(len(body["data"]), 4)
+
+    @override_settings(PAGINATION_MAX_UNPAGINATED_ROWS=3)
+    def test_list_session_transactions_unpaginated_limit(self):
+        user = create_user()
+        login_user(client=self.client, user=user)
+        self.create_user_transactions(user=user, nr_sessions=2)
+        response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        # Narrower filters, pagination or streaming:
+        response = self.client.get(self.base_url,
+                                   {"transaction_type": "payment"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.json()["data"]), 2)
+        response = self.client.get(self.base_url, {"page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.json()["data"]["next"])
+        response = self.client.get(self.base_url, {"stream": "true"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(body["data"]), 4)
@@ -1,8 +1,11 @@
 # flake8: noqa
 
+from django.db import connection, transaction, IntegrityError
 from django.urls import reverse
 from rest_framework import status
-from django.test import TransactionTestCase
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from ....models import MarketSession, MarketWalletAddress
@@ -277,8 +280,9 @@ class TestMarketSessionView(TransactionTestCase):
         sess1 = create_market_session_data(session_number=1)
         sess2 = create_market_session_data(session_number=2)
         sess3 = create_market_session_data(session_number=3)
-        MarketSession.objects.create(**sess1)
-        MarketSession.objects.create(**sess2)
+        # Only 1 unfinished session can exist at each time:
+        MarketSession.objects.create(status="finished", **sess1)
+        MarketSession.objects.create(status="finished", **sess2)
         MarketSession.objects.create(**sess3)
         user = create_user()
         login_user(client=self.client, user=user)
@@ -290,6 +294,33 @@ class TestMarketSessionView(TransactionTestCase):
         self.assertEqual(len(response_data), 1)
         self.assertEqual(response_data[0]["id"], 3)
 
+    def test_single_unfinished_session_constraint(self):
+        MarketSession.objects.create(**self.session_data)
+        data = create_market_session_data(session_number=2)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            MarketSession.objects.create(status="open", **data)
+        MarketSession.objects.update(status="finished")
+        MarketSession.objects.create(status="open", **data)
+        self.assertEqual(MarketSession.objects.count(), 2)
+
+    def test_reopen_session_with_unfinished_session(self):
+        MarketSession.objects.create(status="finished", **self.session_data)
+        data = create_market_session_data(session_number=2)
+        MarketSession.objects.create(**data)
+        session_id = MarketSession.objects.get(status="finished").id
+        login_user(client=self.client, user=self.super_user)
+        response = self.client.patch(self.base_url + f"/{session_id}",
+                                     data={"status": "staged"})
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        response_data = response.json()
+        expected_response = conflict_error_response(
+            message=f"Unable to update session '{session_id}'. "
+                    f"There are still unfinished sessions."
+        )
+        self.assertEqual(response_data, expected_response)
+        self.assertEqual(MarketSession.objects.get(id=session_id).status,
+                         "finished")
+
     def test_list_latest_session_bad_query_params(self):
         user = create_user()
         login_user(client=self.client, user=user)
@@ -334,3 +365,61 @@ class TestMarketSessionView(TransactionTestCase):
 
             db_entries = MarketSession.objects.all()
             self.assertEqual(len(db_entries), session_number + 1)
+
+    def test_list_latest_session_conditional_get(self):
+        MarketSession.objects.create(**self.session_data)
+        user = create_user()
+        login_user(client=self.client, user=user)
+
+        response = self.client.get(self.base_url, {"latest_only": True})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        # Unchanged session - 304 (no body):
+        response = self.client.get(self.base_url, {"latest_only": True},
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+        # Session updated - new representation:
+        login_user(client=self.client, user=self.super_user)
+        session_id = MarketSession.objects.get().id
+        self.client.patch(self.base_url + f"/{session_id}",
+                          data={"status": "open"})
+        login_user(client=self.client, user=user)
+        response = self.client.get(self.base_url, {"latest_only": True},
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["data"][0]["status"], "open")
+
+    @override_settings(
+        CACHES={"default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache"
+        }},
+        MARKET_SESSION_LOCAL_CACHE_TTL=0
+    )
+    def test_list_latest_session_cached(self):
+        cache.clear()
+        login_user(client=self.client, user=self.super_user)
+        response = self.client.post(self.base_url,
+                                    data=self.session_data,
+                                    format="json")
+        session_id = response.json()["data"]["id"]
+        response = self.client.get(self.base_url, {"latest_only": True})
+        self.assertEqual(response.json()["data"][0]["status"], "staged")
+
+        # Session is read from cache:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.base_url, {"latest_only": True})
+        self.assertEqual(response.json()["data"][0]["id"], session_id)
+        self.assertFalse(any('"market_session"' in q["sql"]
+                             for q in ctx.captured_queries))
+
+        # Cache is invalidated on status updates:
+        self.client.patch(self.base_url + f"/{session_id}",
+                          data={"status": "open"})
+        response = self.client.get(self.base_url, {"latest_only": True})
+        self.assertEqual(response.json()["data"][0]["status"], "open")
@@ -0,0 +1,177 @@
+# flake8: noqa
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from ....models import (
+    MarketSession,
+    MarketSessionBid,
+)
+from ...common import (
+    create_and_login_superuser,
+    login_user,
+    create_market_wallet_address,
+    create_market_session_data,
+    create_market_bid_data,
+    drop_dict_field
+)
+from ...pipelines import create_users_and_resources
+from ..response_templates import conflict_error_response
+
+
+def create_bulk_bid_data(resources, market_session=1):
+    return {
+        "market_session": market_session,
+        "bids": [drop_dict_field(
+            drop_dict_field(create_market_bid_data(resource=str(x.id)),
+                            "market_session"),
+            "tangle_msg_id"
+        ) for x in resources]
+    }
+
+
+class TestMarketSessionBidBulkView(TransactionTestCase):
+    """
+    Tests for MarketSessionBidBulkView class.
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.client = APIClient()
+        self.base_url = reverse("market:market-session-bid-bulk")
+        self.super_user = create_and_login_superuser(self.client)
+        self.wallet_address = create_market_wallet_address()
+        self.session_data = create_market_session_data()
+        self.users = create_users_and_resources(nr_users=2,
+                                                nr_resources_per_user=4)
+
+    def test_create_bids_no_auth(self):
+        self.client.credentials(HTTP_AUTHORIZATION="")
+        response = self.client.post(self.base_url, data={}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_create_bids(self):
+        user = self.users[0]["user"]
+        resources = self.users[0]["resources"]
+        login_user(client=self.client, user=user)
+        MarketSession.objects.create(status="open", **self.session_data)
+
+        data = create_bulk_bid_data(resources=resources)
+        response = self.client.post(self.base_url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual(len(response_data), len(resources))
+        self.assertEqual([x["resource"] for x in response_data],
+                         [str(x.id) for x in resources])
+        self.assertEqual(response_data[0]["market_wallet_address"],
+                         self.wallet_address.wallet_address)
+
+        bids = MarketSessionBid.objects.filter(user_id=user.id)
+        self.assertEqual(bids.count(), len(resources))
+        self.assertTrue(all(x.market_session_id == 1 for x in bids))
+
+    def test_create_bids_constant_nr_queries(self):
+        user = self.users[0]["user"]
+        resources = self.users[0]["resources"]
+        login_user(client=self.client, user=user)
+        session_1 = MarketSession.objects.create(status="open",
+                                                 **self.session_data)
+
+        data = create_bulk_bid_data(resources=resources[:1])
+        with CaptureQueriesContext(connection) as ctx_1:
+            response = self.client.post(self.base_url, data=data,
+                                        format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        session_1.status = "finished"
+        session_1.save()
+        MarketSession.objects.create(
+            status="open", **create_market_session_data(session_number=2)
+        )
+        data = create_bulk_bid_data(resources=resources, market_session=2)
+        with CaptureQueriesContext(connection) as ctx_n:
+            response = self.client.post(self.base_url, data=data,
+                                        format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx_1.captured_queries),
+                         len(ctx_n.captured_queries))
+
+    def test_create_bids_duplicated_resource(self):
+        user = self.users[0]["user"]
+        resource = self.users[0]["resources"][0]
+        login_user(client=self.client, user=user)
+        MarketSession.objects.create(status="open", **self.session_data)
+
+        data = create_bulk_bid_data(resources=[resource, resource])
+        response = self.client.post(self.base_url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(MarketSessionBid.objects.exists())
+
+    def test_create_bids_empty(self):
+        user = self.users[0]["user"]
+        login_user(client=self.client, user=user)
+        MarketSession.objects.create(status="open", **self.session_data)
+
+        data = create_bulk_bid_data(resources=[])
+        response = self.client.post(self.base_url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_bids_other_user_resource(self):
+        user = self.users[0]["user"]
+        other_resource = self.users[1]["resources"][0]
+        login_user(client=self.client, user=user)
+        MarketSession.objects.create(status="open", **self.session_data)
+
+        resources = [self.users[0]["resources"][0], other_resource]
+        data = create_bulk_bid_data(resources=resources)
+        response = self.client.post(self.base_url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        expected_response = conflict_error_response(
+            message=f"Resource ID {other_resource.id} is not registered "
+                    f"to user '{user}'."
+        )
+        self.assertEqual(response.json(), expected_response)
+        # No bids are placed:
+        self.assertFalse(MarketSessionBid.objects.exists())
+
+    def test_create_bids_already_placed(self):
+        user = self.users[0]["user"]
+        resources = self.users[0]["resources"]
+        login_user(client=self.client, user=user)
+        MarketSession.objects.create(status="open", **self.session_data)
+
+        data = create_bulk_bid_data(resources=resources[1:2])
+        response = self.client.post(self.base_url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = create_bulk_bid_data(resources=resources)
+        response = self.client.post(self.base_url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        expected_response = conflict_error_response(
+            message=f"The user already has a placed bid for session ID 1 "
+                    f"and resource ID {resources[1].id}."
+        )
+        self.assertEqual(response.json(), expected_response)
+        self.assertEqual(MarketSessionBid.objects.count(), 1)
+
+    def test_create_bids_on_staged_session(self):
+        user = self.users[0]["user"]
+        resources = self.users[0]["resources"]
+        login_user(client=self.client, user=user)
+        market_session = MarketSession.objects.create(
+            status="staged",
+            **self.session_data
+        )
+
+        data = create_bulk_bid_data(resources=resources)
+        response = self.client.post(self.base_url, data=data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        expected_response = conflict_error_response(
+            message=f'Market session {market_session.id} is not open for bids.'
+        )
+        self.assertEqual(response.json(), expected_response)
@@ -2,9 +2,10 @@
 
 import uuid
 
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
-from django.test import TransactionTestCase
+from django.test import TransactionTestCase, override_settings
 from rest_framework.test import APIClient
 
 from ....models import (
@@ -21,6 +22,7 @@ from ...common import (
     drop_dict_field
 )
 from ...pipelines import create_users_and_resources
+from ....helpers.session_cache import get_latest_session
 from ..response_templates import missing_field_response
 from ..response_templates import conflict_error_response
 
@@ -505,3 +507,35 @@ class TestMarketSessionBidView(TransactionTestCase):
         )
         self.assertEqual(response_data, expected_response)
 
+
+    @override_settings(CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }, MARKET_SESSION_CACHE_TTL=60)
+    def test_create_bid_on_session_closed_by_other_worker(self):
+        user = self.users[0]["user"]
+        resource = self.users[0]["resources"][0]
+        login_user(client=self.client, user=user)
+        bid_data = create_market_bid_data(resource=resource.id)
+        market_session = MarketSession.objects.create(
+            status="open",
+            **self.session_data
+        )
+        # Open session cached by this worker:
+        self.assertEqual(get_latest_session().status, "open")
+        # Session closed by another worker (no local cache invalidation):
+        MarketSession.objects.filter(id=market_session.id).update(
+            status="closed"
+        )
+        self.assertEqual(get_latest_session().status, "open")
+
+        response = self.client.post(self.base_url,
+                                    data=bid_data,
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        expected_response = conflict_error_response(
+            message=f'Market session {market_session.id} is not open for bids.'
+        )
+        self.assertEqual(response.json(), expected_response)
+        cache.clear()
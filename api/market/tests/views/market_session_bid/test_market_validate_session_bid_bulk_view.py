@@ -0,0 +1,167 @@
+# flake8: noqa
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from ....models import (
+    MarketSession,
+    MarketSessionBid,
+    MarketSessionBidPayment,
+    MarketBalance,
+    MarketSessionBalance,
+    MarketSessionTransactions
+)
+from ...common import (
+    create_and_login_superuser,
+    login_user,
+    create_market_wallet_address,
+    create_market_session_data,
+)
+from ...pipelines import create_users_and_resources
+from ..response_templates import conflict_error_response
+
+
+class TestMarketValidateSessionBidBulkView(TransactionTestCase):
+    """
+    Tests for MarketValidateSessionBidBulkView class.
+
+    """
+    reset_sequences = True  # reset DB AutoIncremental PK's on each test
+
+    def setUp(self):
+        self.client = APIClient()
+        self.base_url = reverse("market:market-validate-session-bid-bulk")
+        self.super_user = create_and_login_superuser(self.client)
+        self.wallet_address = create_market_wallet_address()
+        self.session_data = create_market_session_data()
+        self.users = create_users_and_resources(nr_users=2,
+                                                nr_resources_per_user=3)
+        self.market_session = MarketSession.objects.create(
+            status="open",
+            **self.session_data
+        )
+
+    def create_bids_with_payments(self, max_payment=1000000):
+        tangle_msg_ids = []
+        for user_data in self.users:
+            for resource in user_data["resources"]:
+                bid = MarketSessionBid.objects.create(
+                    user=user_data["user"],
+                    resource=resource,
+                    market_session=self.market_session,
+                    max_payment=max_payment,
+                    bid_price=1000,
+                    gain_func="mse",
+                )
+                payment = MarketSessionBidPayment.objects.create(
+                    market_bid=bid,
+                    tangle_msg_id=f"msg-{resource.id}",
+                )
+                tangle_msg_ids.append(payment.tangle_msg_id)
+        return tangle_msg_ids
+
+    def test_normal_user_validate_bids(self):
+        tangle_msg_ids = self.create_bids_with_payments()
+        login_user(client=self.client, user=self.users[0]["user"])
+        response = self.client.post(self.base_url,
+                                    data={"tangle_msg_ids": tangle_msg_ids},
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_validate_bids(self):
+        tangle_msg_ids = self.create_bids_with_payments(max_payment=1000000)
+        login_user(client=self.client, user=self.super_user)
+        response = self.client.post(self.base_url,
+                                    data={"tangle_msg_ids": tangle_msg_ids},
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response_data = response.json()["data"]
+        self.assertEqual([x["tangle_msg_id"] for x in response_data],
+                         tangle_msg_ids)
+        self.assertTrue(all(x["confirmed"] for x in response_data))
+
+        self.assertFalse(MarketSessionBid.objects.filter(confirmed=False).exists())
+        self.assertFalse(MarketSessionBidPayment.objects.filter(is_solid=False).exists())
+        self.assertEqual(MarketSessionTransactions.objects.filter(
+            transaction_type="transfer_in").count(), 6)
+
+        # Balances (3 resources per user):
+        for user_data in self.users:
+            balance = MarketBalance.objects.get(user=user_data["user"])
+            self.assertEqual(balance.balance, 3000000)
+            self.assertEqual(balance.total_deposit, 3000000)
+            self.assertEqual(balance.total_payment, 0)
+            for resource in user_data["resources"]:
+                session_balance = MarketSessionBalance.objects.get(
+                    user=user_data["user"],
+                    resource=resource,
+                    market_session=self.market_session,
+                )
+                self.assertEqual(session_balance.session_balance, 1000000)
+                self.assertEqual(session_balance.session_deposit, 1000000)
+
+    def test_validate_bids_constant_nr_queries(self):
+        tangle_msg_ids = self.create_bids_with_payments()
+        login_user(client=self.client, user=self.super_user)
+        with CaptureQueriesContext(connection) as ctx_1:
+            self.client.post(self.base_url,
+                             data={"tangle_msg_ids": tangle_msg_ids[:1]},
+                             format="json")
+        with CaptureQueriesContext(connection) as ctx_n:
+            response = self.client.post(
+                self.base_url,
+                data={"tangle_msg_ids": tangle_msg_ids[1:]},
+                format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(ctx_1.captured_queries),
+                         len(ctx_n.captured_queries))
+
+    def test_validate_bids_payment_not_found(self):
+        tangle_msg_ids = self.create_bids_with_payments()
+        login_user(client=self.client, user=self.super_user)
+        response = self.client.post(
+            self.base_url,
+            data={"tangle_msg_ids": tangle_msg_ids + ["unknown"]},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        expected_response = conflict_error_response(
+            message="No bid payments were found for tangle_msg_id unknown."
+        )
+        self.assertEqual(response.json(), expected_response)
+        # No bids were validated:
+        self.assertFalse(MarketSessionBid.objects.filter(confirmed=True).exists())
+        self.assertFalse(MarketBalance.objects.exists())
+
+    def test_validate_bids_already_valid(self):
+        tangle_msg_ids = self.create_bids_with_payments()
+        login_user(client=self.client, user=self.super_user)
+        response = self.client.post(self.base_url,
+                                    data={"tangle_msg_ids": tangle_msg_ids[:2]},
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.post(self.base_url,
+                                    data={"tangle_msg_ids": tangle_msg_ids},
+                                    format="json")
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        expected_response = conflict_error_response(
+            message=f"Tangle message ID {tangle_msg_ids[0]} already validated."
+        )
+        self.assertEqual(response.json(), expected_response)
+        self.assertEqual(MarketSessionTransactions.objects.count(), 2)
+
+    def test_validate_bids_duplicated_ids(self):
+        tangle_msg_ids = self.create_bids_with_payments()
+        login_user(client=self.client, user=self.super_user)
+        response = self.client.post(
+            self.base_url,
+            data={"tangle_msg_ids": tangle_msg_ids[:1] * 2},
+            format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -1,7 +1,18 @@
 import uuid
+import datetime as dt
 
 from rest_framework import exceptions
-from ..models import MarketSession
+from ..models import MarketSession, MarketSessionTransactions
+
+
+def __validate_datetime_str(dt_str):
+    fmt_ = "%Y-%m-%dT%H:%M:%SZ"
+    try:
+        dt.datetime.strptime(dt_str, fmt_)
+    except (TypeError, ValueError):
+        raise exceptions.ValidationError(
+            f"Query datetime parameters must use format {fmt_}"
+        )
 
 
 def validate_query_params(
@@ -13,6 +24,10 @@ def validate_query_params(
         balance__lte=None,
         balance__gte=None,
         balance_by_resource=None,
+        transaction_type=None,
+        start_date=None,
+        end_date=None,
+        stream=None,
 ):
     if market_session_id is not None:
         try:
@@ -69,3 +84,23 @@ def validate_query_params(
             raise exceptions.ValidationError(
                 "Query param 'balance__gte' must be an integer or float."
             )
+
+    if transaction_type is not None:
+        choices = MarketSessionTransactions.TransactionType.values
+        if transaction_type not in choices:
+            raise exceptions.ValidationError(
+                f"Query param 'transaction_type' must be "
+                f"one of the following {choices}"
+            )
+
+    if start_date is not None:
+        __validate_datetime_str(start_date)
+
+    if end_date is not None:
+        __validate_datetime_str(end_date)
+
+    if stream is not None:
+        if stream.lower() not in ['true', 'false']:
+            raise exceptions.ValidationError(
+                "Query param 'stream' must be a boolean (true/false)"
+            )
@@ -1,5 +1,3 @@
-import pandas as pd
-
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
 from rest_framework.views import APIView
@@ -8,10 +6,12 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 from api.renderers.CustomRenderer import CustomRenderer
 from api.utils.permissions import method_permission_classes
+from api.utils.conditional import ConditionalGet
 
 from ..schemas.query import *
 from ..schemas.responses import *
 from ..util.validators import validate_query_params
+from ..helpers.balances import sum_balances_per_user
 from ..models.market_balance import (
     MarketBalance,
     MarketSessionBalance,
@@ -21,7 +21,8 @@ from ..serializers.market_balance import (
     MarketBalanceSerializer,
     BalanceTransferOutSerializer,
     MarketSessionBalanceCreateSerializer,
-    MarketSessionBalanceRetrieveSerializer
+    MarketSessionBalanceRetrieveSerializer,
+    MarketSessionSettlementSerializer,
 )
 
 
@@ -70,8 +71,12 @@ class MarketBalanceView(APIView):
         })
     def get(self, request):
         address = self.queryset(request)
+        conditional = ConditionalGet(request, address, "updated_at")
+        not_modified = conditional.not_modified_response()
+        if not_modified is not None:
+            return not_modified
         serializer = self.serializer_class(address, many=True)
-        return Response(data=serializer.data)
+        return conditional.add_headers(Response(data=serializer.data))
 
 
 class MarketSessionBalanceView(APIView):
@@ -127,17 +132,13 @@ class MarketSessionBalanceView(APIView):
     def get(self, request):
         session_balance, sum_balance_per_user = self.queryset(request)
 
+        if sum_balance_per_user:
+            # Sum of balances per user (aggregated in the DB):
+            return Response(data=sum_balances_per_user(session_balance))
+
         serializer = MarketSessionBalanceRetrieveSerializer(session_balance,
                                                             many=True)
-        # todo: try to aggregate already in queryset using django methods
-        data_ = serializer.data.copy()
-        df_ = pd.DataFrame(data_)
-        if (not df_.empty) and sum_balance_per_user:
-            df_ = df_.groupby(["market_session", "user"]).sum()
-            df_.drop("resource", axis=1, inplace=True)
-            data_ = df_.reset_index().to_dict(orient="records")
-
-        return Response(data=data_)
+        return Response(data=serializer.data)
 
     @swagger_auto_schema(
         operation_id="post_market_session_balance",
@@ -161,6 +162,31 @@ class MarketSessionBalanceView(APIView):
         return Response(data=response)
 
 
+class MarketSessionSettlementView(APIView):
+    permission_classes = (IsAdminUser,)
+    renderer_classes = [CustomRenderer]
+
+    @swagger_auto_schema(
+        operation_id="post_market_session_settlement",
+        operation_description="[AdminOnly] Method to settle a market "
+                              "session, i.e., register the payments and "
+                              "revenues of every agent resource and "
+                              "update their balances (all or none)",
+        request_body=MarketSessionSettlementSerializer,
+        responses={
+            400: 'Bad request',
+            401: NotAuthenticatedResponse,
+            403: ForbiddenAccessResponse,
+            409: 'Conflict',
+            500: "Internal Server Error",
+        })
+    def post(self, request):
+        serializer = MarketSessionSettlementSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        response = serializer.save()
+        return Response(data=response)
+
+
 class BalanceTransferOutView(APIView):
     renderer_classes = (CustomRenderer,)
     permission_classes = (IsAdminUser,)
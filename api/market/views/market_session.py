@@ -1,3 +1,4 @@
+from django.conf import settings
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status, exceptions
 from rest_framework.views import APIView
@@ -6,10 +7,17 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 
 from api.utils.permissions import method_permission_classes
 from api.renderers.CustomRenderer import CustomRenderer
+from api.renderers.StreamingRenderer import streaming_response
+from api.utils.conditional import ConditionalGet
+from api.utils.pagination import KeysetPagination
 
 from ..schemas.query import *
 from ..schemas.responses import *
 from ..util.validators import validate_query_params
+from ..helpers.session_cache import (
+    get_latest_session,
+    invalidate_latest_session,
+)
 
 from ..models.market_session import (
     MarketSession,
@@ -43,6 +51,15 @@ class MarketSessionView(APIView):
             latest_only=latest_only
         )
 
+        # Default latest_only query param to False if not declared
+        latest_only = 'false' if latest_only is None else latest_only.lower()
+        latest_only = False if latest_only == "false" else True
+        if latest_only and (market_session_id is None) \
+                and (session_status is None):
+            # Current session (cached, most frequent query):
+            last_sess = get_latest_session(local=True)
+            return [] if last_sess is None else [last_sess]
+
         # initial query:
         sessions = MarketSession.objects.all()
 
@@ -52,12 +69,8 @@ class MarketSessionView(APIView):
         if session_status is not None:
             sessions = sessions.filter(status=session_status)
 
-        # Default latest_only query param to False if not declared
-        latest_only = 'false' if latest_only is None else latest_only.lower()
-        latest_only = False if latest_only == "false" else True
         if latest_only:
-            last_sess = sessions.order_by('id').last()
-            sessions = [] if last_sess is None else [last_sess]
+            sessions = sessions.order_by('-id')[:1]
         return sessions
 
     @swagger_auto_schema(
@@ -73,8 +86,16 @@ class MarketSessionView(APIView):
         })
     def get(self, request):
         sessions = self.queryset(request)
+        if isinstance(sessions, list):
+            conditional = ConditionalGet.from_instances(request, sessions,
+                                                        "updated_at")
+        else:
+            conditional = ConditionalGet(request, sessions, "updated_at")
+        not_modified = conditional.not_modified_response()
+        if not_modified is not None:
+            return not_modified
         serializer = self.serializer_class(sessions, many=True)
-        return Response(serializer.data)
+        return conditional.add_headers(Response(serializer.data))
 
     @swagger_auto_schema(
         operation_id="post_market_session",
@@ -93,6 +114,7 @@ class MarketSessionView(APIView):
         )
         serializer.is_valid(raise_exception=True)
         serializer.save()
+        invalidate_latest_session()
         return Response(data=serializer.data)
 
 
@@ -127,6 +149,7 @@ class MarketSessionUpdateView(APIView):
                 context={'request': request, "session_id": session_id})
             serializer.is_valid(raise_exception=True)
             serializer.update(market_session, serializer.validated_data)
+            invalidate_latest_session()
             return Response(data=serializer.data)
         except MarketSession.DoesNotExist:
             return Response(data="That market session ID does not exist.",
@@ -176,7 +199,13 @@ class MarketSessionTransactionsView(APIView):
     def queryset(request):
         user = request.user
         market_session_id = request.query_params.get('market_session', None)
-        validate_query_params(market_session_id=market_session_id)
+        transaction_type = request.query_params.get('transaction_type', None)
+        start_date = request.query_params.get('start_date', None)
+        end_date = request.query_params.get('end_date', None)
+        validate_query_params(market_session_id=market_session_id,
+                              transaction_type=transaction_type,
+                              start_date=start_date,
+                              end_date=end_date)
 
         if user.is_superuser:
             user_id = request.query_params.get('user', None)
@@ -193,6 +222,18 @@ class MarketSessionTransactionsView(APIView):
 
         if market_session_id:
             query = query.filter(market_session_id=market_session_id)
+        if transaction_type is not None:
+            query = query.filter(transaction_type=transaction_type)
+        if start_date is not None:
+            query = query.filter(registered_at__gte=start_date)
+        if end_date is not None:
+            query = query.filter(registered_at__lte=end_date)
+
+        # Order transactions by registration date (resource name is
+        # fetched in the same query, to avoid one extra lookup per row
+        # on serialization)
+        query = query.select_related('resource').order_by('registered_at',
+                                                          'tid')
 
         return query
 
@@ -208,9 +249,27 @@ class MarketSessionTransactionsView(APIView):
     #         500: "Internal Server Error",
     #     })
     def get(self, request):
-        address = self.queryset(request)
-        serializer = self.serializer_class(address, many=True)
-        return Response(data=serializer.data)
+        stream = request.query_params.get('stream', None)
+        validate_query_params(stream=stream)
+        query = self.queryset(request)
+        paginator = KeysetPagination(fields=("registered_at", "tid"))
+        if (stream is not None) and (stream.lower() == "true"):
+            if paginator.is_requested(request):
+                raise exceptions.ValidationError(
+                    "Query param 'stream' can not be combined with "
+                    "pagination query params."
+                )
+            # Rows are fetched with a server-side cursor and streamed in
+            # chunks (same response format):
+            serializer = self.serializer_class()
+            rows = map(serializer.to_representation, query.iterator(
+                chunk_size=settings.STREAMING_RESPONSE_CHUNK_SIZE
+            ))
+            return streaming_response(rows, status=status.HTTP_200_OK)
+        page = paginator.paginate_queryset(query, request)
+        data = self.serializer_class(page, many=True).data
+        data = paginator.get_paginated_data(data, page)
+        return Response(data=data)
 
 
 class MarketSessionFeeView(APIView):
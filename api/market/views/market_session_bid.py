@@ -15,9 +15,11 @@ from ..schemas.query import *
 from ..schemas.responses import *
 from ..serializers.market_session_bid import (
     MarketSessionBidCreateSerializer,
+    MarketSessionBidBulkCreateSerializer,
     MarketSessionBidUpdateSerializer,
     MarketSessionBidRetrieveSerializer,
-    MarketValidateSessionBidSerializer
+    MarketValidateSessionBidSerializer,
+    MarketValidateSessionBidBulkSerializer,
 )
 
 # init logger:
@@ -115,6 +117,63 @@ class MarketSessionBidView(APIView):
         return Response(data=response, status=status.HTTP_200_OK)
 
 
+class MarketSessionBidBulkView(APIView):
+    permission_classes = (IsAuthenticated,)
+    renderer_classes = [CustomRenderer]
+
+    @staticmethod
+    @swagger_auto_schema(
+        operation_id="post_market_session_bid_bulk",
+        operation_description="Method for agents to place bids for "
+                              "multiple resources in their portfolio "
+                              "(same market session) in a single request. "
+                              "Either all bids are placed or none.",
+        request_body=MarketSessionBidBulkCreateSerializer,
+        responses={
+            400: 'Bad request',
+            401: NotAuthenticatedResponse,
+            403: ForbiddenAccessResponse,
+            409: 'Conflict',
+            500: "Internal Server Error",
+        })
+    def post(request):
+        """
+        Place several bid orders in the market session
+        :param request:
+        :return:
+        """
+        serializer = MarketSessionBidBulkCreateSerializer(
+            data=request.data,
+            context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+        response = serializer.save()
+
+        if settings.ENVIRONMENT == "production":
+            # Single (consolidated) confirmation for all bids:
+            validated_data = serializer.validated_data
+            bids_info = "".join(
+                f"<li><strong>Resource:</strong> {bid['resource']} | "
+                f"<strong>Bid price:</strong> {bid['bid_price']}i | "
+                f"<strong>Gain function:</strong> {bid['gain_func']} | "
+                f"<strong>Max Payment:</strong> {bid['max_payment']}i</li>"
+                for bid in validated_data["bids"]
+            )
+            send_email_as_thread(
+                destination=[request.user.email],
+                email_opt_key="email-bulk-bid-confirmation",
+                format_args={
+                    "n_bids": len(validated_data["bids"]),
+                    "session_date": validated_data["session_date"],
+                    "session_number": validated_data["session_number"],
+                    "bids_info": bids_info,
+                },
+                fail_silently=False
+            )
+
+        return Response(data=response, status=status.HTTP_200_OK)
+
+
 class MarketSessionBidUpdateView(APIView):
     permission_classes = (IsAuthenticated,)
     renderer_classes = [CustomRenderer]
@@ -192,3 +251,31 @@ class MarketValidateSessionBidView(APIView):
         serializer.is_valid(raise_exception=True)
         response = serializer.save()
         return Response(data=response)
+
+
+class MarketValidateSessionBidBulkView(APIView):
+    permission_classes = (IsAdminUser,)
+    renderer_classes = [CustomRenderer]
+    serializer_class = MarketValidateSessionBidBulkSerializer
+
+    @swagger_auto_schema(
+        operation_id="post_market_validate_session_bid_bulk",
+        operation_description="[AdminOnly] Method for market engine to "
+                              "update the status of multiple bids to "
+                              "valid (all or none)",
+        request_body=MarketValidateSessionBidBulkSerializer,
+        responses={
+            400: 'Bad request',
+            401: NotAuthenticatedResponse,
+            403: ForbiddenAccessResponse,
+            409: 'Conflict',
+            500: "Internal Server Error",
+        })
+    def post(self, request):
+        serializer = self.serializer_class(
+            data=request.data,
+            context={'request': request}
+        )
+        serializer.is_valid(raise_exception=True)
+        response = serializer.save()
+        return Response(data=response)
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.3 on 2026-10-18 15:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userresources',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
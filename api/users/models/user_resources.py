@@ -34,6 +34,8 @@ class UserResources(models.Model):
     )
     # Register date:
     registered_at = models.DateTimeField(auto_now_add=True, blank=True)
+    # Last update date:
+    updated_at = models.DateTimeField(auto_now=True, blank=True)
 
     def __str__(self):
         return f'#{self.pk}: {self.user}, {self.name}'
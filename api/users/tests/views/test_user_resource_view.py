@@ -1,6 +1,8 @@
 # flake8: noqa
 
+from django.db import connection
 from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
 from rest_framework import status
 from rest_framework.test import APITestCase
 
@@ -190,3 +192,30 @@ class TestUserResourceView(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         resource_data = response.json()["data"]
         self.assertEqual(len(resource_data), len(self.user_1_resources) + len(self.user_2_resources))
+
+    def test_list_resource_conditional_get(self):
+        login_user(self.client, user=self.normal_user1)
+        self.register_resources(self.user_1_resources)
+        # No validators sent - headers computed from the fetched rows
+        # (no extra aggregate query):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.base_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertFalse(any("COUNT(" in x["sql"].upper()
+                             for x in ctx.captured_queries))
+
+        # Unchanged resources - 304:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(self.base_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertTrue(any("COUNT(" in x["sql"].upper()
+                            for x in ctx.captured_queries))
+
+        # Resource deleted - new representation:
+        resource = UserResources.objects.filter(user=self.normal_user1).first()
+        self.client.delete(self.base_url + f"/{resource.id}")
+        response = self.client.get(self.base_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
@@ -5,6 +5,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
 from api.renderers.CustomRenderer import CustomRenderer
+from api.utils.conditional import ConditionalGet
 
 from ..schemas.query import *
 from ..schemas.responses import *
@@ -65,8 +66,12 @@ class UserResourcesView(APIView):
         })
     def get(self, request):
         query = self.queryset(request)
+        conditional = ConditionalGet(request, query, "updated_at")
+        not_modified = conditional.not_modified_response()
+        if not_modified is not None:
+            return not_modified
         serializer = self.serializer_class(query, many=True)
-        return Response(data=serializer.data)
+        return conditional.add_headers(Response(data=serializer.data))
 
     @swagger_auto_schema(
         operation_id="post_user_resources",